@@ -1,12 +1,11 @@
 import streamlit as st
-import tempfile
-import os
 from pathlib import Path
-from PIL import Image
 
-# Import du workflow
-from backend import run_complete_matching_workflow
-from modules.export_utils import export_to_excel
+# Le workflow (PyPDF2, python-docx, openai, pandas...) n'est importé qu'à la soumission du formulaire :
+# l'affichage initial et chaque rerun Streamlit restent rapides
+from modules.telemetry import RunTelemetry, build_sinks_from_env
+
+LOGO_PATH = Path(__file__).resolve().parent / "parlym_logo.png"
 
 def setup_page_config():
     """Configure la page Streamlit avec les paramètres de base."""
@@ -16,6 +15,60 @@ def setup_page_config():
         layout="centered"
     )
 
+@st.cache_resource
+def load_logo():
+    """
+    Charge le logo une seule fois par processus (partagé entre sessions et reruns).
+
+    Returns:
+        Image PIL décodée
+    """
+    from PIL import Image
+
+    logo = Image.open(LOGO_PATH)
+    logo.load()
+    return logo
+
+@st.cache_resource
+def get_llm_backend():
+    """
+    Crée le backend IA une seule fois par processus (client OpenAI et pool de connexions partagés).
+
+    Returns:
+        Backend IA partagé
+    """
+    from modules.llm_backend import get_default_backend
+
+    return get_default_backend()
+
+@st.cache_resource
+def load_workflow():
+    """
+    Importe le workflow de matching à la première soumission (modules lourds, schéma de sortie).
+
+    Returns:
+        Tuple (iter_resumable_matching_workflow, sort_results, build_run_parameters, export_utils,
+        historique des exécutions)
+    """
+    from backend import build_run_parameters, iter_resumable_matching_workflow, sort_results
+    from modules import export_utils
+    from modules.run_store import get_default_run_store
+
+    return iter_resumable_matching_workflow, sort_results, build_run_parameters, export_utils, get_default_run_store()
+
+@st.cache_resource
+def load_matrix_workflow():
+    """
+    Importe le workflow matriciel (plusieurs offres) à la première soumission.
+
+    Returns:
+        Tuple (iter_matrix_matching_workflow, sort_results, build_best_offer_view, export_utils)
+    """
+    from backend import build_best_offer_view, iter_matrix_matching_workflow, sort_results
+    from modules import export_utils
+
+    return iter_matrix_matching_workflow, sort_results, build_best_offer_view, export_utils
+
 def validate_inputs(offer_text: str, uploaded_files) -> tuple[bool, str]:
     """
     Valide les entrées utilisateur.
@@ -33,109 +86,243 @@ def validate_inputs(offer_text: str, uploaded_files) -> tuple[bool, str]:
     if not uploaded_files or len(uploaded_files) == 0:
         return False, "Veuillez sélectionner au moins un fichier CV"
     for file in uploaded_files:
-        if file.type not in ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"]:
-            return False, "Format de fichier non supporté. Utilisez PDF, DOCX ou TXT"
+        if file.type not in ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain",
+                             "application/zip", "application/x-zip-compressed"]:
+            return False, "Format de fichier non supporté. Utilisez PDF, DOCX, TXT ou une archive ZIP"
     return True, ""
 
-def save_uploaded_file(uploaded_file) -> str:
+def collect_uploaded_cvs(uploaded_files) -> list:
     """
-    Sauvegarde le fichier uploadé temporairement.
+    Remplace les archives ZIP par les CV qu'elles contiennent (lus en mémoire, à la demande) ;
+    les fichiers de même nom sont renommés d'après leur chemin (les résultats sont indexés par nom).
     
     Args:
-        uploaded_file: Fichier uploadé par l'utilisateur
+        uploaded_files: Fichiers uploadés par l'utilisateur
     
     Returns:
-        Chemin vers le fichier sauvegardé
+        CV à analyser, dans l'ordre d'upload
     """
-    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        return tmp_file.name
+    from modules.cv_archive import expand_cv_archives
+
+    cv_sources, errors = expand_cv_archives(uploaded_files)
+    for name, error in errors.items():
+        st.warning(f"{name} ignoré : {error}")
+    return cv_sources
+
+def render_offer_inputs(offer_count: int) -> dict:
+    """
+    Affiche la saisie des offres : une zone de texte par offre, avec son intitulé en mode matriciel.
+
+    Args:
+        offer_count: Nombre d'offres à saisir
+
+    Returns:
+        Dictionnaire {intitulé: texte_offre}, dans l'ordre de saisie
+    """
+    if offer_count == 1:
+        offer_text = st.text_area(
+            "Offre d'emploi *",
+            placeholder="Collez ici le texte complet de l'offre d'emploi...",
+            help="Copiez et collez le texte de l'offre d'emploi (présentation du poste, profil recherché...)",
+            height=200
+        )
+        return {"Offre": offer_text}
+
+    offers = {}
+    for index in range(1, offer_count + 1):
+        name = st.text_input(f"Intitulé de l'offre {index} *", value=f"Offre {index}")
+        offer_text = st.text_area(
+            f"Offre d'emploi {index} *",
+            placeholder="Collez ici le texte complet de l'offre d'emploi...",
+            height=150
+        )
+        name = name.strip() or f"Offre {index}"
+        # Intitulé déjà utilisé : numéroté pour que chaque offre garde son propre classement
+        offers[name if name not in offers else f"{name} ({index})"] = offer_text
+    return offers
 
 def render_form():
     """Affiche le formulaire principal de l'application."""
-    logo = Image.open("parlym_logo.png")
-    st.image(logo, width=300)
+    st.image(load_logo(), width=300)
 
     st.title("Matching CV / offre d'emploi")
+
+    # Hors du formulaire : le nombre d'offres modifie immédiatement les champs affichés
+    matrix_mode = st.toggle("Plusieurs offres", help="Analyse chaque CV vs chaque offre et indique la meilleure offre par candidat")
+    offer_count = st.number_input("Nombre d'offres", min_value=2, max_value=10, value=2) if matrix_mode else 1
     
     with st.form("cv_matching_form", clear_on_submit=False):
         st.subheader("Informations")
         
-        offer_text = st.text_area(
-            "Offre d'emploi *",
-            placeholder="Collez ici le texte complet de l'offre d'emploi...",
-            help="Copiez et collez le texte de l'offre d'emploi (présentation du poste, profil recherché...)",
-            height=200
-        )
+        offers = render_offer_inputs(offer_count)
         
         uploaded_files = st.file_uploader(
             "CV *",
-            type=['pdf', 'docx'],
-            help="Sélectionnez votre CV (PDF ou Word)",
+            type=['pdf', 'docx', 'zip'],
+            help="Sélectionnez vos CV (PDF ou Word) ou une archive ZIP de CV",
             accept_multiple_files=True
         )
         
+        top_k = 0
+        if not matrix_mode:
+            top_k = st.number_input(
+                "Nombre maximum de CV analysés par l'IA",
+                min_value=0,
+                value=0,
+                help="0 = tous les CV. Sinon, seuls les CV les plus proches de l'offre (présélection lexicale) sont envoyés à l'IA"
+            )
+        
         submitted = st.form_submit_button(
             "Soumettre",
             type="secondary",
             use_container_width=True
         )
         
-        return submitted, offer_text, uploaded_files
+        return submitted, offers, uploaded_files, top_k
+
+def render_run_summary(summary: dict):
+    """
+    Affiche le résumé de performance de l'exécution.
+    
+    Args:
+        summary: Résumé de la télémétrie (RunTelemetry.summary())
+    """
+    with st.expander("Métriques de l'exécution"):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Durée totale", f"{summary['Durée totale (s)']:.1f} s")
+        col2.metric("Appels IA", summary['Appels IA'], help=f"{summary['Analyses en cache']} analyses en cache")
+        col3.metric("Latence IA p95", f"{summary['Latence IA p95 (s)']:.1f} s")
+        col4.metric("Tokens", summary['Tokens prompt'] + summary['Tokens complétion'])
+        st.table({label: [value] for label, value in summary.items()})
 
-def process_matching(offer_text: str, cv_file_info: list[tuple]):
+def process_matching(offer_text: str, uploaded_files: list, top_k: int = None):
     """
     Lance le processus de matching entre le CV et l'offre.
+    Les CV sont extraits directement depuis le tampon des fichiers uploadés, sans écriture sur disque.
     
     Args:
         offer_text: Texte de l'offre d'emploi
-        cv_file_info: Liste de tuples (chemin_temporaire, nom_original)
-    """
-    # Indicateur d'analyse en cours
-    with st.spinner("Analyse en cours..."):
-        # On passe uniquement les chemins temporaires au workflow
-        cv_file_paths = [info[0] for info in cv_file_info]
-        original_filenames = {Path(info[0]).name: info[1] for info in cv_file_info}
-        results = run_complete_matching_workflow(offer_text, cv_file_paths)
-        # Remplacer le nom du fichier temporaire par le nom original dans les résultats
-        for result in results:
-            temp_name = result.get('cv_filename', '')
-            if temp_name in original_filenames:
-                result['cv_filename'] = original_filenames[temp_name]
-
-    # Générer le fichier Excel
-    excel_filename = export_to_excel(results)
-    # Bouton de téléchargement
-    with open(excel_filename, "rb") as file:
-        st.download_button(
-            label="Télécharger le rapport Excel",
-            data=file.read(),
-            file_name="rapport_matching.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        uploaded_files: CV à analyser (fichiers uploadés ou membres d'archive, noms uniques)
+        top_k: Nombre maximum de CV envoyés à l'IA après présélection (None pour tous)
+    """
+    iter_resumable_matching_workflow, sort_results, build_run_parameters, export_utils, run_store = load_workflow()
+
+    # Même offre et mêmes paramètres qu'une exécution précédente (interrompue ou complétée) :
+    # seuls les nouveaux CV sont analysés
+    parameters = build_run_parameters(top_k=top_k, detect_duplicates=True)
+    run_id = run_store.find_latest_run(offer_text, parameters) or run_store.create_run(offer_text, parameters)
+
+    # Classement affiché en direct, re-trié à chaque CV terminé
+    progress_bar = st.progress(0.0, text="Extraction des CV...")
+    ranking_placeholder = st.empty()
+    telemetry = RunTelemetry(build_sinks_from_env())
+    results = []
+    for result in iter_resumable_matching_workflow(offer_text, uploaded_files, run_id, top_k=top_k,
+                                                   telemetry=telemetry, llm_backend=get_llm_backend(),
+                                                   detect_duplicates=True):
+        results.append(result)
+        results = sort_results(results, uploaded_files)
+
+        progress_bar.progress(
+            len(results) / len(uploaded_files),
+            text=f"Analyse en cours... {len(results)}/{len(uploaded_files)} CV"
+        )
+        ranking_placeholder.dataframe(
+            export_utils.export_results_to_dataframe(results)[['Prénom', 'Nom', 'Fichier_CV', 'Score', 'Statut', 'Doublons', 'Résumé']],
+            hide_index=True,
+            use_container_width=True
         )
-    # Nettoyage du fichier Excel temporaire
-    try:
-        os.unlink(excel_filename)
-    except OSError:
-        pass
+    progress_bar.progress(1.0, text=f"Analyse terminée : {len(results)} CV")
+
+    # Générer les rapports en mémoire (sans fichier temporaire)
+    excel_data = export_utils.export_to_excel_bytes(results, telemetry=telemetry)
+    csv_data = export_utils.export_to_csv_bytes(results, telemetry=telemetry)
+    render_run_summary(telemetry.flush())
+    # Boutons de téléchargement
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        label="Télécharger le rapport Excel",
+        data=excel_data,
+        file_name="rapport_matching.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True
+    )
+    col2.download_button(
+        label="Télécharger en CSV",
+        data=csv_data,
+        file_name="rapport_matching.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+
+def process_matrix_matching(offers: dict, cv_sources: list):
+    """
+    Lance le matching de chaque CV vs chaque offre, puis propose le classeur de la matrice
+    (meilleure offre par candidat et classement de chaque offre).
+    
+    Args:
+        offers: Dictionnaire {intitulé: texte_offre}
+        cv_sources: CV à analyser (fichiers uploadés ou membres d'archive, noms uniques)
+    """
+    iter_matrix_matching_workflow, sort_results, build_best_offer_view, export_utils = load_matrix_workflow()
+
+    # Vue par candidat affichée en direct, recalculée à chaque paire (offre, CV) terminée
+    total = len(offers) * len(cv_sources)
+    progress_bar = st.progress(0.0, text="Extraction des CV...")
+    ranking_placeholder = st.empty()
+    telemetry = RunTelemetry(build_sinks_from_env())
+    rankings = {offer_name: [] for offer_name in offers}
+    processed = 0
+    for result in iter_matrix_matching_workflow(offers, cv_sources, telemetry=telemetry,
+                                                llm_backend=get_llm_backend(), detect_duplicates=True):
+        rankings[result["Offre"]].append(result)
+        processed += 1
+        candidates = build_best_offer_view(rankings, cv_sources)
+
+        progress_bar.progress(
+            processed / total,
+            text=f"Analyse en cours... {processed}/{total} paires offre / CV"
+        )
+        ranking_placeholder.dataframe(
+            export_utils.export_best_offers_to_dataframe(candidates),
+            hide_index=True,
+            use_container_width=True
+        )
+    progress_bar.progress(1.0, text=f"Analyse terminée : {len(cv_sources)} CV, {len(offers)} offres")
+
+    rankings = {offer_name: sort_results(results, cv_sources) for offer_name, results in rankings.items()}
+    excel_data = export_utils.export_matrix_to_excel_bytes(
+        rankings, build_best_offer_view(rankings, cv_sources), telemetry=telemetry
+    )
+    render_run_summary(telemetry.flush())
+    st.download_button(
+        label="Télécharger la matrice Excel",
+        data=excel_data,
+        file_name="matrice_matching.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True
+    )
 
 def main():
     """Fonction principale de l'application."""
     setup_page_config()
     
-    submitted, offer_text, uploaded_files = render_form()
+    submitted, offers, uploaded_files, top_k = render_form()
     if submitted:
-        is_valid, error_message = validate_inputs(offer_text, uploaded_files)
-        if not is_valid:
-            st.error(error_message)
-            return
+        for offer_text in offers.values():
+            is_valid, error_message = validate_inputs(offer_text, uploaded_files)
+            if not is_valid:
+                st.error(error_message)
+                return
         try:
-            # Sauvegarder tous les fichiers 
-            cv_file_info = []  # Liste de tuples (chemin_temporaire, nom_original)
-            for uploaded_file in uploaded_files:
-                cv_path = save_uploaded_file(uploaded_file)
-                cv_file_info.append((cv_path, uploaded_file.name))
-            process_matching(offer_text, cv_file_info)
+            cv_sources = collect_uploaded_cvs(uploaded_files)
+            if not cv_sources:
+                st.error("Aucun CV PDF ou Word à analyser")
+                return
+            if len(offers) > 1:
+                process_matrix_matching(offers, cv_sources)
+            else:
+                process_matching(next(iter(offers.values())), cv_sources, top_k or None)
         except Exception as e:
             st.error(f"Erreur lors du traitement : {str(e)}")
 
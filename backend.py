@@ -1,42 +1,906 @@
-from modules.cv_extraction import extract_multiple_cvs
-from modules.ai_analysis import analyze_cv_parlym
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-def run_complete_matching_workflow(offer_text: str, cv_files_list: list) -> list:
+import tempfile
+import time
+
+from modules.cv_extraction import compute_file_hash, extract_cvs_with_errors, get_cv_name, is_ocr_required
+from modules.ai_analysis import (
+    OPENAI_MODEL,
+    PACKED_PROMPT_VERSION,
+    PROFILE_PROMPT_VERSION,
+    PROMPT_VERSION,
+    STATUS_FAILED,
+    STATUS_SCORED,
+    analyze_cv_parlym,
+    analyze_cv_pack,
+    extract_cv_profile,
+    format_cv_profile,
+    get_analysis_cache_key,
+    plan_cv_packs
+)
+from modules.batch_scoring import (
+    BATCH_POLL_INTERVAL_SECONDS,
+    BATCH_TIMEOUT_SECONDS,
+    OpenAIBatchClient,
+    build_batch_requests,
+    parse_batch_output,
+    wait_for_batch,
+    write_batch_file
+)
+from modules.deduplication import find_duplicate_groups
+from modules.llm_cache import get_default_cache
+from modules.prescreening import shortlist_cvs
+from modules.run_store import get_default_run_store
+from modules.text_compaction import CV_TOKEN_BUDGET, compact_cv_text
+
+# Nombre maximum d'appels à l'API OpenAI en parallèle
+MAX_CONCURRENT_ANALYSES = 8
+
+# Statut d'un CV écarté par la présélection lexicale (non envoyé à l'IA)
+STATUS_PRESCREENED = "Écarté (présélection)"
+
+# Statut d'un PDF sans couche texte (scanné) : non envoyé à l'IA
+STATUS_OCR_REQUIRED = "OCR requis"
+
+# Statut d'un CV quasi identique à un autre CV du lot : seul le représentant du groupe est analysé
+STATUS_DUPLICATE = "Doublon"
+
+
+def build_error_result(filename: str, error, step: str = "l'analyse") -> dict:
+    """
+    Construit un résultat d'erreur structuré pour un CV.
+
+    Args:
+        filename: Nom du fichier CV
+        error: Exception (ou message) à l'origine de l'erreur
+        step: Étape en échec, pour le résumé ("l'analyse", "l'extraction")
+
+    Returns:
+        Dictionnaire au même format qu'une analyse réussie
+    """
+    return {
+        "cv_filename": filename,
+        "Prénom": "",
+        "Nom": "",
+        "Score": 0,
+        "Statut": STATUS_FAILED,
+        "Résumé": f"Erreur lors de {step} du CV {filename}",
+        "Points_forts": [],
+        "Points_vigilance": [f"Erreur technique: {str(error)}"]
+    }
+
+
+def build_extraction_error_result(filename: str, error) -> dict:
+    """
+    Construit le résultat d'un CV illisible : PDF scanné (OCR requis) ou erreur d'extraction.
+
+    Args:
+        filename: Nom du fichier CV
+        error: Message d'erreur de l'extraction
+
+    Returns:
+        Dictionnaire au même format qu'une analyse réussie
+    """
+    if not is_ocr_required(error):
+        return build_error_result(filename, error, "l'extraction")
+    return {
+        "cv_filename": filename,
+        "Prénom": "",
+        "Nom": "",
+        "Score": 0,
+        "Statut": STATUS_OCR_REQUIRED,
+        "Résumé": "CV non analysé : PDF sans texte exploitable (scanné), un OCR est nécessaire",
+        "Points_forts": [],
+        "Points_vigilance": [str(error)]
+    }
+
+
+def build_prescreened_result(filename: str, lexical_score: float) -> dict:
+    """
+    Construit le résultat d'un CV écarté par la présélection lexicale (non envoyé à l'IA).
+
+    Args:
+        filename: Nom du fichier CV
+        lexical_score: Score lexical du CV sur 100
+
+    Returns:
+        Dictionnaire au même format qu'une analyse réussie
+    """
+    return {
+        "cv_filename": filename,
+        "Prénom": "",
+        "Nom": "",
+        "Score": 0,
+        "Score_lexical": lexical_score,
+        "Statut": STATUS_PRESCREENED,
+        "Résumé": f"CV écarté par la présélection lexicale (score lexical {lexical_score}/100)",
+        "Points_forts": [],
+        "Points_vigilance": []
+    }
+
+
+def build_duplicate_result(filename: str, representative: str) -> dict:
+    """
+    Construit le résultat d'un doublon (non envoyé à l'IA), rattaché au CV analysé à sa place.
+
+    Args:
+        filename: Nom du fichier CV en double
+        representative: Nom du fichier CV analysé pour le groupe
+
+    Returns:
+        Dictionnaire au même format qu'une analyse réussie
+    """
+    return {
+        "cv_filename": filename,
+        "Prénom": "",
+        "Nom": "",
+        "Score": 0,
+        "Statut": STATUS_DUPLICATE,
+        "Doublons": [representative],
+        "Résumé": f"Doublon de {representative} (analysé à sa place)",
+        "Points_forts": [],
+        "Points_vigilance": []
+    }
+
+
+def remove_duplicates(all_cvs: dict) -> dict:
+    """
+    Retire les doublons des CV à analyser (seul le représentant de chaque groupe est conservé).
+
+    Args:
+        all_cvs: Dictionnaire {nom_fichier: texte_cv}, modifié en place
+
+    Returns:
+        Dictionnaire {représentant: [doublons]}
+    """
+    duplicates = find_duplicate_groups(all_cvs)
+    for filenames in duplicates.values():
+        for filename in filenames:
+            del all_cvs[filename]
+    return duplicates
+
+
+def analyze_single_cv(offer_text: str, filename: str, cv_text: str, telemetry=None,
+                      llm_backend=None) -> dict:
+    """
+    Analyse un CV vs l'offre en isolant les erreurs.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        filename: Nom du fichier CV
+        cv_text: Texte extrait du CV
+        telemetry: Collecteur de télémétrie (ou None)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+
+    Returns:
+        Analyse du CV, ou résultat d'erreur si l'analyse a échoué
+    """
+    try:
+        scope = telemetry.bind(cv_filename=filename) if telemetry is not None else None
+        analysis = analyze_cv_parlym(offer_text, cv_text, telemetry=scope, llm_backend=llm_backend)
+        analysis["cv_filename"] = filename
+        return analysis
+    except Exception as e:
+        return build_error_result(filename, e)
+
+
+def analyze_cv_group(offer_text: str, cv_group: dict, telemetry=None, llm_backend=None) -> list:
+    """
+    Analyse un groupe de CV vs l'offre en isolant les erreurs.
+    Un groupe d'un seul CV fait l'objet d'un appel classique, un groupe
+    de plusieurs CV d'une seule requête multi-CV.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_group: Dictionnaire {nom_fichier: texte_cv}
+        telemetry: Collecteur de télémétrie (ou None)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+
+    Returns:
+        Liste des analyses (ou résultats d'erreur) du groupe
+    """
+    if len(cv_group) == 1:
+        filename, cv_text = next(iter(cv_group.items()))
+        return [analyze_single_cv(offer_text, filename, cv_text, telemetry, llm_backend)]
+
+    try:
+        analyses = analyze_cv_pack(offer_text, cv_group, telemetry=telemetry, llm_backend=llm_backend)
+    except Exception as e:
+        return [build_error_result(filename, e) for filename in cv_group]
+    return [dict(analyses[filename], cv_filename=filename) for filename in cv_group]
+
+
+def prepare_cvs(cv_files_list: list, parallel_extraction: bool = True,
+                max_cv_tokens: int = CV_TOKEN_BUDGET, telemetry=None) -> tuple[dict, dict, dict]:
+    """
+    Extrait puis compacte le texte des CV (bruit, en-têtes répétés, budget de tokens).
+
+    Args:
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire (voir cv_extraction.InMemoryCV)
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        telemetry: Collecteur de télémétrie (ou None)
+
+    Returns:
+        Tuple ({nom_fichier: texte_compacté}, {nom_fichier: erreur}, {nom_fichier: tokens avant/après})
+    """
+    all_cvs, extraction_errors = extract_cvs_with_errors(
+        cv_files_list, parallel=parallel_extraction, telemetry=telemetry
+    )
+
+    token_stats = {}
+    for filename, cv_text in all_cvs.items():
+        all_cvs[filename], token_stats[filename] = compact_cv_text(cv_text, max_cv_tokens)
+
+    return all_cvs, extraction_errors, token_stats
+
+
+def build_cv_profiles(all_cvs: dict, max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                      telemetry=None, llm_backend=None) -> tuple[dict, dict]:
+    """
+    Extrait le profil structuré de chaque CV (une fois par CV, indépendamment de l'offre, mis en cache).
+    Un CV dont le profil n'a pas pu être extrait est analysé sur son texte brut.
+
+    Args:
+        all_cvs: Dictionnaire {nom_fichier: texte_cv}
+        max_concurrency: Nombre maximum d'extractions simultanées
+        telemetry: Collecteur de télémétrie (ou None)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+
+    Returns:
+        Tuple ({nom_fichier: texte à analyser}, {nom_fichier: profil})
+    """
+    def extract(filename, cv_text):
+        scope = telemetry.bind(cv_filename=filename) if telemetry is not None else None
+        return extract_cv_profile(cv_text, telemetry=scope, llm_backend=llm_backend)
+
+    cv_texts = dict(all_cvs)
+    profiles = {}
+    if not all_cvs:
+        return cv_texts, profiles
+
+    max_workers = max(1, min(max_concurrency, len(all_cvs)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(extract, filename, cv_text): filename for filename, cv_text in all_cvs.items()}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                profiles[filename] = future.result()
+            except Exception as e:
+                print(f"❌ Erreur lors de l'extraction du profil {filename}: {str(e)}")
+                continue
+            cv_texts[filename] = format_cv_profile(profiles[filename])
+
+    return cv_texts, profiles
+
+
+def annotate_result(result: dict, token_stats: dict, lexical_scores: dict = None, profiles: dict = None,
+                    duplicates: dict = None) -> dict:
+    """
+    Ajoute le statut, le score lexical, les doublons et les tokens avant/après compaction à un résultat.
+    Le nom du candidat est repris de son profil structuré lorsqu'il a été extrait.
+
+    Args:
+        result: Analyse d'un CV
+        token_stats: Dictionnaire {nom_fichier: tokens avant/après}
+        lexical_scores: Dictionnaire {nom_fichier: score_lexical} (optionnel)
+        profiles: Dictionnaire {nom_fichier: profil structuré} (optionnel)
+        duplicates: Dictionnaire {représentant: [doublons]} (optionnel)
+
+    Returns:
+        Résultat complété
+    """
+    filename = result.get("cv_filename")
+    result.setdefault("Statut", STATUS_SCORED)
+    if profiles and filename in profiles and result["Statut"] == STATUS_SCORED:
+        for field in ("Prénom", "Nom"):
+            result[field] = profiles[filename].get(field) or result.get(field, "")
+    if duplicates and filename in duplicates:
+        result["Doublons"] = duplicates[filename]
+    if lexical_scores and filename in lexical_scores:
+        result["Score_lexical"] = lexical_scores[filename]
+    if filename in token_stats:
+        result["Tokens_CV_initial"] = token_stats[filename]["tokens_before"]
+        result["Tokens_CV_compacté"] = token_stats[filename]["tokens_after"]
+    return result
+
+
+def iter_matching_workflow(offer_text: str, cv_files_list: list,
+                           max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                           parallel_extraction: bool = True,
+                           top_k: int = None, min_lexical_score: float = None,
+                           max_cv_tokens: int = CV_TOKEN_BUDGET, pack_cvs: bool = False,
+                           telemetry=None, llm_backend=None, use_cv_profiles: bool = False,
+                           detect_duplicates: bool = False):
+    """
+    Workflow de matching en flux : produit chaque analyse dès qu'elle est terminée.
+    Les CV en erreur d'extraction, puis ceux écartés par la présélection, sont produits en premier.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire (fichiers uploadés)
+        max_concurrency: Nombre maximum d'analyses simultanées
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        top_k: Présélection lexicale, nombre maximum de CV envoyés à l'IA
+        min_lexical_score: Présélection lexicale, score minimum sur 100 pour être envoyé à l'IA
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        pack_cvs: Regroupe plusieurs CV par requête IA (rubrique et offre envoyées une fois)
+        telemetry: Collecteur de télémétrie (RunTelemetry) alimenté par toutes les étapes
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        use_cv_profiles: Analyse le profil structuré de chaque CV (extrait une fois, indépendamment de l'offre)
+            au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques (les doublons lui sont rattachés)
+
+    Yields:
+        Analyse de chaque CV (ou résultat d'erreur), dans l'ordre de complétion
+    """
+    # Étapes 1 et 2: Extraction et compaction des CV
+    try:
+        all_cvs, extraction_errors, token_stats = prepare_cvs(
+            cv_files_list, parallel_extraction, max_cv_tokens, telemetry
+        )
+    except Exception as e:
+        print(f"❌ Erreur lors de l'extraction des CV: {str(e)}")
+        return
+
+    # Les CV illisibles apparaissent explicitement dans les résultats
+    for filename, error in extraction_errors.items():
+        yield build_extraction_error_result(filename, error)
+
+    # Étape 2 bis (optionnelle): Un seul CV analysé par groupe de CV quasi identiques
+    duplicates = {}
+    if detect_duplicates:
+        duplicates = remove_duplicates(all_cvs)
+        for representative, filenames in duplicates.items():
+            for filename in filenames:
+                yield annotate_result(build_duplicate_result(filename, representative), token_stats)
+
+    # Étape 3 (optionnelle): Présélection lexicale des CV envoyés à l'IA
+    lexical_scores = {}
+    if top_k is not None or min_lexical_score is not None:
+        shortlisted, lexical_scores = shortlist_cvs(offer_text, all_cvs, top_k, min_lexical_score)
+        for filename in all_cvs:
+            if filename not in shortlisted:
+                yield annotate_result(build_prescreened_result(filename, lexical_scores[filename]), token_stats, lexical_scores)
+        all_cvs = shortlisted
+
+    if not all_cvs:
+        return
+
+    # Étape 3 bis (optionnelle): Profil structuré de chaque CV, analysé à la place du texte brut
+    profiles = {}
+    if use_cv_profiles:
+        all_cvs, profiles = build_cv_profiles(all_cvs, max_concurrency, telemetry, llm_backend)
+
+    # Étape 4: Analyse IA de chaque CV (ou groupe de CV) vs Offre, en parallèle
+    if pack_cvs:
+        cached_analyses, cv_groups = plan_cv_packs(offer_text, all_cvs, telemetry=telemetry)
+        for filename, analysis in cached_analyses.items():
+            yield annotate_result(dict(analysis, cv_filename=filename), token_stats, lexical_scores, profiles,
+                                  duplicates)
+    else:
+        cv_groups = [{filename: cv_text} for filename, cv_text in all_cvs.items()]
+
+    if not cv_groups:
+        return
+
+    max_workers = max(1, min(max_concurrency, len(cv_groups)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(analyze_cv_group, offer_text, cv_group, telemetry, llm_backend): cv_group
+            for cv_group in cv_groups
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    group_results = future.result()
+                except Exception as e:
+                    group_results = [build_error_result(filename, e) for filename in futures[future]]
+                for result in group_results:
+                    yield annotate_result(result, token_stats, lexical_scores, profiles, duplicates)
+        finally:
+            # Arrêt anticipé du consommateur : on annule les analyses non démarrées
+            for future in futures:
+                future.cancel()
+
+
+def run_complete_matching_workflow(offer_text: str, cv_files_list: list,
+                                   max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                                   parallel_extraction: bool = True,
+                                   top_k: int = None, min_lexical_score: float = None,
+                                   max_cv_tokens: int = CV_TOKEN_BUDGET, pack_cvs: bool = False,
+                                   telemetry=None, llm_backend=None, use_cv_profiles: bool = False,
+                                   detect_duplicates: bool = False) -> list:
     """
     Workflow complet de matching : analyse tous les CV vs l'offre.
-    
+    Les appels à l'IA sont lancés en parallèle (max_concurrency appels simultanés).
+
     Args:
         offer_text: Texte de l'offre d'emploi
         cv_files_list: Liste des chemins vers les CV PDF
-        
+        max_concurrency: Nombre maximum d'analyses simultanées
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        top_k: Présélection lexicale, nombre maximum de CV envoyés à l'IA
+        min_lexical_score: Présélection lexicale, score minimum sur 100 pour être envoyé à l'IA
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        pack_cvs: Regroupe plusieurs CV par requête IA (rubrique et offre envoyées une fois)
+        telemetry: Collecteur de télémétrie (RunTelemetry) alimenté par toutes les étapes
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        use_cv_profiles: Analyse le profil structuré de chaque CV (extrait une fois, indépendamment de l'offre)
+            au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques (les doublons lui sont rattachés)
+
     Returns:
         Liste des analyses triées par score décroissant
     """
-    # Étape 1: Extraction des CV
+    results = list(iter_matching_workflow(
+        offer_text, cv_files_list, max_concurrency, parallel_extraction,
+        top_k, min_lexical_score, max_cv_tokens, pack_cvs, telemetry, llm_backend, use_cv_profiles,
+        detect_duplicates
+    ))
+    return sort_results(results, cv_files_list)
+
+
+def sort_results(results: list, cv_files_list: list) -> list:
+    """
+    Trie les résultats par score décroissant, l'ordre d'upload départageant les égalités.
+
+    Args:
+        results: Liste des analyses
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire, dans l'ordre d'upload
+            (les CV renommés sont reconnus sous leur nom d'affichage)
+
+    Returns:
+        Liste des analyses triées
+    """
+    upload_order = {get_cv_name(cv_path): index for index, cv_path in enumerate(cv_files_list)}
+    return sorted(
+        results,
+        key=lambda x: (-x.get('Score', 0), upload_order.get(x.get('cv_filename'), len(upload_order)))
+    )
+
+
+def build_run_parameters(top_k: int = None, min_lexical_score: float = None,
+                         max_cv_tokens: int = CV_TOKEN_BUDGET, pack_cvs: bool = False,
+                         use_cv_profiles: bool = False, detect_duplicates: bool = False) -> dict:
+    """
+    Construit les paramètres d'une exécution reprenable, qui déterminent ses résultats
+    (une exécution n'est reprise qu'avec les mêmes paramètres). Le modèle et la version
+    des prompts utilisés en font partie : changer de prompt démarre une nouvelle exécution.
+
+    Args:
+        top_k: Présélection lexicale, nombre maximum de CV envoyés à l'IA
+        min_lexical_score: Présélection lexicale, score minimum sur 100
+        max_cv_tokens: Budget de tokens par CV après compaction
+        pack_cvs: Regroupe plusieurs CV par requête IA
+        use_cv_profiles: Analyse le profil structuré de chaque CV au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques
+
+    Returns:
+        Dictionnaire des paramètres (voir RunStore.create_run)
+    """
+    parameters = {
+        "top_k": top_k, "min_lexical_score": min_lexical_score, "max_cv_tokens": max_cv_tokens,
+        "pack_cvs": pack_cvs, "use_cv_profiles": use_cv_profiles, "detect_duplicates": detect_duplicates,
+        "model": OPENAI_MODEL, "prompt_version": PROMPT_VERSION
+    }
+    if pack_cvs:
+        parameters["packed_prompt_version"] = PACKED_PROMPT_VERSION
+    if use_cv_profiles:
+        parameters["profile_prompt_version"] = PROFILE_PROMPT_VERSION
+    return parameters
+
+
+def iter_resumable_matching_workflow(offer_text: str, cv_files_list: list, run_id: str, store=None,
+                                     max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                                     parallel_extraction: bool = True,
+                                     top_k: int = None, min_lexical_score: float = None,
+                                     max_cv_tokens: int = CV_TOKEN_BUDGET, pack_cvs: bool = False,
+                                     telemetry=None, llm_backend=None, use_cv_profiles: bool = False,
+                                     detect_duplicates: bool = False):
+    """
+    Workflow de matching reprenable : chaque résultat est enregistré dès sa réception dans
+    l'historique des exécutions. À la reprise (ou quand des CV sont ajoutés à l'exécution),
+    seuls les CV sans résultat définitif sont extraits et analysés ; les CV en échec sont retraités.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire (fichiers uploadés)
+        run_id: Exécution à reprendre ou compléter, lancée avec les mêmes paramètres
+            (voir build_run_parameters, RunStore.create_run / find_latest_run)
+        store: Historique des exécutions (RunStore partagé du processus par défaut)
+        max_concurrency: Nombre maximum d'analyses simultanées
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        top_k: Présélection lexicale, nombre maximum de CV envoyés à l'IA (parmi les CV restants)
+        min_lexical_score: Présélection lexicale, score minimum sur 100 pour être envoyé à l'IA
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        pack_cvs: Regroupe plusieurs CV par requête IA (rubrique et offre envoyées une fois)
+        telemetry: Collecteur de télémétrie (RunTelemetry) alimenté par toutes les étapes
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        use_cv_profiles: Analyse le profil structuré de chaque CV (extrait une fois, indépendamment de l'offre)
+            au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques (les doublons lui sont rattachés)
+
+    Yields:
+        Résultats déjà enregistrés d'abord, puis nouveaux résultats dans l'ordre de complétion
+    """
+    store = store or get_default_run_store()
+    # Des CV écartés (présélection, doublons) avec d'autres paramètres ne seraient pas réévalués
+    store.check_run(run_id, offer_text, build_run_parameters(
+        top_k, min_lexical_score, max_cv_tokens, pack_cvs, use_cv_profiles, detect_duplicates
+    ))
+
+    # CV identifiés par leur contenu : un fichier renommé ou réimporté est reconnu
+    file_hashes = {get_cv_name(cv_path): compute_file_hash(cv_path) for cv_path in cv_files_list}
+    store.register_cvs(run_id, file_hashes)
+
+    completed = store.get_completed(run_id, list(file_hashes.values()))
+    pending_files = []
+    for cv_path in cv_files_list:
+        filename = get_cv_name(cv_path)
+        if file_hashes[filename] in completed:
+            yield dict(completed[file_hashes[filename]], cv_filename=filename)
+        else:
+            pending_files.append(cv_path)
+
+    if not pending_files:
+        return
+
+    for result in iter_matching_workflow(
+        offer_text, pending_files, max_concurrency, parallel_extraction,
+        top_k, min_lexical_score, max_cv_tokens, pack_cvs, telemetry, llm_backend, use_cv_profiles,
+        detect_duplicates
+    ):
+        filename = result.get("cv_filename")
+        if filename in file_hashes:
+            store.record_result(run_id, file_hashes[filename], result, result.get("Statut") != STATUS_FAILED)
+        yield result
+
+
+def iter_matrix_matching_workflow(offers: dict, cv_files_list: list,
+                                  max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                                  parallel_extraction: bool = True,
+                                  max_cv_tokens: int = CV_TOKEN_BUDGET,
+                                  telemetry=None, llm_backend=None, use_cv_profiles: bool = False,
+                                  detect_duplicates: bool = False):
+    """
+    Workflow matriciel : analyse chaque CV vs chaque offre.
+    Les CV sont extraits et compactés une seule fois, puis toutes les paires (offre, CV)
+    passent par un seul pool d'analyses borné (max_concurrency appels simultanés).
+
+    Args:
+        offers: Dictionnaire {nom_offre: texte_offre}
+        cv_files_list: Liste des chemins vers les CV
+        max_concurrency: Nombre maximum d'analyses simultanées
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        telemetry: Collecteur de télémétrie (RunTelemetry) alimenté par toutes les étapes
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        use_cv_profiles: Analyse le profil structuré de chaque CV (extrait une fois, indépendamment de l'offre)
+            au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques (les doublons lui sont rattachés)
+
+    Yields:
+        Analyse de chaque paire (ou résultat d'erreur), avec le nom de l'offre ("Offre"),
+        dans l'ordre de complétion
+    """
+    # Étapes 1 et 2: Extraction et compaction des CV, une seule fois pour toutes les offres
     try:
-        all_cvs = extract_multiple_cvs(cv_files_list)
+        all_cvs, extraction_errors, token_stats = prepare_cvs(
+            cv_files_list, parallel_extraction, max_cv_tokens, telemetry
+        )
     except Exception as e:
-        return []
-    
-    # Étape 2: Analyse IA de chaque CV vs Offre
-    results = []
-    for filename, cv_text in all_cvs.items():
+        print(f"❌ Erreur lors de l'extraction des CV: {str(e)}")
+        return
+
+    # Les CV illisibles apparaissent explicitement dans le classement de chaque offre
+    for offer_name in offers:
+        for filename, error in extraction_errors.items():
+            yield dict(build_extraction_error_result(filename, error), Offre=offer_name)
+
+    # Un seul CV analysé par groupe de CV quasi identiques, pour toutes les offres
+    duplicates = {}
+    if detect_duplicates:
+        duplicates = remove_duplicates(all_cvs)
+        for offer_name in offers:
+            for representative, filenames in duplicates.items():
+                for filename in filenames:
+                    yield dict(annotate_result(build_duplicate_result(filename, representative), token_stats),
+                               Offre=offer_name)
+
+    if not all_cvs or not offers:
+        return
+
+    # Étape 3 (optionnelle): Profil structuré de chaque CV, extrait une seule fois pour toutes les offres
+    profiles = {}
+    if use_cv_profiles:
+        all_cvs, profiles = build_cv_profiles(all_cvs, max_concurrency, telemetry, llm_backend)
+
+    # Étape 4: Analyse IA de toutes les paires (offre, CV) dans un seul pool
+    max_workers = max(1, min(max_concurrency, len(offers) * len(all_cvs)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for offer_name, offer_text in offers.items():
+            scope = telemetry.bind(offer_name=offer_name) if telemetry is not None else None
+            for filename, cv_text in all_cvs.items():
+                future = executor.submit(analyze_single_cv, offer_text, filename, cv_text, scope, llm_backend)
+                futures[future] = (offer_name, filename)
         try:
-            analysis = analyze_cv_parlym(offer_text, cv_text)
-            analysis["cv_filename"] = filename
-            results.append(analysis)
-        except Exception as e:
-            error_result = {
-                "cv_filename": filename,
+            for future in as_completed(futures):
+                offer_name, filename = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = build_error_result(filename, e)
+                yield dict(annotate_result(result, token_stats, profiles=profiles, duplicates=duplicates),
+                           Offre=offer_name)
+        finally:
+            # Arrêt anticipé du consommateur : on annule les analyses non démarrées
+            for future in futures:
+                future.cancel()
+
+
+def run_matrix_matching_workflow(offers: dict, cv_files_list: list,
+                                 max_concurrency: int = MAX_CONCURRENT_ANALYSES,
+                                 parallel_extraction: bool = True,
+                                 max_cv_tokens: int = CV_TOKEN_BUDGET,
+                                 telemetry=None, llm_backend=None,
+                                 use_cv_profiles: bool = False,
+                                 detect_duplicates: bool = False) -> tuple[dict, list]:
+    """
+    Workflow matriciel complet : classement par offre et meilleure offre par candidat.
+
+    Args:
+        offers: Dictionnaire {nom_offre: texte_offre}
+        cv_files_list: Liste des chemins vers les CV
+        max_concurrency: Nombre maximum d'analyses simultanées
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        telemetry: Collecteur de télémétrie (RunTelemetry) alimenté par toutes les étapes
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        use_cv_profiles: Analyse le profil structuré de chaque CV (extrait une fois, indépendamment de l'offre)
+            au lieu de son texte brut
+        detect_duplicates: N'analyse qu'un CV par groupe de CV quasi identiques (les doublons lui sont rattachés)
+
+    Returns:
+        Tuple ({nom_offre: analyses triées par score décroissant}, vue par candidat)
+    """
+    rankings = {offer_name: [] for offer_name in offers}
+    for result in iter_matrix_matching_workflow(
+        offers, cv_files_list, max_concurrency, parallel_extraction, max_cv_tokens, telemetry, llm_backend,
+        use_cv_profiles, detect_duplicates
+    ):
+        rankings[result["Offre"]].append(result)
+
+    rankings = {offer_name: sort_results(results, cv_files_list) for offer_name, results in rankings.items()}
+    return rankings, build_best_offer_view(rankings, cv_files_list)
+
+
+def build_best_offer_view(rankings: dict, cv_files_list: list) -> list:
+    """
+    Construit la vue par candidat : score pour chaque offre et meilleure offre.
+
+    Args:
+        rankings: Dictionnaire {nom_offre: analyses} (voir run_matrix_matching_workflow)
+        cv_files_list: Liste des chemins vers les CV, dans l'ordre d'upload
+
+    Returns:
+        Liste des candidats triée par meilleur score décroissant
+    """
+    candidates = {}
+    for offer_name, results in rankings.items():
+        for result in results:
+            candidate = candidates.setdefault(result["cv_filename"], {
+                "cv_filename": result["cv_filename"],
                 "Prénom": "",
                 "Nom": "",
+                "Meilleure_offre": "",
                 "Score": 0,
-                "Résumé": f"Erreur lors de l'analyse du CV {filename}",
-                "Points_forts": [],
-                "Points_vigilance": [f"Erreur technique: {str(e)}"]
-            }
-            results.append(error_result)
-    
-    # Étape 3: Tri des résultats par score décroissant
-    results.sort(key=lambda x: x.get('Score', 0), reverse=True)
-    return results
\ No newline at end of file
+                "Statut": result.get("Statut", STATUS_FAILED),
+                "Scores_par_offre": {}
+            })
+            candidate["Scores_par_offre"][offer_name] = result.get("Score", 0)
+            if result.get("Statut") != STATUS_SCORED:
+                continue
+            candidate["Prénom"] = candidate["Prénom"] or result.get("Prénom", "")
+            candidate["Nom"] = candidate["Nom"] or result.get("Nom", "")
+            if candidate["Statut"] != STATUS_SCORED or result.get("Score", 0) > candidate["Score"]:
+                candidate["Meilleure_offre"] = offer_name
+                candidate["Score"] = result.get("Score", 0)
+            candidate["Statut"] = STATUS_SCORED
+
+    return sort_results(list(candidates.values()), cv_files_list)
+
+
+def prepare_batch_cvs(offer_text: str, cv_files_list: list, parallel_extraction: bool = True,
+                      max_cv_tokens: int = CV_TOKEN_BUDGET, telemetry=None) -> tuple:
+    """
+    Extrait et compacte les CV d'une campagne batch, puis sépare ceux déjà analysés (cache) des autres.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_files_list: Liste des chemins vers les CV
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        telemetry: Collecteur de télémétrie
+
+    Returns:
+        Tuple (erreurs d'extraction, statistiques de tokens, {nom_fichier: analyse en cache},
+        {nom_fichier: texte des CV à soumettre})
+    """
+    all_cvs, extraction_errors, token_stats = prepare_cvs(
+        cv_files_list, parallel_extraction, max_cv_tokens, telemetry
+    )
+
+    cache = get_default_cache()
+    analyses = {}
+    pending_cvs = {}
+    for filename, cv_text in all_cvs.items():
+        cached = cache.get(get_analysis_cache_key(offer_text, cv_text))
+        if cached is not None:
+            analyses[filename] = cached
+            if telemetry is not None:
+                telemetry.record("llm_cache_hit", cv_filename=filename)
+        else:
+            pending_cvs[filename] = cv_text
+    return extraction_errors, token_stats, analyses, pending_cvs
+
+
+def submit_batch(offer_text: str, pending_cvs: dict, client=None, store=None) -> str:
+    """
+    Soumet les CV au Batch API et enregistre le batch dans l'historique des exécutions,
+    pour en récupérer les résultats plus tard (même depuis un autre processus).
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        pending_cvs: Dictionnaire {nom_fichier: texte_cv} des CV à analyser
+        client: Client batch (OpenAIBatchClient par défaut)
+        store: Historique des exécutions (RunStore partagé par défaut)
+
+    Returns:
+        Identifiant du batch
+    """
+    client = client or OpenAIBatchClient()
+    store = store or get_default_run_store()
+
+    requests_list, id_to_filename = build_batch_requests(offer_text, pending_cvs)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = write_batch_file(requests_list, str(Path(tmp_dir) / "batch_input.jsonl"))
+        batch_id = client.submit(input_path)
+
+    store.record_batch(batch_id, offer_text, {
+        custom_id: {"cv_filename": filename, "cache_key": get_analysis_cache_key(offer_text, pending_cvs[filename])}
+        for custom_id, filename in id_to_filename.items()
+    })
+    return batch_id
+
+
+def collect_batch(offer_text: str, batch_id: str, client=None, store=None,
+                  poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+                  timeout: float = BATCH_TIMEOUT_SECONDS, telemetry=None) -> dict:
+    """
+    Attend la fin d'un batch enregistré, puis met ses analyses en cache.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        batch_id: Identifiant du batch
+        client: Client batch (OpenAIBatchClient par défaut)
+        store: Historique des exécutions (RunStore partagé par défaut)
+        poll_interval: Intervalle entre deux vérifications du statut en secondes
+        timeout: Délai maximum d'attente en secondes (le batch reste récupérable au-delà)
+        telemetry: Collecteur de télémétrie
+
+    Returns:
+        Dictionnaire {nom_fichier: analyse ou Exception}
+    """
+    client = client or OpenAIBatchClient()
+    store = store or get_default_run_store()
+    requests = store.get_batch(batch_id, offer_text)
+    id_to_filename = {custom_id: request["cv_filename"] for custom_id, request in requests.items()}
+
+    start = time.perf_counter()
+    try:
+        status = wait_for_batch(client, batch_id, poll_interval, timeout)
+        store.update_batch_status(batch_id, status)
+        batch_analyses = parse_batch_output(client.download_output(batch_id), id_to_filename)
+        if status != "completed":
+            print(f"❌ Batch {batch_id} terminé avec le statut {status}")
+    except Exception as e:
+        status = f"error: {str(e)}"
+        batch_analyses = {filename: e for filename in id_to_filename.values()}
+    if telemetry is not None:
+        telemetry.record("llm_batch", status=status, cvs_in_request=len(id_to_filename),
+                         duration_s=time.perf_counter() - start)
+
+    cache = get_default_cache()
+    for custom_id, request in requests.items():
+        analysis = batch_analyses.get(request["cv_filename"])
+        if analysis is not None and not isinstance(analysis, Exception):
+            cache.set(request["cache_key"], analysis)
+    return batch_analyses
+
+
+def build_batch_results(extraction_errors: dict, token_stats: dict, analyses: dict, cv_files_list: list) -> list:
+    """
+    Met les analyses d'une campagne batch au même format que le workflow synchrone.
+
+    Args:
+        extraction_errors: Dictionnaire {nom_fichier: message_erreur}
+        token_stats: Statistiques de tokens par CV
+        analyses: Dictionnaire {nom_fichier: analyse ou Exception}
+        cv_files_list: Liste des chemins vers les CV (ordre d'upload)
+
+    Returns:
+        Liste des analyses triées par score décroissant
+    """
+    results = [
+        build_extraction_error_result(filename, error)
+        for filename, error in extraction_errors.items()
+    ]
+    for filename, analysis in analyses.items():
+        if isinstance(analysis, Exception):
+            result = build_error_result(filename, analysis)
+        else:
+            result = dict(analysis, cv_filename=filename)
+        results.append(annotate_result(result, token_stats))
+    return sort_results(results, cv_files_list)
+
+
+def run_batch_matching_workflow(offer_text: str, cv_files_list: list, client=None,
+                                poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+                                parallel_extraction: bool = True,
+                                max_cv_tokens: int = CV_TOKEN_BUDGET, telemetry=None,
+                                batch_id: str = None, store=None,
+                                timeout: float = BATCH_TIMEOUT_SECONDS) -> tuple[str, list]:
+    """
+    Workflow de matching hors ligne via le Batch API OpenAI (campagnes volumineuses).
+    Les CV déjà analysés (cache) ne sont pas renvoyés ; les autres sont soumis en un seul batch,
+    enregistré dans l'historique des exécutions avant l'attente. Si l'attente est interrompue
+    (délai dépassé, arrêt du processus), le même appel avec batch_id récupère les résultats
+    sans soumettre un nouveau batch.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_files_list: Liste des chemins vers les CV
+        client: Client batch (OpenAIBatchClient par défaut, LocalBatchClient pour les tests)
+        poll_interval: Intervalle entre deux vérifications du statut du batch en secondes
+        parallel_extraction: Extrait les CV dans des processus isolés (délai et mémoire bornés)
+        max_cv_tokens: Budget de tokens par CV après compaction (None pour ne pas tronquer)
+        telemetry: Collecteur de télémétrie (extraction, cache, durée du batch)
+        batch_id: Batch déjà soumis à récupérer (None pour soumettre les CV)
+        store: Historique des exécutions (RunStore partagé par défaut)
+        timeout: Délai maximum d'attente du batch en secondes
+
+    Returns:
+        Tuple (identifiant du batch ou None si tout était en cache, analyses triées par score décroissant)
+    """
+    client = client or OpenAIBatchClient()
+    store = store or get_default_run_store()
+
+    # Étapes 1 à 3: Extraction, compaction et réutilisation des analyses en cache
+    try:
+        extraction_errors, token_stats, analyses, pending_cvs = prepare_batch_cvs(
+            offer_text, cv_files_list, parallel_extraction, max_cv_tokens, telemetry
+        )
+    except Exception as e:
+        print(f"❌ Erreur lors de l'extraction des CV: {str(e)}")
+        return batch_id, []
+
+    # Étape 4: Soumission du batch (ou reprise d'un batch enregistré) et attente des résultats
+    if batch_id is None and pending_cvs:
+        try:
+            batch_id = submit_batch(offer_text, pending_cvs, client, store)
+        except Exception as e:
+            print(f"❌ Erreur lors de la soumission du batch: {str(e)}")
+            analyses.update({filename: e for filename in pending_cvs})
+            pending_cvs = {}
+    if batch_id is not None and pending_cvs:
+        batch_analyses = collect_batch(offer_text, batch_id, client, store, poll_interval, timeout, telemetry)
+        for filename in pending_cvs:
+            analyses[filename] = batch_analyses.get(
+                filename, Exception(f"CV absent du batch {batch_id}")
+            )
+
+    # Étape 5: Résultats au même format que le workflow synchrone
+    return batch_id, build_batch_results(extraction_errors, token_stats, analyses, cv_files_list)
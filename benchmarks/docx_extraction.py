@@ -0,0 +1,92 @@
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from .synthetic_cvs import generate_corpus
+
+
+def extract_with_python_docx(file_path: str) -> str:
+    """
+    Référence : extraction par le modèle objet python-docx (paragraphes du corps uniquement).
+
+    Args:
+        file_path: Chemin vers le fichier Word
+
+    Returns:
+        Texte extrait
+    """
+    from docx import Document
+
+    document = Document(file_path)
+    return "\n".join(paragraph.text for paragraph in document.paragraphs).strip()
+
+
+def measure(extract_function, paths: list) -> dict:
+    """
+    Mesure une méthode d'extraction sur un corpus : durée, caractères extraits et pic mémoire.
+
+    Args:
+        extract_function: Fonction (chemin) -> texte
+        paths: Chemins des fichiers Word
+
+    Returns:
+        Dictionnaire {duree_s, fichiers_par_s, caracteres, pic_memoire_mo}
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    characters = sum(len(extract_function(path)) for path in paths)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "duree_s": round(seconds, 3),
+        "fichiers_par_s": round(len(paths) / seconds, 1) if seconds else None,
+        "caracteres": characters,
+        "pic_memoire_mo": round(peak / 1024 / 1024, 2)
+    }
+
+
+def main(argv: list = None) -> dict:
+    """
+    Compare l'extracteur Word en flux (archive et XML lus incrémentalement) au modèle objet python-docx,
+    sur un corpus de CV et sur un document volumineux.
+
+    Args:
+        argv: Arguments de ligne de commande
+
+    Returns:
+        Mesures par corpus et par méthode
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de l'extraction des CV Word.")
+    parser.add_argument("--count", type=int, default=200, help="Nombre de CV Word")
+    parser.add_argument("--pages", type=int, default=2, help="Pages par CV")
+    parser.add_argument("--large-pages", type=int, default=300, help="Pages du document volumineux")
+    parser.add_argument("--seed", type=int, default=42, help="Graine aléatoire")
+    args = parser.parse_args(argv)
+
+    from modules.cv_extraction import extract_text_from_word
+
+    report = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpora = {
+            "corpus": generate_corpus(Path(work_dir) / "corpus", args.count, args.pages, docx_ratio=1.0, seed=args.seed),
+            "volumineux": generate_corpus(Path(work_dir) / "large", 1, args.large_pages, docx_ratio=1.0, seed=args.seed)
+        }
+        for corpus_name, paths in corpora.items():
+            report[corpus_name] = {
+                "python_docx": measure(extract_with_python_docx, paths),
+                "flux": measure(extract_text_from_word, paths)
+            }
+            report[corpus_name]["acceleration"] = round(
+                report[corpus_name]["python_docx"]["duree_s"] / max(report[corpus_name]["flux"]["duree_s"], 1e-9), 1
+            )
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules lourds qui ne doivent pas être chargés à l'affichage de la page
+HEAVY_MODULES = ["PyPDF2", "docx", "openai", "httpx", "pandas", "openpyxl", "numpy", "tiktoken"]
+
+# Imports mesurés : "modules" et "app" doivent rester légers, "backend" est donné pour information
+IMPORT_TARGETS = ["streamlit", "modules", "app", "backend"]
+LIGHT_TARGETS = ["modules", "app"]
+
+# Surcoût maximum de "import app" par rapport à "import streamlit" (ms)
+DEFAULT_BUDGET_MS = 150.0
+
+MEASURE_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+duration_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": duration_ms, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(target: str, repeat: int) -> dict:
+    """
+    Mesure l'import à froid d'un module, dans un interpréteur neuf à chaque essai.
+
+    Args:
+        target: Nom du module à importer
+        repeat: Nombre d'essais
+
+    Returns:
+        Dictionnaire {median_ms, min_ms, heavy_modules}
+    """
+    durations = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE_SCRIPT.format(target=target, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True, cwd=REPO_ROOT
+        ).stdout
+        measure = json.loads(output.strip().splitlines()[-1])
+        durations.append(measure["ms"])
+        heavy = measure["heavy"]
+    return {
+        "median_ms": round(statistics.median(durations), 1),
+        "min_ms": round(min(durations), 1),
+        "heavy_modules": heavy
+    }
+
+
+def main(argv: list = None) -> int:
+    """
+    Mesure les temps d'import et vérifie que le démarrage de l'application reste léger.
+
+    Args:
+        argv: Arguments de ligne de commande
+
+    Returns:
+        Code de sortie (0 si les vérifications passent, 1 sinon)
+    """
+    parser = argparse.ArgumentParser(description="Temps d'import à froid de l'application.")
+    parser.add_argument("--repeat", type=int, default=5, help="Essais par module")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Surcoût maximum de 'import app' par rapport à 'import streamlit' (ms)")
+    args = parser.parse_args(argv)
+
+    measures = {target: measure_import(target, args.repeat) for target in IMPORT_TARGETS}
+    print(json.dumps(measures, indent=2, ensure_ascii=False))
+
+    failures = [
+        f"'import {target}' charge {', '.join(measures[target]['heavy_modules'])}"
+        for target in LIGHT_TARGETS if measures[target]["heavy_modules"]
+    ]
+    overhead_ms = measures["app"]["median_ms"] - measures["streamlit"]["median_ms"]
+    if overhead_ms > args.budget_ms:
+        failures.append(f"'import app' coûte {overhead_ms:.0f} ms de plus que streamlit (budget {args.budget_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    if not failures:
+        print(f"✅ Démarrage léger : surcoût de l'application {overhead_ms:.0f} ms", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockCompletionHandler(BaseHTTPRequestHandler):
+    """
+    Imite l'endpoint /v1/chat/completions d'OpenAI avec structured outputs.
+    Latence et taux d'échec sont lus sur le serveur (MockCompletionServer).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        """Répond à une requête chat completions (analyse simple ou multi-CV)."""
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+
+        time.sleep(max(0.0, server.rng_gauss(server.latency, server.latency_jitter)))
+
+        rate_limit_headers = server.consume_request_quota()
+        if rate_limit_headers.get("retry-after"):
+            self._send_json(429, {"error": {"message": "Quota simulé dépassé", "type": "requests"}},
+                            rate_limit_headers)
+            return
+
+        if server.rng_random() < server.failure_rate:
+            self._send_json(500, {"error": {"message": "Erreur simulée", "type": "server_error"}})
+            return
+
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        schema_name = body.get("response_format", {}).get("json_schema", {}).get("name", "")
+        if schema_name.endswith("_packed"):
+            cv_ids = re.findall(r"\[cv_id: ([^\]]+)\]", prompt)
+            content = {"Candidats": [dict(self._fake_analysis(prompt + cv_id), cv_id=cv_id) for cv_id in cv_ids]}
+        elif schema_name == "cv_profile":
+            content = self._fake_profile(prompt)
+        else:
+            content = self._fake_analysis(prompt)
+
+        prompt_tokens = len(prompt) // 4
+        completion = json.dumps(content, ensure_ascii=False)
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(completion) // 4,
+                "total_tokens": prompt_tokens + len(completion) // 4
+            }
+        }, rate_limit_headers)
+
+    @staticmethod
+    def _fake_analysis(seed_text: str) -> dict:
+        """Produit une analyse déterministe à partir du texte reçu."""
+        digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+        return {
+            "Prénom": "Candidat",
+            "Nom": digest[:3].hex(),
+            "Score": digest[3] % 101,
+            "Résumé": "Analyse simulée par le serveur de benchmark.",
+            "Points_forts": ["Expérience en planification"],
+            "Points_vigilance": ["Secteur à confirmer"]
+        }
+
+    @staticmethod
+    def _fake_profile(seed_text: str) -> dict:
+        """Produit un profil de CV déterministe à partir du texte reçu."""
+        digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+        cv_lines = [line.strip() for line in seed_text.split("CV DU CANDIDAT :")[-1].splitlines() if line.strip()]
+        return {
+            "Prénom": "Candidat",
+            "Nom": digest[:3].hex(),
+            "Années_expérience": digest[3] % 21,
+            "Expériences": [{
+                "Intitulé": "Ingénieur planification", "Entreprise": "", "Secteur": "Nucléaire",
+                "Début": "2018", "Fin": "actuel", "Missions": [line[:80] for line in cv_lines[:3]]
+            }],
+            "Secteurs": ["Nucléaire"],
+            "Outils_compétences": ["Primavera P6"],
+            "Formations": []
+        }
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        """Envoie une réponse JSON."""
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Pas de journal par requête (bruit dans les mesures)."""
+
+
+class MockCompletionServer(ThreadingHTTPServer):
+    """
+    Serveur de complétion local, avec latence (moyenne et écart-type), taux d'échec
+    et quota de requêtes par minute (429 et en-têtes x-ratelimit-*) configurables.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.5, latency_jitter: float = 0.1, failure_rate: float = 0.0,
+                 seed: int = 42, host: str = "127.0.0.1", port: int = 0, rate_limit_rpm: int = 0):
+        super().__init__((host, port), MockCompletionHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.rate_limit_rpm = rate_limit_rpm
+        self._request_times = deque()
+        self._quota_lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread = None
+
+    def rng_gauss(self, mean: float, sigma: float) -> float:
+        """Tirage gaussien reproductible et thread-safe."""
+        with self._rng_lock:
+            return self._rng.gauss(mean, sigma)
+
+    def rng_random(self) -> float:
+        """Tirage uniforme reproductible et thread-safe."""
+        with self._rng_lock:
+            return self._rng.random()
+
+    def consume_request_quota(self) -> dict:
+        """
+        Décompte une requête sur la fenêtre glissante d'une minute.
+
+        Returns:
+            En-têtes x-ratelimit-* (avec retry-after si le quota est dépassé), vide sans quota
+        """
+        if not self.rate_limit_rpm:
+            return {}
+        with self._quota_lock:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            headers = {"x-ratelimit-limit-requests": str(self.rate_limit_rpm)}
+            if len(self._request_times) >= self.rate_limit_rpm:
+                wait = 60 - (now - self._request_times[0])
+                headers.update({
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": f"{wait:.3f}s",
+                    "retry-after": f"{max(wait, 0.001):.3f}"
+                })
+                return headers
+            self._request_times.append(now)
+            reset = 60 - (now - self._request_times[0])
+            headers.update({
+                "x-ratelimit-remaining-requests": str(self.rate_limit_rpm - len(self._request_times)),
+                "x-ratelimit-reset-requests": f"{reset:.3f}s"
+            })
+            return headers
+
+    @property
+    def base_url(self) -> str:
+        """URL de base à fournir au client OpenAI."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    def start(self) -> "MockCompletionServer":
+        """Démarre le serveur dans un thread d'arrière-plan."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le serveur."""
+        self.shutdown()
+        self.server_close()
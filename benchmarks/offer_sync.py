@@ -0,0 +1,136 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+
+class MockJobApiHandler(BaseHTTPRequestHandler):
+    """Imite l'API des offres (/api/job/<id>), avec ETag et réponses 304."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """Retourne l'offre demandée, ou 304 si l'ETag du client est à jour."""
+        server = self.server
+        time.sleep(server.latency)
+        job_id = self.path.rstrip("/").split("/")[-1]
+        payload = json.dumps({
+            "id": job_id,
+            "descriptionMission": f"<p>Mission de l'offre <b>{job_id}</b> :</p><ul>" + "<li>Planification &amp; suivi</li>" * 20 + "</ul>",
+            "descriptionProfile": "<p>Ingénieur <i>Bac+5</i>, 5 ans d'expérience.</p>" * 5
+        }, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+        with server.lock:
+            server.requests_received += 1
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        """Pas de journal par requête (bruit dans les mesures)."""
+
+
+class MockJobApiServer(ThreadingHTTPServer):
+    """Serveur local de l'API des offres, avec latence configurable."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.1, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), MockJobApiHandler)
+        self.latency = latency
+        self.requests_received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """URL de base de l'API des offres."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/job"
+
+    def start(self) -> "MockJobApiServer":
+        """Démarre le serveur dans un thread d'arrière-plan."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le serveur."""
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv: list = None) -> dict:
+    """
+    Compare la synchronisation d'une liste d'offres : requêtes séquentielles sans session,
+    récupération groupée à froid, après expiration du TTL (304) et depuis le cache.
+
+    Args:
+        argv: Arguments de ligne de commande
+
+    Returns:
+        Durées mesurées par scénario
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de synchronisation des offres (API simulée).")
+    parser.add_argument("--offers", type=int, default=200, help="Nombre d'offres")
+    parser.add_argument("--latency", type=float, default=0.1, help="Latence de l'API simulée (s)")
+    parser.add_argument("--workers", type=int, default=16, help="Récupérations simultanées")
+    args = parser.parse_args(argv)
+
+    from modules.job_processing import (
+        JobOfferFetcher,
+        combine_job_descriptions,
+        extract_description_mission,
+        extract_description_profile
+    )
+
+    server = MockJobApiServer(args.latency).start()
+    offer_urls = [f"https://parlym.nos-recrutements.fr/offre/{index}" for index in range(args.offers)]
+    report = {}
+    try:
+        # Référence : une requête sans session par offre, l'une après l'autre
+        start = time.perf_counter()
+        for url in offer_urls:
+            data = requests.get(f"{server.base_url}/{url.split('/')[-1]}", timeout=30).json()
+            combine_job_descriptions(extract_description_mission(data), extract_description_profile(data))
+        report["sequentiel_sans_session_s"] = round(time.perf_counter() - start, 3)
+
+        fetcher = JobOfferFetcher(base_url=server.base_url, pool_size=args.workers)
+        start = time.perf_counter()
+        texts = fetcher.get_offer_texts(offer_urls, args.workers)
+        report["groupe_a_froid_s"] = round(time.perf_counter() - start, 3)
+
+        fetcher.ttl_seconds = 0
+        start = time.perf_counter()
+        fetcher.get_offer_texts(offer_urls, args.workers)
+        report["groupe_conditionnel_s"] = round(time.perf_counter() - start, 3)
+        report["reponses_304"] = fetcher.not_modified
+
+        fetcher.ttl_seconds = 3600
+        start = time.perf_counter()
+        fetcher.get_offer_texts(offer_urls, args.workers)
+        report["groupe_cache_s"] = round(time.perf_counter() - start, 3)
+        report["offres_recuperees"] = sum(1 for text in texts.values() if text.startswith("**Présentation"))
+        fetcher.close()
+    finally:
+        server.stop()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return report
+
+
+if __name__ == "__main__":
+    main()
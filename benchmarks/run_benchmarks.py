@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from modules.telemetry import percentile
+
+from .mock_llm_server import MockCompletionServer
+from .synthetic_cvs import generate_corpus
+
+
+BENCHMARK_OFFER = """**Présentation du poste :**
+Ingénieur planification pour un projet industriel dans le secteur de l'énergie : élaboration
+et suivi des plannings détaillés, analyse des écarts coûts/délais, reporting client.
+
+**Profil Recherché :**
+Diplôme d'ingénieur (Bac+5), 5 ans d'expérience minimum en planification de projets
+industriels, maîtrise de Primavera P6 et MS Project."""
+
+DEFAULT_SIZES = [10, 100, 1000]
+
+
+# Intervalle d'échantillonnage de la mémoire résidente pendant une étape
+RSS_SAMPLE_INTERVAL_SECONDS = 0.01
+
+
+def current_rss_bytes():
+    """
+    Retourne la mémoire résidente actuelle du processus (Linux : /proc/self/statm).
+
+    Returns:
+        RSS en octets, ou None si indisponible
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@contextmanager
+def track_rss():
+    """
+    Mesure la croissance maximale de la mémoire résidente du processus pendant une étape,
+    par échantillonnage (ru_maxrss est un pic sur toute la vie du processus, inutilisable par étape).
+    Les processus d'extraction isolés ne sont pas comptés.
+
+    Yields:
+        Dictionnaire complété à la sortie : {peak_rss_delta_mb} (None si la mesure est indisponible)
+    """
+    measure = {"peak_rss_delta_mb": None}
+    baseline = current_rss_bytes()
+    if baseline is None:
+        yield measure
+        return
+
+    peak = [baseline]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(RSS_SAMPLE_INTERVAL_SECONDS):
+            peak[0] = max(peak[0], current_rss_bytes() or 0)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield measure
+    finally:
+        stop.set()
+        sampler.join()
+        peak[0] = max(peak[0], current_rss_bytes() or 0)
+        measure["peak_rss_delta_mb"] = round((peak[0] - baseline) / 1024 / 1024, 1)
+
+
+def stage_report(count: int, seconds: float, latencies: list, memory: dict, **extra) -> dict:
+    """
+    Construit les mesures d'une étape du benchmark.
+
+    Args:
+        count: Nombre d'éléments traités
+        seconds: Durée de l'étape
+        latencies: Latences unitaires en secondes
+        memory: Mesure mémoire de l'étape (voir track_rss)
+        extra: Mesures supplémentaires
+
+    Returns:
+        Dictionnaire des mesures
+    """
+    return {
+        "seconds": round(seconds, 4),
+        "throughput_per_s": round(count / seconds, 2) if seconds > 0 else None,
+        "latency_p50_s": round(percentile(latencies, 50), 4),
+        "latency_p95_s": round(percentile(latencies, 95), 4),
+        **memory,
+        **extra
+    }
+
+
+def run_size(size: int, args, work_dir: Path) -> dict:
+    """
+    Exécute les trois étapes (extraction, matching, export) pour un corpus de taille donnée.
+
+    Args:
+        size: Nombre de CV
+        args: Paramètres du benchmark
+        work_dir: Répertoire de travail temporaire
+
+    Returns:
+        Mesures des trois étapes
+    """
+    from backend import run_complete_matching_workflow
+    from modules.cv_extraction import clear_extraction_cache, extract_multiple_cvs
+    from modules.export_utils import export_to_excel_bytes
+    from modules.llm_cache import LLMCache, set_default_cache
+    from modules.rate_limiting import AdaptiveRateLimiter, set_default_rate_limiter
+    from modules.telemetry import RunTelemetry
+
+    corpus = generate_corpus(str(work_dir / f"corpus_{size}"), size, args.pages, args.docx_ratio, args.seed)
+    corpus_bytes = sum(os.path.getsize(path) for path in corpus)
+
+    # Étape 1: extraction seule
+    clear_extraction_cache()
+    telemetry = RunTelemetry()
+    with track_rss() as memory:
+        start = time.perf_counter()
+        cvs = extract_multiple_cvs(corpus, parallel=args.parallel, telemetry=telemetry)
+        extraction_seconds = time.perf_counter() - start
+    extraction = stage_report(
+        size, extraction_seconds,
+        [e["duration_s"] for e in telemetry.events if e["event"] == "extraction"], memory,
+        extracted=len(cvs)
+    )
+
+    # Étape 2: workflow complet contre le serveur simulé (caches vides)
+    clear_extraction_cache()
+    set_default_cache(LLMCache(work_dir / f"llm_cache_{size}.sqlite"))
+    rate_limiter = AdaptiveRateLimiter(
+        max_concurrency=args.concurrency, max_retries=args.max_retries, seed=args.seed
+    )
+    set_default_rate_limiter(rate_limiter)
+    telemetry = RunTelemetry()
+    with track_rss() as memory:
+        start = time.perf_counter()
+        results = run_complete_matching_workflow(
+            BENCHMARK_OFFER, corpus,
+            max_concurrency=args.concurrency,
+            parallel_extraction=args.parallel,
+            pack_cvs=args.pack,
+            telemetry=telemetry,
+            use_cv_profiles=args.cv_profiles
+        )
+        matching_seconds = time.perf_counter() - start
+    summary = telemetry.summary()
+    matching = stage_report(
+        size, matching_seconds,
+        [e["duration_s"] for e in telemetry.events if e["event"] == "llm_call"], memory,
+        llm_calls=summary["Appels IA"],
+        llm_errors=summary["Erreurs IA"],
+        retries=summary["Réessais"],
+        rate_limited=rate_limiter.rate_limited,
+        final_concurrency=rate_limiter.concurrency_limit,
+        prompt_tokens=summary["Tokens prompt"],
+        completion_tokens=summary["Tokens complétion"]
+    )
+
+    # Étape 3: export Excel en mémoire
+    with track_rss() as memory:
+        start = time.perf_counter()
+        excel_data = export_to_excel_bytes(results)
+        export_seconds = time.perf_counter() - start
+    export = stage_report(size, export_seconds, [export_seconds], memory, file_bytes=len(excel_data))
+
+    return {
+        "cvs": size,
+        "corpus_bytes": corpus_bytes,
+        "stages": {"extraction": extraction, "matching": matching, "export": export}
+    }
+
+
+def get_git_revision() -> str:
+    """
+    Retourne la révision git courante (pour comparer les rapports entre versions).
+
+    Returns:
+        Hash du commit, ou "unknown"
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def parse_args(argv: list = None):
+    """
+    Lit les paramètres du benchmark en ligne de commande.
+
+    Args:
+        argv: Arguments (sys.argv par défaut)
+
+    Returns:
+        Namespace argparse
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark reproductible du matching CV (corpus synthétique, IA simulée)."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Tailles de corpus")
+    parser.add_argument("--pages", type=int, default=2, help="Pages par CV")
+    parser.add_argument("--docx-ratio", type=float, default=0.3, help="Proportion de CV Word")
+    parser.add_argument("--latency", type=float, default=0.5, help="Latence moyenne de l'IA simulée (s)")
+    parser.add_argument("--latency-jitter", type=float, default=0.1, help="Écart-type de la latence (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Taux d'échec de l'IA simulée")
+    parser.add_argument("--concurrency", type=int, default=8, help="Analyses IA simultanées")
+    parser.add_argument("--max-retries", type=int, default=0, help="Réessais du limiteur de débit")
+    parser.add_argument("--rate-limit-rpm", type=int, default=0,
+                        help="Quota de requêtes par minute de l'IA simulée (0 = illimité)")
+    parser.add_argument("--parallel", action=argparse.BooleanOptionalAction, default=True,
+                        help="Extraction parallèle multi-processus")
+    parser.add_argument("--pack", action="store_true", help="Mode multi-CV par requête")
+    parser.add_argument("--cv-profiles", action="store_true",
+                        help="Analyse le profil structuré de chaque CV au lieu du texte brut")
+    parser.add_argument("--seed", type=int, default=42, help="Graine aléatoire")
+    parser.add_argument("--output", default="benchmark_report.json", help="Rapport JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> dict:
+    """
+    Lance le benchmark et écrit le rapport JSON.
+
+    Args:
+        argv: Arguments de ligne de commande
+
+    Returns:
+        Rapport du benchmark
+    """
+    args = parse_args(argv)
+
+    server = MockCompletionServer(
+        args.latency, args.latency_jitter, args.failure_rate, args.seed, rate_limit_rpm=args.rate_limit_rpm
+    ).start()
+
+    from modules.llm_backend import OpenAIBackend, set_default_backend
+    set_default_backend(OpenAIBackend(
+        api_key="sk-benchmark",
+        base_url=server.base_url,
+        max_connections=max(args.concurrency, 1)
+    ))
+
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="cv_benchmark_") as tmp_dir:
+            for size in args.sizes:
+                print(f"▶ Benchmark {size} CV...", file=sys.stderr)
+                runs.append(run_size(size, args, Path(tmp_dir)))
+    finally:
+        server.stop()
+
+    report = {
+        "benchmark": "cv_matching",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": get_git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": vars(args),
+        "runs": runs
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for run in runs:
+        stages = ", ".join(
+            f"{name} {stage['seconds']:.2f} s (p95 {stage['latency_p95_s']:.3f} s)"
+            for name, stage in run["stages"].items()
+        )
+        print(f"{run['cvs']:>6} CV : {stages}", file=sys.stderr)
+    print(f"✅ Rapport écrit : {args.output}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import random
+import zlib
+from pathlib import Path
+
+from docx import Document
+
+
+FIRST_NAMES = ["Camille", "Julien", "Sarah", "Thomas", "Inès", "Nicolas", "Léa", "Karim", "Claire", "Hugo"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Moreau", "Laurent", "Garcia", "Roux", "Fournier", "Benali", "Petit"]
+ROLES = [
+    "Ingénieur planification", "Chef de projet industriel", "Ingénieur méthodes",
+    "Responsable QHSE", "Ingénieur procédés", "Contrôleur de projet", "Ingénieur commissioning"
+]
+SECTORS = ["énergie", "oil & gas", "nucléaire", "chimie", "agroalimentaire", "ferroviaire", "aéronautique"]
+TOOLS = ["Primavera P6", "MS Project", "SAP", "Excel avancé", "Power BI", "AutoCAD", "Python", "Planisware"]
+TASKS = [
+    "Élaboration et suivi des plannings détaillés des travaux",
+    "Pilotage des interfaces entre sous-traitants et maîtrise d'ouvrage",
+    "Analyse des écarts coûts/délais et reporting hebdomadaire",
+    "Rédaction des procédures de mise en service",
+    "Animation des réunions d'avancement avec le client",
+    "Gestion des modifications et des réclamations contractuelles",
+    "Coordination des équipes terrain en phase de construction",
+]
+DEGREES = ["Diplôme d'ingénieur (Bac+5)", "Master Management de projet", "Licence professionnelle", "BTS Maintenance"]
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+LINES_PER_PAGE = 60
+
+
+def generate_cv_lines(rng: random.Random, pages: int) -> tuple[str, list]:
+    """
+    Génère le contenu textuel d'un CV fictif.
+
+    Args:
+        rng: Générateur aléatoire (reproductibilité)
+        pages: Nombre de pages visé
+
+    Returns:
+        Tuple (en-tête répété sur chaque page, lignes du corps du CV)
+    """
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    header = f"{first_name} {last_name} - {first_name.lower()}.{last_name.lower()}@example.com - 06 00 00 00 00"
+    lines = [f"{rng.choice(ROLES)} - {rng.randint(2, 20)} ans d'expérience", ""]
+
+    body_lines = (LINES_PER_PAGE - 3) * pages - len(lines)
+    year = 2024
+    while len(lines) < body_lines:
+        start = year - rng.randint(1, 4)
+        lines.append(f"{start} - {year} : {rng.choice(ROLES)}, secteur {rng.choice(SECTORS)}")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(f"- {rng.choice(TASKS)}")
+        lines.append(f"Outils : {', '.join(rng.sample(TOOLS, 3))}")
+        lines.append("")
+        year = start
+    lines = lines[:body_lines - 1] + [f"Formation : {rng.choice(DEGREES)}"]
+    return header, lines
+
+
+def _pdf_escape(text: str) -> bytes:
+    """Encode une ligne de texte pour un flux de contenu PDF (WinAnsi)."""
+    encoded = text.encode("cp1252", "replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def write_pdf(path: str, header: str, lines: list) -> str:
+    """
+    Écrit un PDF texte minimal (Helvetica), une page par bloc de LINES_PER_PAGE lignes,
+    avec en-tête et numéro de page répétés.
+
+    Args:
+        path: Chemin du fichier à créer
+        header: En-tête répété sur chaque page
+        lines: Lignes du corps du CV
+
+    Returns:
+        Chemin du fichier créé
+    """
+    body_per_page = LINES_PER_PAGE - 3
+    chunks = [lines[i:i + body_per_page] for i in range(0, len(lines), body_per_page)] or [[]]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page_number, chunk in enumerate(chunks, start=1):
+        content = [b"BT /F1 9 Tf 12 TL 40 800 Td (" + _pdf_escape(header) + b") Tj T* T*"]
+        content += [b"(" + _pdf_escape(line) + b") ' " for line in chunk]
+        content.append(b"T* (" + _pdf_escape(f"Page {page_number}/{len(chunks)}") + b") ' ET")
+        stream = zlib.compress(b"\n".join(content))
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_id)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    Path(path).write_bytes(bytes(output))
+    return path
+
+
+def write_docx(path: str, header: str, lines: list) -> str:
+    """
+    Écrit un CV Word avec en-tête de section, paragraphes et un tableau de compétences.
+
+    Args:
+        path: Chemin du fichier à créer
+        header: En-tête de section
+        lines: Lignes du corps du CV
+
+    Returns:
+        Chemin du fichier créé
+    """
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = header
+    for line in lines:
+        document.add_paragraph(line)
+    table = document.add_table(rows=len(TOOLS[:4]), cols=2)
+    for row, tool in zip(table.rows, TOOLS[:4]):
+        row.cells[0].text = tool
+        row.cells[1].text = "Confirmé"
+    document.save(path)
+    return path
+
+
+def generate_corpus(output_dir: str, count: int, pages: int = 2, docx_ratio: float = 0.3,
+                    seed: int = 42) -> list:
+    """
+    Génère un corpus reproductible de CV fictifs PDF et DOCX.
+
+    Args:
+        output_dir: Répertoire de sortie
+        count: Nombre de CV
+        pages: Nombre de pages par CV
+        docx_ratio: Proportion de CV au format Word
+        seed: Graine aléatoire
+
+    Returns:
+        Liste des chemins des CV générés
+    """
+    rng = random.Random(seed)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for index in range(count):
+        header, lines = generate_cv_lines(rng, pages)
+        if rng.random() < docx_ratio:
+            paths.append(write_docx(str(output_path / f"cv_{index:05d}.docx"), header, lines))
+        else:
+            paths.append(write_pdf(str(output_path / f"cv_{index:05d}.pdf"), header, lines))
+    return paths
@@ -0,0 +1,333 @@
+import argparse
+import csv
+import glob
+import json
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from backend import (
+    MAX_CONCURRENT_ANALYSES,
+    build_best_offer_view,
+    build_run_parameters,
+    iter_matrix_matching_workflow,
+    iter_resumable_matching_workflow,
+    sort_results
+)
+from modules.ai_analysis import STATUS_FAILED
+from modules.cv_archive import expand_cv_archives
+from modules.cv_extraction import NamedCVPath, disambiguate_cv_names
+from modules.export_utils import export_matrix_to_excel_bytes, export_result_to_row
+from modules.run_store import RunStore, get_default_run_store
+from modules.telemetry import RunTelemetry, build_sinks_from_env
+from modules.text_compaction import CV_TOKEN_BUDGET
+
+# Extensions de CV prises en charge (les archives ZIP sont lues membre par membre)
+CV_EXTENSIONS = {".pdf", ".docx", ".zip"}
+
+
+def load_offer_text(offer_file: str = None, offer_url: str = None) -> str:
+    """
+    Charge le texte de l'offre depuis un fichier texte ou une URL d'offre.
+
+    Args:
+        offer_file: Chemin du fichier texte de l'offre ("-" pour l'entrée standard)
+        offer_url: URL de l'offre d'emploi (API des offres)
+
+    Returns:
+        Texte de l'offre
+    """
+    if offer_url:
+        from modules.job_processing import OFFER_ERROR_MESSAGE, process_job_offer_workflow
+
+        offer_text = process_job_offer_workflow(offer_url)
+        if offer_text == OFFER_ERROR_MESSAGE:
+            raise ValueError(f"Offre introuvable : {offer_url}")
+        return offer_text
+    if offer_file == "-":
+        return sys.stdin.read()
+    return Path(offer_file).read_text(encoding="utf-8")
+
+
+def load_offers(offer_files: list = None, offer_urls: list = None) -> dict:
+    """
+    Charge les offres à analyser, chacune sous un nom unique (nom du fichier ou fin de l'URL).
+
+    Args:
+        offer_files: Chemins des fichiers texte des offres ("-" pour l'entrée standard)
+        offer_urls: URL des offres d'emploi (API des offres)
+
+    Returns:
+        Dictionnaire {nom_offre: texte_offre}, dans l'ordre des paramètres
+    """
+    if offer_urls:
+        sources = [(None, offer_url) for offer_url in offer_urls]
+    else:
+        sources = [(offer_file, None) for offer_file in offer_files]
+    names = disambiguate_cv_names([offer_file or offer_url.rstrip("/") for offer_file, offer_url in sources])
+    return {name: load_offer_text(offer_file, offer_url) for name, (offer_file, offer_url) in zip(names, sources)}
+
+
+def collect_cv_files(patterns: list) -> list:
+    """
+    Liste les CV (et archives ZIP de CV) à analyser à partir de répertoires, de fichiers ou de motifs glob.
+    Les fichiers de même nom dans des répertoires différents sont tous retenus, sous un nom
+    complété par leur répertoire ("alice/CV.pdf") : les résultats sont indexés par nom.
+
+    Args:
+        patterns: Répertoires, chemins ou motifs glob ("cvs/**/*.pdf")
+
+    Returns:
+        Liste triée des CV (chemins, ou NamedCVPath pour les noms complétés)
+    """
+    paths = []
+    for pattern in patterns:
+        if Path(pattern).is_dir():
+            paths.extend(sorted(Path(pattern).iterdir()))
+        else:
+            paths.extend(Path(match) for match in sorted(glob.glob(pattern, recursive=True)))
+
+    # Un même fichier désigné par plusieurs motifs n'est analysé qu'une fois
+    cv_paths = {}
+    for path in paths:
+        if path.is_file() and path.suffix.lower() in CV_EXTENSIONS:
+            cv_paths.setdefault(path.resolve(), path)
+
+    cv_files = []
+    names = disambiguate_cv_names(list(cv_paths))
+    for path, name in zip(cv_paths.values(), names):
+        cv_files.append(str(path) if name == path.name else NamedCVPath(str(path), name))
+    return cv_files
+
+
+class ResultWriter:
+    """Écrit chaque résultat dès sa réception, au format JSONL ou CSV (fichier ou sortie standard)."""
+
+    def __init__(self, output: str, output_format: str, stdout=None):
+        self.output_format = output_format
+        self.stdout = stdout or sys.stdout
+        self.file = self.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+        self._csv_writer = None
+
+    def write(self, result: dict) -> None:
+        """
+        Écrit un résultat et vide le tampon (lecture possible pendant l'exécution).
+
+        Args:
+            result: Résultat d'analyse d'un CV (avec le nom de l'offre "Offre" en mode matriciel)
+        """
+        if self.output_format == "jsonl":
+            self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            row = export_result_to_row(result)
+            if "Offre" in result:
+                row = {"Offre": result["Offre"], **row}
+            if self._csv_writer is None:
+                self._csv_writer = csv.DictWriter(self.file, fieldnames=list(row))
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+        self.file.flush()
+
+    def close(self) -> None:
+        """Ferme le fichier de sortie."""
+        if self.file is not self.stdout:
+            self.file.close()
+
+
+def parse_args(argv: list = None):
+    """
+    Lit les paramètres de la ligne de commande.
+
+    Args:
+        argv: Arguments (sys.argv par défaut)
+
+    Returns:
+        Namespace argparse
+    """
+    parser = argparse.ArgumentParser(
+        description="Matching CV / offre d'emploi en ligne de commande (résultats écrits au fil de l'eau)."
+    )
+    offer = parser.add_mutually_exclusive_group(required=True)
+    offer.add_argument("--offer", nargs="+",
+                       help="Fichier texte de l'offre ('-' pour l'entrée standard) ; "
+                            "plusieurs fichiers : chaque CV est analysé vs chaque offre")
+    offer.add_argument("--offer-url", nargs="+", help="URL de l'offre d'emploi (plusieurs URL : comme --offer)")
+    parser.add_argument("--cvs", nargs="+", required=True, help="Répertoires, fichiers, archives ZIP ou motifs glob des CV")
+    parser.add_argument("--output", default="-", help="Fichier de sortie ('-' pour la sortie standard)")
+    parser.add_argument("--matrix-output",
+                        help="Plusieurs offres : classeur Excel de la matrice (meilleure offre par candidat, "
+                             "classement de chaque offre)")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="Format de sortie (déduit de l'extension du fichier, jsonl par défaut)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_ANALYSES, help="Analyses IA simultanées")
+    parser.add_argument("--top-k", type=int, help="Présélection lexicale : nombre maximum de CV envoyés à l'IA")
+    parser.add_argument("--min-lexical-score", type=float, help="Présélection lexicale : score minimum sur 100")
+    parser.add_argument("--max-cv-tokens", type=int, default=CV_TOKEN_BUDGET, help="Budget de tokens par CV")
+    parser.add_argument("--pack", action="store_true", help="Mode multi-CV par requête")
+    parser.add_argument("--cv-profiles", action="store_true",
+                        help="Analyse le profil structuré de chaque CV (extrait une fois, mis en cache) au lieu du texte brut")
+    parser.add_argument("--dedup", action="store_true",
+                        help="N'analyse qu'un CV par groupe de CV quasi identiques (PDF et Word du même CV...)")
+    parser.add_argument("--parallel-extraction", action=argparse.BooleanOptionalAction, default=True,
+                        help="Extraction dans des processus isolés")
+    run = parser.add_mutually_exclusive_group()
+    run.add_argument("--run-id", help="Reprend ou complète une exécution enregistrée")
+    run.add_argument("--resume", action="store_true",
+                     help="Reprend la dernière exécution de la même offre avec les mêmes paramètres "
+                          "(seuls les CV restants sont analysés)")
+    parser.add_argument("--run-store", help="Base SQLite de l'historique des exécutions")
+    parser.add_argument("--fake-llm", action="store_true", help="Backend IA simulé, sans appel réseau (essai)")
+    parser.add_argument("--quiet", action="store_true", help="Pas de progression sur la sortie d'erreur")
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> int:
+    """
+    Lance le matching et écrit les résultats au fil de l'eau.
+
+    Args:
+        argv: Arguments de ligne de commande
+
+    Returns:
+        Code de sortie (0 si tous les CV ont été traités, 1 sinon)
+    """
+    args = parse_args(argv)
+
+    # Les messages des modules (print) partent sur la sortie d'erreur : la sortie standard
+    # ne reçoit que les résultats (JSONL ou CSV exploitables par un autre programme)
+    stdout = sys.stdout
+    with redirect_stdout(sys.stderr):
+        return run_matching(args, stdout)
+
+
+def run_matching(args, stdout) -> int:
+    """
+    Exécute le matching décrit par les paramètres de la ligne de commande.
+
+    Args:
+        args: Paramètres lus par parse_args
+        stdout: Sortie standard d'origine, réservée aux résultats
+
+    Returns:
+        Code de sortie (0 si tous les CV ont été traités, 1 sinon)
+    """
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+
+    try:
+        offers = load_offers(args.offer, args.offer_url)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erreur lors du chargement de l'offre : {e}", file=sys.stderr)
+        return 1
+    if len(offers) > 1 and (args.run_id or args.resume or args.pack or args.top_k or args.min_lexical_score):
+        print("❌ --run-id, --resume, --pack, --top-k et --min-lexical-score ne s'appliquent qu'à une seule offre",
+              file=sys.stderr)
+        return 1
+
+    cv_files, archive_errors = expand_cv_archives(collect_cv_files(args.cvs))
+    for name, error in archive_errors.items():
+        print(f"❌ {name} ignoré : {error}", file=sys.stderr)
+    if not cv_files:
+        print("❌ Aucun CV trouvé (PDF, DOCX ou archive ZIP)", file=sys.stderr)
+        return 1
+
+    llm_backend = None
+    if args.fake_llm:
+        from modules.llm_backend import FakeLLMBackend
+        llm_backend = FakeLLMBackend()
+
+    if len(offers) > 1:
+        return run_matrix_matching(args, offers, cv_files, llm_backend, ResultWriter(args.output, output_format, stdout))
+
+    offer_text = next(iter(offers.values()))
+    store = RunStore(args.run_store) if args.run_store else get_default_run_store()
+    parameters = build_run_parameters(
+        args.top_k, args.min_lexical_score, args.max_cv_tokens, args.pack, args.cv_profiles, args.dedup
+    )
+    run_id = args.run_id or (store.find_latest_run(offer_text, parameters) if args.resume else None)
+    if args.run_id:
+        try:
+            store.check_run(args.run_id, offer_text, parameters)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    if run_id is None:
+        run_id = store.create_run(offer_text, parameters)
+    if not args.quiet:
+        print(f"▶ Exécution {run_id}", file=sys.stderr)
+
+    telemetry = RunTelemetry(build_sinks_from_env())
+    writer = ResultWriter(args.output, output_format, stdout)
+    processed = 0
+    failed = 0
+    try:
+        for result in iter_resumable_matching_workflow(
+            offer_text, cv_files, run_id, store, args.concurrency, args.parallel_extraction,
+            args.top_k, args.min_lexical_score, args.max_cv_tokens, args.pack,
+            telemetry, llm_backend, args.cv_profiles, args.dedup
+        ):
+            writer.write(result)
+            processed += 1
+            failed += result.get("Statut") == STATUS_FAILED
+            if not args.quiet:
+                print(f"[{processed}/{len(cv_files)}] {result.get('cv_filename', '')} : "
+                      f"{result.get('Score', 0)}/100 ({result.get('Statut', '')})", file=sys.stderr)
+    finally:
+        writer.close()
+        summary = telemetry.flush()
+
+    if not args.quiet:
+        print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+        print(f"✅ {processed} CV traités, {failed} en échec", file=sys.stderr)
+    return 0 if processed == len(cv_files) else 1
+
+
+def run_matrix_matching(args, offers: dict, cv_files: list, llm_backend, writer: ResultWriter) -> int:
+    """
+    Analyse chaque CV vs chaque offre, écrit chaque paire au fil de l'eau puis, si demandé,
+    le classeur de la matrice (--matrix-output).
+
+    Args:
+        args: Paramètres lus par parse_args
+        offers: Dictionnaire {nom_offre: texte_offre}
+        cv_files: CV à analyser
+        llm_backend: Backend IA (None pour le backend partagé)
+        writer: Sortie des résultats
+
+    Returns:
+        Code de sortie (0 si toutes les paires ont été traitées, 1 sinon)
+    """
+    telemetry = RunTelemetry(build_sinks_from_env())
+    rankings = {offer_name: [] for offer_name in offers}
+    total = len(offers) * len(cv_files)
+    processed = 0
+    failed = 0
+    try:
+        for result in iter_matrix_matching_workflow(
+            offers, cv_files, args.concurrency, args.parallel_extraction, args.max_cv_tokens,
+            telemetry, llm_backend, args.cv_profiles, args.dedup
+        ):
+            writer.write(result)
+            rankings[result["Offre"]].append(result)
+            processed += 1
+            failed += result.get("Statut") == STATUS_FAILED
+            if not args.quiet:
+                print(f"[{processed}/{total}] {result['Offre']} / {result.get('cv_filename', '')} : "
+                      f"{result.get('Score', 0)}/100 ({result.get('Statut', '')})", file=sys.stderr)
+
+        if args.matrix_output:
+            rankings = {offer_name: sort_results(results, cv_files) for offer_name, results in rankings.items()}
+            Path(args.matrix_output).write_bytes(export_matrix_to_excel_bytes(
+                rankings, build_best_offer_view(rankings, cv_files), telemetry=telemetry
+            ))
+    finally:
+        writer.close()
+        summary = telemetry.flush()
+
+    if not args.quiet:
+        print(json.dumps(summary, ensure_ascii=False, indent=2), file=sys.stderr)
+        print(f"✅ {processed} paires offre / CV traitées, {failed} en échec", file=sys.stderr)
+    return 0 if processed == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,35 @@
-# Import des fonctions principales de chaque module
-from .cv_extraction import (
-    extract_text_from_pdf,
-    extract_multiple_cvs
-)
+# Import différé des fonctions principales de chaque module : "import modules" ne charge
+# ni PyPDF2, ni python-docx, ni openai, ni pandas tant qu'une fonction n'est pas utilisée
+import importlib
 
-from .ai_analysis import (
-    analyze_cv_parlym,
-)
-
-from .export_utils import (
-    export_to_excel,
-)
-
-# Définition de ce qui est accessible quand on fait : from modules import *
-__all__ = [
+_EXPORTS = {
     # CV extraction
-    'extract_text_from_pdf',
-    'extract_multiple_cvs',
-    
+    'extract_text_from_pdf': '.cv_extraction',
+    'extract_multiple_cvs': '.cv_extraction',
+
     # AI analysis
-    'analyze_cv_parlym',
+    'analyze_cv_parlym': '.ai_analysis',
 
     # Export
-    'export_to_excel'
-]
+    'export_to_excel': '.export_utils',
+}
+
+# Définition de ce qui est accessible quand on fait : from modules import *
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    Charge le sous-module d'une fonction exportée à la première utilisation.
+
+    Args:
+        name: Nom de l'attribut demandé
 
+    Returns:
+        Fonction exportée
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
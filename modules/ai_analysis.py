@@ -1,24 +1,100 @@
-import openai
 import json
-import streamlit as st
+import copy
+import time
 
+from .llm_backend import get_default_backend
+from .llm_cache import compute_cache_key, get_default_cache
+from .rate_limiting import get_default_rate_limiter
+from .text_compaction import count_tokens
 
-openai.api_key = st.secrets["OPENAI_API_KEY"]
+# Modèle utilisé pour le scoring
+OPENAI_MODEL = "gpt-4o-mini"
 
+# Limites du modèle, utilisées pour dimensionner les requêtes multi-CV
+MODEL_CONTEXT_TOKENS = 128000
+MODEL_MAX_OUTPUT_TOKENS = 16384
 
-def create_parlym_scoring_prompt(job_description: str, cv_text: str) -> str:
-    """
-    Crée le prompt pour l'analyse de matching selon les critères PARLYM.
-    
-    Args:
-        job_description: Description formatée de l'offre
-        cv_text: Texte extrait du CV
-        
-    Returns:
-        Prompt structuré pour GPT-4o mini
-    """
-    
-    prompt = f"""# Instructions pour l'Analyse de Matching Recrutement
+# Réserve de tokens de réponse par candidat et nombre maximum de CV par requête multi-CV
+OUTPUT_TOKENS_PER_CV = 700
+MAX_CVS_PER_PACK = 8
+
+# Statut d'un résultat : un score de 0 attribué par l'IA n'est pas un échec technique
+STATUS_SCORED = "Analysé"
+STATUS_FAILED = "Échec"
+
+# Schéma JSON pour structured outputs
+PARLYM_JSON_SCHEMA = {
+    "name": "cv_analysis_parlym",
+    "description": "Analyse de matching CV vs offre d'emploi selon critères PARLYM",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "Prénom": {
+                "type": "string",
+                "description": "Prénom du candidat"
+            },
+            "Nom": {
+                "type": "string", 
+                "description": "Nom du candidat"
+            },
+            "Score": {
+                "type": "integer",
+                "description": "Score de matching sur 100 selon grille PARLYM",
+                "minimum": 0,
+                "maximum": 100
+            },
+            "Résumé": {
+                "type": "string",
+                "description": "Résumé synthétique du profil candidat"
+            },
+            "Points_forts": {
+                "type": "array",
+                "description": "Liste des points forts du candidat par rapport à l'offre",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "Points_vigilance": {
+                "type": "array", 
+                "description": "Liste des points de vigilance du candidat par rapport à l'offre",
+                "items": {
+                    "type": "string"
+                }
+            }
+        },
+        "required": ["Prénom", "Nom", "Score", "Résumé", "Points_forts", "Points_vigilance"],
+        "additionalProperties": False
+    }
+}
+
+
+# Schéma JSON multi-CV : un objet par candidat, identifié par cv_id
+PARLYM_PACKED_JSON_SCHEMA = {
+    "name": "cv_analysis_parlym_packed",
+    "description": "Analyses de matching de plusieurs CV vs une offre d'emploi selon critères PARLYM",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "Candidats": {
+                "type": "array",
+                "description": "Une analyse par CV fourni",
+                "items": copy.deepcopy(PARLYM_JSON_SCHEMA["schema"])
+            }
+        },
+        "required": ["Candidats"],
+        "additionalProperties": False
+    }
+}
+PARLYM_PACKED_JSON_SCHEMA["schema"]["properties"]["Candidats"]["items"]["properties"]["cv_id"] = {
+    "type": "string",
+    "description": "Identifiant du CV analysé, tel que fourni dans le prompt"
+}
+PARLYM_PACKED_JSON_SCHEMA["schema"]["properties"]["Candidats"]["items"]["required"].insert(0, "cv_id")
+
+# Instructions et grille de scoring PARLYM (communes à tous les prompts)
+PARLYM_INSTRUCTIONS = """# Instructions pour l'Analyse de Matching Recrutement
 
 ## Contexte :
 Tu es un expert en recrutement avec une spécialité dans l'ingénierie industrielle.  
@@ -90,7 +166,22 @@ Attribuer un score de matching entre un CV et une offre d'emploi Parlym, basé s
 **NB :**  
 Cette grille est conçue pour s'adapter à tous types d'offres Parlym, en se concentrant sur les critères globaux et structurants du matching, tout en restant agnostique des activités spécifiques.
 
-RÉPONDRE UNIQUEMENT AVEC UN JSON VALIDE, SANS AUCUN TEXTE EXPLICATIF
+RÉPONDRE UNIQUEMENT AVEC UN JSON VALIDE, SANS AUCUN TEXTE EXPLICATIF"""
+
+
+def create_parlym_scoring_prompt(job_description: str, cv_text: str) -> str:
+    """
+    Crée le prompt pour l'analyse de matching selon les critères PARLYM.
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cv_text: Texte extrait du CV
+        
+    Returns:
+        Prompt structuré pour GPT-4o mini
+    """
+    
+    prompt = f"""{PARLYM_INSTRUCTIONS}
 
 ---
 
@@ -105,99 +196,562 @@ CV DU CANDIDAT :
     return prompt
 
 
-def analyze_cv_parlym(job_description: str, cv_text: str) -> dict:
+def compute_prompt_version() -> str:
     """
-    Analyse complète CV vs Offre avec structured outputs OpenAI.
-    Combine le prompt PARLYM + l'appel API en une seule fonction.
+    Calcule la version du prompt et du schéma (empreinte du gabarit PARLYM).
+    Toute modification du prompt ou du schéma invalide le cache des analyses.
+    
+    Returns:
+        Empreinte hexadécimale du gabarit de prompt et du schéma JSON
+    """
+    template = create_parlym_scoring_prompt("{job_description}", "{cv_text}")
+    schema = json.dumps(PARLYM_JSON_SCHEMA, sort_keys=True, ensure_ascii=False)
+    return compute_cache_key(template, schema)
+
+
+PROMPT_VERSION = compute_prompt_version()
+
+
+def get_analysis_cache_key(job_description: str, cv_text: str) -> str:
+    """
+    Calcule la clé de cache d'une analyse (offre, CV, modèle, version du prompt).
     
     Args:
         job_description: Description formatée de l'offre
         cv_text: Texte extrait du CV
-        api_key: Clé API OpenAI
         
     Returns:
-        Dictionnaire structuré avec l'analyse complète
+        Clé de cache SHA-256
     """
+    return compute_cache_key(job_description, cv_text, OPENAI_MODEL, PROMPT_VERSION)
+
+
+def build_chat_request(job_description: str, cv_text: str) -> dict:
+    """
+    Construit les paramètres de la requête chat completions pour un CV.
+    Partagé entre l'appel direct et le mode batch.
     
+    Args:
+        job_description: Description formatée de l'offre
+        cv_text: Texte extrait du CV
+        
+    Returns:
+        Paramètres de la requête (modèle, messages, format de réponse)
+    """
     # Création du prompt PARLYM complet
     prompt = create_parlym_scoring_prompt(job_description, cv_text)
     
-    # Schéma JSON pour structured outputs
-    json_schema = {
-        "name": "cv_analysis_parlym",
-        "description": "Analyse de matching CV vs offre d'emploi selon critères PARLYM",
-        "strict": True,
-        "schema": {
-            "type": "object",
-            "properties": {
-                "Prénom": {
-                    "type": "string",
-                    "description": "Prénom du candidat"
-                },
-                "Nom": {
-                    "type": "string", 
-                    "description": "Nom du candidat"
-                },
-                "Score": {
-                    "type": "integer",
-                    "description": "Score de matching sur 100 selon grille PARLYM",
-                    "minimum": 0,
-                    "maximum": 100
-                },
-                "Résumé": {
-                    "type": "string",
-                    "description": "Résumé synthétique du profil candidat"
-                },
-                "Points_forts": {
-                    "type": "array",
-                    "description": "Liste des points forts du candidat par rapport à l'offre",
-                    "items": {
-                        "type": "string"
-                    }
-                },
-                "Points_vigilance": {
-                    "type": "array", 
-                    "description": "Liste des points de vigilance du candidat par rapport à l'offre",
-                    "items": {
-                        "type": "string"
-                    }
-                }
-            },
-            "required": ["Prénom", "Nom", "Score", "Résumé", "Points_forts", "Points_vigilance"],
-            "additionalProperties": False
-        }
+    return {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": PARLYM_JSON_SCHEMA
+        },
+        #"max_tokens": 2000,
+        "temperature": 0
     }
+
+
+def record_llm_call(telemetry, start: float, response=None, error: Exception = None, **fields) -> None:
+    """
+    Enregistre un appel IA dans la télémétrie (latence, tokens, statut).
+    
+    Args:
+        telemetry: Collecteur de télémétrie (ou None)
+        start: Instant de début de l'appel (time.perf_counter())
+        response: Réponse du backend IA, pour les tokens consommés
+        error: Exception levée par l'appel, le cas échéant
+        fields: Données supplémentaires de l'événement
+    """
+    if telemetry is None:
+        return
+    response = response or {}
+    telemetry.record(
+        "llm_call",
+        model=OPENAI_MODEL,
+        status="error" if error is not None else "ok",
+        duration_s=time.perf_counter() - start,
+        prompt_tokens=response.get("prompt_tokens", 0),
+        completion_tokens=response.get("completion_tokens", 0),
+        retries=response.get("retries", getattr(error, "retries", 0)),
+        **({"error": str(error)} if error is not None else {}),
+        **fields
+    )
+
+
+def call_llm(request: dict, llm_backend=None, estimated_tokens: int = 0) -> dict:
+    """
+    Envoie une requête au backend IA à travers le limiteur partagé (quotas, concurrence, réessais).
     
+    Args:
+        request: Paramètres de la requête chat completions
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        estimated_tokens: Tokens estimés de la requête (prompt et réponse)
+        
+    Returns:
+        Réponse du backend, avec le nombre de réessais ("retries")
+    """
+    backend = llm_backend or get_default_backend()
+    return get_default_rate_limiter().call(backend.complete, request, estimated_tokens=estimated_tokens)
+
+
+def analyze_cv_parlym(job_description: str, cv_text: str, use_cache: bool = True,
+                      telemetry=None, llm_backend=None) -> dict:
+    """
+    Analyse complète CV vs Offre avec structured outputs OpenAI.
+    Combine le prompt PARLYM + l'appel API en une seule fonction.
+    Les analyses réussies sont mises en cache (offre, CV, modèle, version du prompt).
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cv_text: Texte extrait du CV
+        use_cache: Utilise le cache persistant des analyses
+        telemetry: Collecteur de télémétrie (latence, tokens, erreurs)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        
+    Returns:
+        Dictionnaire structuré avec l'analyse complète
+    """
+    
+    cache_key = get_analysis_cache_key(job_description, cv_text)
+    if use_cache:
+        cached = get_default_cache().get(cache_key)
+        if cached is not None:
+            if telemetry is not None:
+                telemetry.record("llm_cache_hit")
+            return cached
+    
+    start = time.perf_counter()
+    response = None
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": json_schema
-            },
-            #max_tokens=2000,
-            temperature=0
+        request = build_chat_request(job_description, cv_text)
+        response = call_llm(
+            request, llm_backend,
+            estimated_tokens=count_tokens(request["messages"][-1]["content"]) + OUTPUT_TOKENS_PER_CV
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(response["content"])
         
-        return result
+        if use_cache:
+            get_default_cache().set(cache_key, result)
         
     except Exception as e:
+        record_llm_call(telemetry, start, response, e)
         print(f"❌ Erreur lors de l'analyse: {str(e)}")
         # Retour d'erreur structuré
         return {
             "Prénom": "",
             "Nom": "",
             "Score": 0,
+            "Statut": STATUS_FAILED,
             "Résumé": f"Erreur lors de l'analyse: {str(e)}",
             "Points_forts": [],
             "Points_vigilance": [f"Erreur technique: {str(e)}"]
         }
     
+    # Hors du try : une erreur de télémétrie ne transforme pas une analyse réussie en échec
+    record_llm_call(telemetry, start, response)
+    return result
+
+
+def create_parlym_packed_prompt(job_description: str, cvs: dict) -> str:
+    """
+    Crée le prompt PARLYM pour analyser plusieurs CV en une seule requête.
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cvs: Dictionnaire {cv_id: texte_cv}
+        
+    Returns:
+        Prompt structuré pour GPT-4o mini
+    """
+    cv_sections = "\n\n---\n\n".join(
+        f"CV DU CANDIDAT [cv_id: {cv_id}] :\n{cv_text}" for cv_id, cv_text in cvs.items()
+    )
+    
+    prompt = f"""{PARLYM_INSTRUCTIONS}
+
+PLUSIEURS CV SONT FOURNIS : analyse chaque CV indépendamment des autres et retourne
+une entrée par CV dans "Candidats", avec son identifiant exact dans "cv_id".
+
+---
+
+OFFRE D'EMPLOI :
+{job_description}
+
+---
+
+{cv_sections}"""
+    
+    return prompt
+
+
+PACKED_PROMPT_VERSION = compute_cache_key(
+    create_parlym_packed_prompt("{job_description}", {"{cv_id}": "{cv_text}"}),
+    json.dumps(PARLYM_PACKED_JSON_SCHEMA, sort_keys=True, ensure_ascii=False)
+)
+
+
+def get_packed_analysis_cache_key(job_description: str, cv_text: str) -> str:
+    """
+    Calcule la clé de cache d'une analyse obtenue en mode multi-CV.
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cv_text: Texte extrait du CV
+        
+    Returns:
+        Clé de cache SHA-256
+    """
+    return compute_cache_key(job_description, cv_text, OPENAI_MODEL, PACKED_PROMPT_VERSION)
+
+
+def plan_cv_packs(job_description: str, cvs: dict, use_cache: bool = True,
+                  max_cvs_per_pack: int = MAX_CVS_PER_PACK, telemetry=None) -> tuple[dict, list]:
+    """
+    Répartit les CV en groupes tenant dans le contexte du modèle.
+    Les CV sont regroupés par ordre de taille, jusqu'à la limite de contexte
+    (prompt + CV + réserve de réponse) ou de max_cvs_per_pack CV.
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cvs: Dictionnaire {nom_fichier: texte_cv}
+        use_cache: Sort des groupes les CV déjà analysés en mode multi-CV
+        max_cvs_per_pack: Nombre maximum de CV par requête
+        telemetry: Collecteur de télémétrie (analyses en cache)
+        
+    Returns:
+        Tuple ({nom_fichier: analyse en cache}, [{nom_fichier: texte_cv}, ...])
+    """
+    cached_analyses = {}
+    pending = {}
+    for filename, cv_text in cvs.items():
+        cached = get_default_cache().get(get_packed_analysis_cache_key(job_description, cv_text)) if use_cache else None
+        if cached is not None:
+            cached_analyses[filename] = cached
+            if telemetry is not None:
+                telemetry.record("llm_cache_hit", cv_filename=filename)
+        else:
+            pending[filename] = cv_text
+    
+    base_tokens = count_tokens(create_parlym_packed_prompt(job_description, {}))
+    max_cvs = max(1, min(max_cvs_per_pack, MODEL_MAX_OUTPUT_TOKENS // OUTPUT_TOKENS_PER_CV))
+    cv_tokens = {filename: count_tokens(cv_text) + 20 for filename, cv_text in pending.items()}
+    
+    packs = []
+    current_pack = {}
+    current_tokens = base_tokens
+    for filename in sorted(pending, key=cv_tokens.get):
+        needed = cv_tokens[filename] + OUTPUT_TOKENS_PER_CV
+        if current_pack and (len(current_pack) >= max_cvs
+                             or current_tokens + needed > MODEL_CONTEXT_TOKENS):
+            packs.append(current_pack)
+            current_pack = {}
+            current_tokens = base_tokens
+        current_pack[filename] = pending[filename]
+        current_tokens += needed
+    if current_pack:
+        packs.append(current_pack)
+    
+    return cached_analyses, packs
+
+
+def validate_packed_response(data: dict, expected_ids: list) -> dict:
+    """
+    Vérifie qu'une réponse multi-CV contient exactement une analyse valide par CV.
+    
+    Args:
+        data: Réponse JSON décodée
+        expected_ids: Identifiants des CV envoyés
+        
+    Returns:
+        Dictionnaire {cv_id: analyse sans cv_id}
+    """
+    fields = PARLYM_JSON_SCHEMA["schema"]["properties"]
+    analyses = {}
+    for candidate in data.get("Candidats", []):
+        cv_id = candidate.get("cv_id")
+        if cv_id not in expected_ids or cv_id in analyses:
+            raise ValueError(f"Identifiant de CV inattendu ou dupliqué : {cv_id}")
+        analysis = {key: candidate.get(key) for key in fields}
+        for key, definition in fields.items():
+            expected_type = {"string": str, "integer": int, "array": list}[definition["type"]]
+            if not isinstance(analysis[key], expected_type):
+                raise ValueError(f"Champ {key} invalide pour {cv_id}")
+        if not 0 <= analysis["Score"] <= 100:
+            raise ValueError(f"Score invalide pour {cv_id}")
+        analyses[cv_id] = analysis
+    
+    missing = set(expected_ids) - set(analyses)
+    if missing:
+        raise ValueError(f"Analyses manquantes : {', '.join(sorted(missing))}")
+    return analyses
+
+
+def analyze_cv_pack(job_description: str, cvs: dict, use_cache: bool = True, telemetry=None,
+                    llm_backend=None) -> dict:
+    """
+    Analyse plusieurs CV vs l'offre en une seule requête (rubrique et offre envoyées une fois).
+    Si la réponse est invalide, chaque CV est analysé séparément avec analyze_cv_parlym.
+    
+    Args:
+        job_description: Description formatée de l'offre
+        cvs: Dictionnaire {nom_fichier: texte_cv} (voir plan_cv_packs)
+        use_cache: Utilise le cache persistant des analyses
+        telemetry: Collecteur de télémétrie (latence, tokens, erreurs)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        
+    Returns:
+        Dictionnaire {nom_fichier: analyse}
+    """
+    if len(cvs) == 1:
+        filename, cv_text = next(iter(cvs.items()))
+        scope = telemetry.bind(cv_filename=filename) if telemetry is not None else None
+        return {filename: analyze_cv_parlym(job_description, cv_text, use_cache, scope, llm_backend)}
+    
+    # Identifiants courts dans le prompt, associés aux noms de fichiers
+    id_to_filename = {f"CV{index + 1}": filename for index, filename in enumerate(cvs)}
+    prompt = create_parlym_packed_prompt(
+        job_description, {cv_id: cvs[filename] for cv_id, filename in id_to_filename.items()}
+    )
+    
+    start = time.perf_counter()
+    response = None
+    pack_fields = {"cv_filename": " | ".join(cvs), "cvs_in_request": len(cvs)}
+    try:
+        response = call_llm({
+            "model": OPENAI_MODEL,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": PARLYM_PACKED_JSON_SCHEMA
+            },
+            "temperature": 0
+        }, llm_backend, estimated_tokens=count_tokens(prompt) + OUTPUT_TOKENS_PER_CV * len(cvs))
+        
+        analyses = validate_packed_response(json.loads(response["content"]), list(id_to_filename))
+    except Exception as e:
+        record_llm_call(telemetry, start, response, e, **pack_fields)
+        print(f"❌ Réponse multi-CV invalide, analyse CV par CV : {str(e)}")
+        return {
+            filename: analyze_cv_parlym(
+                job_description, cv_text, use_cache,
+                telemetry.bind(cv_filename=filename) if telemetry is not None else None,
+                llm_backend
+            )
+            for filename, cv_text in cvs.items()
+        }
+    record_llm_call(telemetry, start, response, **pack_fields)
+    
+    results = {}
+    for cv_id, analysis in analyses.items():
+        filename = id_to_filename[cv_id]
+        if use_cache:
+            get_default_cache().set(get_packed_analysis_cache_key(job_description, cvs[filename]), analysis)
+        results[filename] = analysis
+    return results
+
+
+# Schéma JSON du profil structuré d'un CV (indépendant de l'offre)
+CV_PROFILE_JSON_SCHEMA = {
+    "name": "cv_profile",
+    "description": "Profil factuel d'un candidat extrait de son CV, indépendant de toute offre",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "Prénom": {"type": "string", "description": "Prénom du candidat"},
+            "Nom": {"type": "string", "description": "Nom du candidat"},
+            "Années_expérience": {
+                "type": "number",
+                "description": "Nombre total d'années d'expérience professionnelle"
+            },
+            "Expériences": {
+                "type": "array",
+                "description": "Postes occupés, du plus récent au plus ancien",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "Intitulé": {"type": "string"},
+                        "Entreprise": {"type": "string"},
+                        "Secteur": {"type": "string"},
+                        "Début": {"type": "string", "description": "Date de début (AAAA ou MM/AAAA)"},
+                        "Fin": {"type": "string", "description": "Date de fin (AAAA, MM/AAAA ou 'actuel')"},
+                        "Missions": {
+                            "type": "array",
+                            "description": "Missions principales, formulées brièvement",
+                            "items": {"type": "string"}
+                        }
+                    },
+                    "required": ["Intitulé", "Entreprise", "Secteur", "Début", "Fin", "Missions"],
+                    "additionalProperties": False
+                }
+            },
+            "Secteurs": {"type": "array", "items": {"type": "string"}},
+            "Outils_compétences": {"type": "array", "items": {"type": "string"}},
+            "Formations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "Diplôme": {"type": "string"},
+                        "Niveau": {"type": "string", "description": "Niveau (Bac+2, Bac+5...)"},
+                        "Établissement": {"type": "string"},
+                        "Année": {"type": "string"}
+                    },
+                    "required": ["Diplôme", "Niveau", "Établissement", "Année"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["Prénom", "Nom", "Années_expérience", "Expériences", "Secteurs",
+                     "Outils_compétences", "Formations"],
+        "additionalProperties": False
+    }
+}
+
+CV_PROFILE_INSTRUCTIONS = """# Instructions pour l'extraction du profil candidat
+
+Tu es un expert en recrutement dans l'ingénierie industrielle.
+Extrais du CV ci-dessous les informations factuelles utiles au matching avec une offre
+(expérience et missions réalisées, durée d'expérience, secteurs d'activité, outils/compétences, formation),
+sans les évaluer ni les interpréter. N'invente aucune information absente du CV : laisse le champ vide.
+
+RÉPONDRE UNIQUEMENT AVEC UN JSON VALIDE, SANS AUCUN TEXTE EXPLICATIF"""
+
+# Réserve de tokens de réponse pour un profil
+OUTPUT_TOKENS_PER_PROFILE = 1200
+
+
+def create_cv_profile_prompt(cv_text: str) -> str:
+    """
+    Crée le prompt d'extraction du profil structuré d'un CV.
+    
+    Args:
+        cv_text: Texte extrait du CV
+        
+    Returns:
+        Prompt d'extraction
+    """
+    return f"""{CV_PROFILE_INSTRUCTIONS}
+
+---
+
+CV DU CANDIDAT :
+{cv_text}"""
+
+
+PROFILE_PROMPT_VERSION = compute_cache_key(
+    create_cv_profile_prompt("{cv_text}"),
+    json.dumps(CV_PROFILE_JSON_SCHEMA, sort_keys=True, ensure_ascii=False)
+)
+
+
+def get_cv_profile_cache_key(cv_text: str) -> str:
+    """
+    Calcule la clé de cache du profil d'un CV (CV, modèle, version du prompt d'extraction).
+    
+    Args:
+        cv_text: Texte extrait du CV
+        
+    Returns:
+        Clé de cache SHA-256
+    """
+    return compute_cache_key("cv_profile", cv_text, OPENAI_MODEL, PROFILE_PROMPT_VERSION)
+
+
+def extract_cv_profile(cv_text: str, use_cache: bool = True, telemetry=None, llm_backend=None) -> dict:
+    """
+    Extrait le profil structuré d'un CV, une seule fois quel que soit le nombre d'offres
+    (résultat mis en cache avec les analyses).
+    
+    Args:
+        cv_text: Texte extrait du CV
+        use_cache: Utilise le cache persistant
+        telemetry: Collecteur de télémétrie (latence, tokens, erreurs)
+        llm_backend: Backend IA (backend partagé du processus par défaut)
+        
+    Returns:
+        Profil structuré du candidat
+    """
+    cache_key = get_cv_profile_cache_key(cv_text)
+    if use_cache:
+        cached = get_default_cache().get(cache_key)
+        if cached is not None:
+            if telemetry is not None:
+                telemetry.record("llm_cache_hit", stage="profile")
+            return cached
+    
+    prompt = create_cv_profile_prompt(cv_text)
+    start = time.perf_counter()
+    response = None
+    try:
+        response = call_llm({
+            "model": OPENAI_MODEL,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": CV_PROFILE_JSON_SCHEMA
+            },
+            "temperature": 0
+        }, llm_backend, estimated_tokens=count_tokens(prompt) + OUTPUT_TOKENS_PER_PROFILE)
+        profile = json.loads(response["content"])
+    except Exception as e:
+        record_llm_call(telemetry, start, response, e, stage="profile")
+        raise
+    record_llm_call(telemetry, start, response, stage="profile")
+    
+    if use_cache:
+        get_default_cache().set(cache_key, profile)
+    return profile
+
+
+def format_cv_profile(profile: dict) -> str:
+    """
+    Met en forme un profil structuré en texte compact, utilisé à la place du CV brut pour le scoring.
+    
+    Args:
+        profile: Profil structuré (voir extract_cv_profile)
+        
+    Returns:
+        Texte du profil
+    """
+    lines = [
+        f"Candidat : {profile.get('Prénom', '')} {profile.get('Nom', '')}".rstrip(),
+        f"Années d'expérience : {profile.get('Années_expérience', '')}"
+    ]
+    
+    lines.append("Expériences :")
+    for experience in profile.get("Expériences", []):
+        period = " - ".join(part for part in (experience.get("Début", ""), experience.get("Fin", "")) if part)
+        details = ", ".join(part for part in (experience.get("Entreprise", ""), experience.get("Secteur", "")) if part)
+        lines.append(f"- {period} : {experience.get('Intitulé', '')}" + (f" ({details})" if details else ""))
+        lines.extend(f"  • {mission}" for mission in experience.get("Missions", []))
+    
+    lines.append(f"Secteurs : {', '.join(profile.get('Secteurs', []))}")
+    lines.append(f"Outils et compétences : {', '.join(profile.get('Outils_compétences', []))}")
+    
+    lines.append("Formation :")
+    for degree in profile.get("Formations", []):
+        details = ", ".join(
+            part for part in (degree.get("Niveau", ""), degree.get("Établissement", ""), degree.get("Année", "")) if part
+        )
+        lines.append(f"- {degree.get('Diplôme', '')}" + (f" ({details})" if details else ""))
+    
+    return "\n".join(lines)
@@ -0,0 +1,252 @@
+import json
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from .ai_analysis import build_chat_request
+from .llm_backend import get_default_backend
+
+
+# Endpoint et fenêtre de traitement des batchs OpenAI
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Statuts terminaux d'un batch
+BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Intervalle de vérification et délai maximum d'attente par défaut
+BATCH_POLL_INTERVAL_SECONDS = 60
+BATCH_TIMEOUT_SECONDS = 26 * 3600
+
+
+class OpenAIBatchClient:
+    """Client du Batch API OpenAI (fichier JSONL en entrée, fichier JSONL en sortie)."""
+
+    def __init__(self, client=None):
+        # Client openai.OpenAI du backend partagé (pool de connexions) par défaut
+        self.client = client or get_default_backend().client
+
+    def submit(self, input_path: str) -> str:
+        """
+        Envoie le fichier de requêtes et crée le batch.
+
+        Args:
+            input_path: Chemin du fichier JSONL de requêtes
+
+        Returns:
+            Identifiant du batch
+        """
+        with open(input_path, "rb") as file:
+            input_file = self.client.files.create(file=file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def get_status(self, batch_id: str) -> str:
+        """
+        Retourne le statut du batch (validating, in_progress, completed, failed...).
+
+        Args:
+            batch_id: Identifiant du batch
+
+        Returns:
+            Statut du batch
+        """
+        return self.client.batches.retrieve(batch_id).status
+
+    def download_output(self, batch_id: str) -> list:
+        """
+        Télécharge les réponses d'un batch terminé (sorties et erreurs).
+
+        Args:
+            batch_id: Identifiant du batch
+
+        Returns:
+            Liste des lignes de sortie (dictionnaires)
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = self.client.files.content(file_id).text
+                lines.extend(json.loads(line) for line in content.splitlines() if line.strip())
+        return lines
+
+
+class LocalBatchClient:
+    """
+    Substitut local du Batch API, à base de fichiers (tests, développement).
+    Les réponses sont produites par une fonction responder(body) -> contenu JSON du message.
+    """
+
+    def __init__(self, work_dir: str, responder):
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+
+    def submit(self, input_path: str) -> str:
+        """
+        Copie le fichier de requêtes et produit immédiatement le fichier de sortie.
+
+        Args:
+            input_path: Chemin du fichier JSONL de requêtes
+
+        Returns:
+            Identifiant du batch
+        """
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        batch_input = self.work_dir / f"{batch_id}_input.jsonl"
+        shutil.copyfile(input_path, batch_input)
+
+        with open(batch_input, encoding="utf-8") as source, \
+                open(self.work_dir / f"{batch_id}_output.jsonl", "w", encoding="utf-8") as output:
+            for line in source:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    content = self.responder(request["body"])
+                    response = {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}
+                    }
+                    error = None
+                except Exception as e:
+                    response = None
+                    error = {"code": "local_error", "message": str(e)}
+                output.write(json.dumps({
+                    "id": f"req_{uuid.uuid4().hex}",
+                    "custom_id": request["custom_id"],
+                    "response": response,
+                    "error": error
+                }, ensure_ascii=False) + "\n")
+
+        return batch_id
+
+    def get_status(self, batch_id: str) -> str:
+        """
+        Retourne le statut du batch local.
+
+        Args:
+            batch_id: Identifiant du batch
+
+        Returns:
+            "completed" si le fichier de sortie existe, "failed" sinon
+        """
+        return "completed" if (self.work_dir / f"{batch_id}_output.jsonl").exists() else "failed"
+
+    def download_output(self, batch_id: str) -> list:
+        """
+        Lit le fichier de sortie du batch local.
+
+        Args:
+            batch_id: Identifiant du batch
+
+        Returns:
+            Liste des lignes de sortie (dictionnaires)
+        """
+        with open(self.work_dir / f"{batch_id}_output.jsonl", encoding="utf-8") as output:
+            return [json.loads(line) for line in output if line.strip()]
+
+
+def build_batch_requests(offer_text: str, cvs: dict) -> tuple[list, dict]:
+    """
+    Construit une requête batch par CV (même prompt et schéma que analyze_cv_parlym).
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cvs: Dictionnaire {nom_fichier: texte_cv}
+
+    Returns:
+        Tuple (liste des requêtes, {custom_id: nom_fichier})
+    """
+    requests_list = []
+    id_to_filename = {}
+    for index, (filename, cv_text) in enumerate(cvs.items()):
+        custom_id = f"cv-{index:06d}"
+        id_to_filename[custom_id] = filename
+        requests_list.append({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": build_chat_request(offer_text, cv_text)
+        })
+    return requests_list, id_to_filename
+
+
+def write_batch_file(requests_list: list, path: str) -> str:
+    """
+    Écrit les requêtes batch au format JSONL (une requête par ligne).
+
+    Args:
+        requests_list: Liste des requêtes
+        path: Chemin du fichier à créer
+
+    Returns:
+        Chemin du fichier créé
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for request in requests_list:
+            file.write(json.dumps(request, ensure_ascii=False) + "\n")
+    return path
+
+
+def wait_for_batch(client, batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+                   timeout: float = BATCH_TIMEOUT_SECONDS) -> str:
+    """
+    Attend la fin d'un batch en interrogeant régulièrement son statut.
+
+    Args:
+        client: Client batch (OpenAIBatchClient ou LocalBatchClient)
+        batch_id: Identifiant du batch
+        poll_interval: Intervalle entre deux vérifications en secondes
+        timeout: Délai maximum d'attente en secondes
+
+    Returns:
+        Statut final du batch
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get_status(batch_id)
+        if status in BATCH_FINAL_STATUSES:
+            return status
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Batch {batch_id} non terminé après {timeout} s (statut : {status})")
+        time.sleep(poll_interval)
+
+
+def parse_batch_output(output_lines: list, id_to_filename: dict) -> dict:
+    """
+    Associe les réponses du batch aux fichiers CV.
+
+    Args:
+        output_lines: Lignes de sortie du batch
+        id_to_filename: Correspondance {custom_id: nom_fichier}
+
+    Returns:
+        Dictionnaire {nom_fichier: analyse ou Exception}
+    """
+    analyses = {}
+    for line in output_lines:
+        filename = id_to_filename.get(line.get("custom_id"))
+        if filename is None:
+            continue
+        response = line.get("response") or {}
+        try:
+            if response.get("status_code") != 200:
+                error = line.get("error") or response.get("body", {}).get("error") or {}
+                raise Exception(error.get("message", f"Statut HTTP {response.get('status_code')}"))
+            content = response["body"]["choices"][0]["message"]["content"]
+            analyses[filename] = json.loads(content)
+        except Exception as e:
+            analyses[filename] = e
+
+    for filename in id_to_filename.values():
+        if filename not in analyses:
+            analyses[filename] = Exception("Aucune réponse dans le résultat du batch")
+
+    return analyses
@@ -0,0 +1,257 @@
+import zipfile
+from contextlib import contextmanager
+from pathlib import PurePosixPath
+
+from .cv_extraction import (
+    DOCX_MAIN_PART,
+    ZIP_MAGIC,
+    InMemoryCV,
+    NamedCVPath,
+    disambiguate_cv_names,
+    get_cv_buffer,
+    get_cv_name,
+    is_cv_path,
+    open_cv_stream
+)
+
+
+# Extensions des CV lus dans une archive
+ARCHIVE_CV_EXTENSIONS = {".pdf", ".docx"}
+
+# Limites d'une archive (fichiers volumineux et bombes de décompression)
+ARCHIVE_MAX_MEMBERS = 2000
+ARCHIVE_MAX_MEMBER_BYTES = 20 * 1024 * 1024
+ARCHIVE_MAX_TOTAL_BYTES = 1024 * 1024 * 1024
+ARCHIVE_MAX_COMPRESSION_RATIO = 100
+
+# Taille des blocs lus lors de la décompression d'un CV
+ARCHIVE_READ_CHUNK_BYTES = 1024 * 1024
+
+
+class ArchiveMemberCV(InMemoryCV):
+    """
+    CV contenu dans une archive ZIP, décompressé en mémoire à chaque lecture et jamais conservé
+    (ni sur disque) : seule l'archive compressée reste en mémoire pendant le traitement du lot.
+    """
+
+    def __init__(self, archive, member_name: str, max_bytes: int = ARCHIVE_MAX_MEMBER_BYTES,
+                 archive_name: str = ""):
+        self.archive = archive
+        self.member_name = member_name
+        self.max_bytes = max_bytes
+        self.name = PurePosixPath(member_name).name
+        self.label = f"{archive_name}/{member_name}" if archive_name else member_name
+
+    @contextmanager
+    def open_stream(self):
+        """Flux de décompression du CV, lu séquentiellement (calcul d'empreinte)."""
+        with open_cv_stream(self.archive) as stream, zipfile.ZipFile(stream) as archive:
+            with archive.open(self.member_name) as member_stream:
+                yield member_stream
+
+    @property
+    def data(self) -> bytes:
+        """Contenu décompressé du CV (nouvelle décompression à chaque accès)."""
+        with open_cv_stream(self.archive) as stream, zipfile.ZipFile(stream) as archive:
+            return read_archive_member(archive, archive.getinfo(self.member_name), self.max_bytes)
+
+    def getbuffer(self) -> memoryview:
+        """Contenu décompressé du CV."""
+        return memoryview(self.data)
+
+    def load(self) -> InMemoryCV:
+        """CV décompressé une fois, libéré dès que la copie retournée n'est plus utilisée."""
+        return InMemoryCV(self.name, self.data)
+
+
+def read_archive_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo,
+                        max_bytes: int = ARCHIVE_MAX_MEMBER_BYTES) -> bytes:
+    """
+    Décompresse un membre d'archive par blocs, en s'arrêtant dès que la taille maximale est dépassée
+    (taille annoncée par l'archive non fiable).
+
+    Args:
+        archive: Archive ZIP ouverte
+        member: Membre à lire
+        max_bytes: Taille décompressée maximale en octets
+
+    Returns:
+        Contenu du membre
+    """
+    chunks = []
+    size = 0
+    with archive.open(member) as member_stream:
+        for chunk in iter(lambda: member_stream.read(ARCHIVE_READ_CHUNK_BYTES), b""):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"Fichier trop volumineux une fois décompressé (> {max_bytes // (1024 * 1024)} Mo)")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def get_archive_bytes(archive_source) -> bytes:
+    """
+    Retourne le contenu d'une archive en mémoire sous forme immuable, sans copie quand c'est possible
+    (un BytesIO, comme un fichier uploadé, partage son contenu initial tant qu'il n'est pas modifié).
+
+    Args:
+        archive_source: Archive en mémoire (bytes, BytesIO, fichier uploadé, CV nommé)
+
+    Returns:
+        Contenu de l'archive
+    """
+    if isinstance(archive_source, InMemoryCV):
+        return get_archive_bytes(archive_source.data)
+    if isinstance(archive_source, bytes):
+        return archive_source
+    if hasattr(archive_source, "getvalue"):
+        return archive_source.getvalue()
+    return bytes(get_cv_buffer(archive_source))
+
+
+def is_cv_archive(cv_source) -> bool:
+    """
+    Indique si un fichier est une archive ZIP de CV (et non un document Word, lui aussi au format ZIP).
+
+    Args:
+        cv_source: Chemin, contenu (bytes, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        True pour une archive ZIP
+    """
+    try:
+        with open_cv_stream(cv_source) as stream:
+            if stream.read(len(ZIP_MAGIC)) != ZIP_MAGIC:
+                return False
+            stream.seek(0)
+            with zipfile.ZipFile(stream) as archive:
+                return DOCX_MAIN_PART not in archive.NameToInfo
+    except (OSError, TypeError, zipfile.BadZipFile):
+        return False
+
+
+def check_archive_member(member: zipfile.ZipInfo, max_member_bytes: int = ARCHIVE_MAX_MEMBER_BYTES,
+                         max_compression_ratio: float = ARCHIVE_MAX_COMPRESSION_RATIO) -> None:
+    """
+    Vérifie la taille et le taux de compression annoncés d'un membre avant de le lire.
+
+    Args:
+        member: Membre de l'archive
+        max_member_bytes: Taille décompressée maximale en octets
+        max_compression_ratio: Taux de compression maximal (bombe de décompression au-delà)
+    """
+    if member.flag_bits & 0x1:
+        raise ValueError("Fichier chiffré")
+    if member.file_size > max_member_bytes:
+        raise ValueError(f"Fichier trop volumineux ({member.file_size // (1024 * 1024)} Mo)")
+    if member.file_size > max_compression_ratio * max(member.compress_size, 1):
+        raise ValueError(f"Taux de compression suspect ({member.file_size // max(member.compress_size, 1)}:1)")
+
+
+def list_archive_cvs(archive_source, max_members: int = ARCHIVE_MAX_MEMBERS,
+                     max_member_bytes: int = ARCHIVE_MAX_MEMBER_BYTES,
+                     max_total_bytes: int = ARCHIVE_MAX_TOTAL_BYTES,
+                     max_compression_ratio: float = ARCHIVE_MAX_COMPRESSION_RATIO) -> tuple[list, dict]:
+    """
+    Liste les CV d'une archive ZIP sans les décompresser (seul le répertoire central est lu).
+
+    Args:
+        archive_source: Chemin de l'archive, ou archive en mémoire (fichier uploadé, bytes)
+        max_members: Nombre maximum de fichiers dans l'archive
+        max_member_bytes: Taille décompressée maximale d'un CV en octets
+        max_total_bytes: Taille décompressée maximale de l'ensemble des CV en octets
+        max_compression_ratio: Taux de compression maximal d'un CV
+
+    Returns:
+        Tuple ([ArchiveMemberCV], {nom_membre: message_erreur})
+    """
+    archive_name = get_cv_name(archive_source)
+    # Archive en mémoire : contenu de l'upload partagé sans copie, chaque lecture ouvrant son propre flux
+    archive = archive_source if is_cv_path(archive_source) else get_archive_bytes(archive_source)
+
+    members = []
+    errors = {}
+    with open_cv_stream(archive) as stream, zipfile.ZipFile(stream) as zip_archive:
+        infos = zip_archive.infolist()
+        if len(infos) > max_members:
+            return [], {archive_name: f"Archive trop volumineuse ({len(infos)} fichiers, maximum {max_members})"}
+
+        total_bytes = 0
+        for member in infos:
+            path = PurePosixPath(member.filename)
+            if member.is_dir() or path.name.startswith(".") or "__MACOSX" in path.parts:
+                continue
+            label = f"{archive_name}/{member.filename}"
+            if path.suffix.lower() not in ARCHIVE_CV_EXTENSIONS:
+                errors[label] = "Format de fichier non supporté. Seuls les fichiers PDF et Word sont acceptés."
+                continue
+            try:
+                check_archive_member(member, max_member_bytes, max_compression_ratio)
+            except ValueError as e:
+                errors[label] = str(e)
+                continue
+            total_bytes += member.file_size
+            if total_bytes > max_total_bytes:
+                errors[archive_name] = f"Archive trop volumineuse une fois décompressée (> {max_total_bytes // (1024 * 1024)} Mo)"
+                break
+            members.append(ArchiveMemberCV(archive, member.filename, max_member_bytes, archive_name))
+
+    return members, errors
+
+
+def rename_cv(cv_source, name: str):
+    """
+    Présente un CV sous un autre nom, sans le copier.
+
+    Args:
+        cv_source: Chemin, CV en mémoire ou membre d'archive
+        name: Nouveau nom
+
+    Returns:
+        CV renommé
+    """
+    if isinstance(cv_source, ArchiveMemberCV):
+        cv_source.name = name
+        return cv_source
+    if isinstance(cv_source, NamedCVPath):
+        return NamedCVPath(cv_source.path, name)
+    if is_cv_path(cv_source):
+        return NamedCVPath(cv_source, name)
+    if isinstance(cv_source, InMemoryCV):
+        return InMemoryCV(name, cv_source.data)
+    return InMemoryCV(name, cv_source)
+
+
+def expand_cv_archives(cv_sources: list, **limits) -> tuple[list, dict]:
+    """
+    Remplace les archives ZIP par les CV qu'elles contiennent (lus à la demande, sans décompression
+    sur disque). Les CV de même nom (alice/CV.pdf et bob/CV.pdf) sont tous conservés, renommés
+    d'après leur chemin dans l'archive ("alice/CV.pdf") : les résultats sont indexés par nom.
+
+    Args:
+        cv_sources: Chemins ou CV en mémoire, archives ZIP comprises
+        limits: Limites des archives (voir list_archive_cvs)
+
+    Returns:
+        Tuple ([CV dans l'ordre d'origine, noms uniques], {nom: message_erreur})
+    """
+    cvs = []
+    errors = {}
+    for cv_source in cv_sources:
+        if is_cv_archive(cv_source):
+            try:
+                members, archive_errors = list_archive_cvs(cv_source, **limits)
+            except (OSError, zipfile.BadZipFile) as e:
+                errors[get_cv_name(cv_source)] = f"Archive illisible : {str(e)}"
+                continue
+            errors.update(archive_errors)
+            cvs.extend(members)
+        else:
+            cvs.append(cv_source)
+
+    # Chemin complet (archive/répertoires/fichier) des membres : le nom unique en est le plus court suffixe distinctif
+    names = disambiguate_cv_names([getattr(cv, "label", None) or get_cv_name(cv) for cv in cvs])
+    return [
+        cv if name == get_cv_name(cv) else rename_cv(cv, name)
+        for cv, name in zip(cvs, names)
+    ], errors
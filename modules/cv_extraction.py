@@ -1,90 +1,817 @@
-import PyPDF2
+from contextlib import closing, nullcontext
 from pathlib import Path
+import io
 import os
-from docx import Document
+import hashlib
+import threading
+import time
+import multiprocessing
+import re
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Version des extracteurs : à incrémenter quand le texte produit change
+EXTRACTOR_VERSION = "4"
+
+# Nombre maximum de textes extraits conservés en cache
+EXTRACTION_CACHE_SIZE = 512
+
+# Limites par fichier du mode d'extraction parallèle
+EXTRACTION_TIMEOUT_SECONDS = 60
+EXTRACTION_MEMORY_LIMIT_MB = 512
+
+# Budget d'extraction des PDF (portfolios, annexes) : les pages suivantes ne sont pas lues
+PDF_MAX_PAGES = 20
+PDF_MAX_CHARACTERS = 60000
+
+# Séparateur des pages d'un PDF dans le texte extrait (saut de page)
+PAGE_BREAK = "\f"
+
+# Détection des PDF scannés : moyenne minimale de caractères par page sur les premières pages
+PDF_OCR_PROBE_PAGES = 3
+PDF_MIN_CHARACTERS_PER_PAGE = 20
+OCR_REQUIRED_MESSAGE = "OCR requis"
+
+# Signatures des formats pris en charge (le PDF tolère quelques octets avant l'en-tête)
+PDF_MAGIC = b"%PDF-"
+PDF_MAGIC_SEARCH_BYTES = 1024
+ZIP_MAGIC = b"PK\x03\x04"
+DOCX_MAIN_PART = "word/document.xml"
+
+# Parties et éléments WordprocessingML lus par l'extracteur Word
+DOCX_HEADER_PART = re.compile(r"word/header\d*\.xml")
+DOCX_FOOTER_PART = re.compile(r"word/footer\d*\.xml")
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_PARAGRAPH_TAG = f"{WORD_NAMESPACE}p"
+DOCX_TEXT_TAGS = {f"{WORD_NAMESPACE}t"}
+DOCX_SPECIAL_CHARACTERS = {
+    f"{WORD_NAMESPACE}tab": "\t",
+    f"{WORD_NAMESPACE}br": "\n",
+    f"{WORD_NAMESPACE}cr": "\n",
+    f"{WORD_NAMESPACE}noBreakHyphen": "-"
+}
+DOCX_FALLBACK_TAG = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Cache LRU {sha256 du fichier: (version extracteur, texte)}
+_extraction_cache = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+
+class InMemoryCV:
+    """
+    CV reçu en mémoire (upload, membre d'archive) : nom d'origine et contenu, sans fichier sur disque.
+    Les objets ayant un nom et un tampon (UploadedFile Streamlit, BytesIO nommé) sont acceptés tels quels.
+    """
+
+    def __init__(self, name: str, data):
+        self.name = name
+        self.data = data
+
+    def getbuffer(self) -> memoryview:
+        """Contenu du CV, sans copie."""
+        return get_cv_buffer(self.data)
+
+    def open_stream(self):
+        """Flux binaire sur le contenu du CV, lu séquentiellement (calcul d'empreinte)."""
+        return open_cv_stream(self.data)
+
+    def load(self):
+        """CV dont le contenu est en mémoire, prêt pour plusieurs lectures (déjà le cas ici)."""
+        return self
+
+
+class NamedCVPath:
+    """
+    CV sur disque présenté sous un autre nom que celui du fichier (fichiers de même nom
+    dans des répertoires différents). Utilisable partout où un chemin est accepté.
+    """
+
+    def __init__(self, path, name: str):
+        self.path = path
+        self.name = name
+
+    def __fspath__(self) -> str:
+        return os.fspath(self.path)
+
+
+def disambiguate_cv_names(paths: list) -> list:
+    """
+    Attribue à chaque CV un nom unique : le nom du fichier, ou pour les fichiers de même nom
+    le chemin raccourci au plus petit suffixe qui les distingue ("alice/CV.pdf", "bob/CV.pdf").
+
+    Args:
+        paths: Chemins des CV (PurePath ou chaînes avec "/" comme séparateur)
+
+    Returns:
+        Noms uniques, dans l'ordre des chemins
+    """
+    parts = [[part for part in Path(path).parts if part != Path(path).anchor] for path in paths]
+    names = [path_parts[-1] for path_parts in parts]
+    depth = 1
+    while len(set(names)) < len(names) and depth < max(len(path_parts) for path_parts in parts):
+        depth += 1
+        counts = {}
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+        names = [
+            "/".join(path_parts[-depth:]) if counts[name] > 1 else name
+            for name, path_parts in zip(names, parts)
+        ]
+
+    # Chemins identiques (même fichier désigné deux fois, archives de même nom) : suffixe numéroté
+    unique_names = []
+    seen = set()
+    for name in names:
+        unique_name = name
+        index = 2
+        while unique_name in seen:
+            stem, dot, suffix = name.rpartition(".")
+            unique_name = f"{stem} ({index}).{suffix}" if dot else f"{name} ({index})"
+            index += 1
+        seen.add(unique_name)
+        unique_names.append(unique_name)
+    return unique_names
+
+
+def is_cv_path(cv_source) -> bool:
+    """
+    Indique si un CV est désigné par un chemin sur disque (et non par un contenu en mémoire).
+
+    Args:
+        cv_source: Chemin, contenu (bytes, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        True pour un chemin
+    """
+    return isinstance(cv_source, (str, os.PathLike))
+
+
+def get_cv_name(cv_source) -> str:
+    """
+    Retourne le nom de fichier d'un CV, sur disque ou en mémoire.
+
+    Args:
+        cv_source: Chemin, contenu (bytes, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        Nom du fichier ("" pour un contenu anonyme)
+    """
+    if isinstance(cv_source, (NamedCVPath, InMemoryCV)):
+        return cv_source.name
+    if is_cv_path(cv_source):
+        return Path(cv_source).name
+    return Path(getattr(cv_source, "name", "") or "").name
+
+
+def get_cv_buffer(cv_source) -> memoryview:
+    """
+    Retourne le contenu d'un CV en mémoire, sans copie quand le tampon le permet.
+
+    Args:
+        cv_source: Contenu (bytes, bytearray, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        Vue sur le contenu
+    """
+    if isinstance(cv_source, (bytes, bytearray, memoryview)):
+        return memoryview(cv_source)
+    if hasattr(cv_source, "getbuffer"):
+        return cv_source.getbuffer()
+    if hasattr(cv_source, "getvalue"):
+        return memoryview(cv_source.getvalue())
+    raise TypeError(f"CV non pris en charge : {type(cv_source).__name__}")
+
+
+def open_cv_stream(cv_source):
+    """
+    Ouvre un CV en lecture binaire, depuis le disque ou directement depuis la mémoire.
+
+    Args:
+        cv_source: Chemin, contenu (bytes, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        Gestionnaire de contexte fournissant un flux binaire positionné au début
+    """
+    if is_cv_path(cv_source):
+        return open(cv_source, 'rb')
+    if isinstance(cv_source, InMemoryCV):
+        return open_cv_stream(cv_source.data)
+    if isinstance(cv_source, bytes):
+        # BytesIO partage le contenu d'un bytes tant qu'il n'est pas modifié
+        return io.BytesIO(cv_source)
+    if hasattr(cv_source, "read") and hasattr(cv_source, "seek"):
+        cv_source.seek(0)
+        return nullcontext(cv_source)
+    return io.BytesIO(get_cv_buffer(cv_source))
+
+
+def detect_file_format(cv_source) -> str:
+    """
+    Détermine le format d'un CV d'après sa signature (magic bytes), l'extension
+    n'étant utilisée qu'en dernier recours.
+
+    Args:
+        cv_source: Chemin, contenu (bytes, memoryview, BytesIO) ou CV nommé en mémoire
+
+    Returns:
+        "pdf" ou "docx"
+    """
+    with open_cv_stream(cv_source) as stream:
+        header = stream.read(PDF_MAGIC_SEARCH_BYTES)
+        if PDF_MAGIC in header:
+            return "pdf"
+        if header.startswith(ZIP_MAGIC):
+            try:
+                stream.seek(0)
+                with zipfile.ZipFile(stream) as archive:
+                    archive.getinfo(DOCX_MAIN_PART)
+                return "docx"
+            except (KeyError, zipfile.BadZipFile):
+                pass
+
+    # Signature absente : le parseur de l'extension signalera le fichier corrompu
+    suffix = Path(get_cv_name(cv_source)).suffix.lower()
+    if suffix in (".pdf", ".docx"):
+        return suffix[1:]
+    raise ValueError("Format de fichier non supporté. Seuls les fichiers PDF et Word sont acceptés.")
+
+
+def compute_file_hash(cv_source) -> str:
+    """
+    Calcule l'empreinte SHA-256 du contenu brut d'un fichier.
+
+    Args:
+        cv_source: Chemin vers le fichier, ou contenu en mémoire (bytes, memoryview, BytesIO, CV nommé)
+
+    Returns:
+        Empreinte hexadécimale du contenu
+    """
+    if not is_cv_path(cv_source) and not isinstance(cv_source, InMemoryCV):
+        return hashlib.sha256(get_cv_buffer(cv_source)).hexdigest()
+
+    # Lecture par blocs : un membre d'archive est haché pendant sa décompression, sans être conservé
+    digest = hashlib.sha256()
+    with (cv_source.open_stream() if isinstance(cv_source, InMemoryCV) else open(cv_source, 'rb')) as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cached_extraction(file_hash: str):
+    """
+    Récupère un texte déjà extrait depuis le cache.
+
+    Args:
+        file_hash: Empreinte SHA-256 du fichier
+
+    Returns:
+        Texte extrait, ou None si absent ou produit par une autre version
+    """
+    with _extraction_cache_lock:
+        entry = _extraction_cache.get(file_hash)
+        if entry is None or entry[0] != EXTRACTOR_VERSION:
+            return None
+        _extraction_cache.move_to_end(file_hash)
+        return entry[1]
+
+
+def store_cached_extraction(file_hash: str, text: str) -> None:
+    """
+    Enregistre un texte extrait dans le cache (éviction LRU).
+
+    Args:
+        file_hash: Empreinte SHA-256 du fichier
+        text: Texte extrait
+    """
+    with _extraction_cache_lock:
+        _extraction_cache[file_hash] = (EXTRACTOR_VERSION, text)
+        _extraction_cache.move_to_end(file_hash)
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+
+
+def clear_extraction_cache() -> None:
+    """Vide le cache des textes extraits."""
+    with _extraction_cache_lock:
+        _extraction_cache.clear()
+
+
+class OCRRequiredError(Exception):
+    """PDF sans couche texte exploitable (document scanné) : non analysé faute d'OCR."""
+
+
+def is_ocr_required(error) -> bool:
+    """
+    Indique si une erreur d'extraction correspond à un PDF scanné (OCR requis).
+
+    Args:
+        error: Exception ou message d'erreur d'extraction
+
+    Returns:
+        True si le CV nécessite un OCR
+    """
+    return str(error).startswith(OCR_REQUIRED_MESSAGE)
+
+
+def iter_pdf_pages_pypdf2(stream):
+    """
+    Backend PDF par défaut (PyPDF2) : les pages sont chargées et extraites une à une.
+
+    Args:
+        stream: Flux binaire du PDF
+
+    Yields:
+        Texte de chaque page
+    """
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(stream)
+    for page in pdf_reader.pages:
+        yield page.extract_text() or ""
+
+
+def iter_pdf_pages_pymupdf(stream):
+    """
+    Backend PDF PyMuPDF (dépendance optionnelle, nettement plus rapide sur les documents volumineux).
+
+    Args:
+        stream: Flux binaire du PDF
+
+    Yields:
+        Texte de chaque page
+    """
+    import fitz
+
+    with fitz.open(stream=stream.read(), filetype="pdf") as document:
+        for page in document:
+            yield page.get_text()
+
+
+# Backends PDF disponibles : fonction (flux binaire) -> itérateur du texte des pages
+PDF_BACKENDS = {
+    "pypdf2": iter_pdf_pages_pypdf2,
+    "pymupdf": iter_pdf_pages_pymupdf
+}
+
+_default_pdf_backend = iter_pdf_pages_pypdf2
+_default_pdf_backend_lock = threading.Lock()
+
+
+def get_default_pdf_backend():
+    """
+    Retourne le backend PDF du processus (hérité par les processus d'extraction).
+
+    Returns:
+        Fonction (flux binaire) -> itérateur du texte des pages
+    """
+    with _default_pdf_backend_lock:
+        return _default_pdf_backend
+
+
+def set_default_pdf_backend(backend) -> None:
+    """
+    Remplace le backend PDF du processus (parseur plus rapide, tests).
+
+    Args:
+        backend: Nom d'un backend de PDF_BACKENDS, ou fonction (flux binaire) -> itérateur du texte des pages
+    """
+    global _default_pdf_backend
+    with _default_pdf_backend_lock:
+        _default_pdf_backend = PDF_BACKENDS[backend] if isinstance(backend, str) else backend
+
+
+def iter_pdf_pages(file_path, backend=None):
+    """
+    Parcourt le texte des pages d'un PDF à la demande : les pages non consommées ne sont pas extraites.
+
+    Args:
+        file_path: Chemin vers le fichier PDF, ou contenu en mémoire (bytes, memoryview, BytesIO)
+        backend: Backend PDF (backend du processus par défaut)
+
+    Yields:
+        Texte de chaque page
+    """
+    with open_cv_stream(file_path) as stream:
+        yield from (backend or get_default_pdf_backend())(stream)
+
+
+def check_text_layer(visible_characters: int, pages_read: int) -> None:
+    """
+    Signale un PDF sans couche texte (pages scannées) avant qu'il ne soit envoyé à l'IA.
+
+    Args:
+        visible_characters: Caractères non blancs extraits
+        pages_read: Nombre de pages lues
+    """
+    if visible_characters < PDF_MIN_CHARACTERS_PER_PAGE * pages_read:
+        raise OCRRequiredError(
+            f"{OCR_REQUIRED_MESSAGE} : aucun texte exploitable sur les {pages_read} premières pages (PDF scanné ?)"
+        )
+
+
+def extract_text_from_pdf(file_path, max_pages: int = PDF_MAX_PAGES,
+                          max_characters: int = PDF_MAX_CHARACTERS, backend=None) -> str:
     """
-    Extrait le texte d'un fichier PDF.
+    Extrait le texte d'un fichier PDF, page par page, dans la limite d'un budget de pages et de caractères.
+    Un PDF sans couche texte est signalé dès les premières pages (OCRRequiredError).
     
     Args:
-        file_path: Chemin vers le fichier PDF
+        file_path: Chemin vers le fichier PDF, ou contenu en mémoire (bytes, memoryview, BytesIO)
+        max_pages: Nombre maximum de pages lues (None pour toutes)
+        max_characters: Nombre maximum de caractères extraits (None pour aucune limite)
+        backend: Backend PDF (backend du processus par défaut)
         
     Returns:
         Texte extrait du PDF
     """
+    pages = []
+    characters = 0
+    visible_characters = 0
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = "\n".join([page.extract_text() for page in pdf_reader.pages])
-            return text.strip()
+        with closing(iter_pdf_pages(file_path, backend)) as page_texts:
+            for page_number, page_text in enumerate(page_texts, start=1):
+                pages.append(page_text)
+                characters += len(page_text) + 1
+                visible_characters += len("".join(page_text.split()))
+                if page_number == PDF_OCR_PROBE_PAGES:
+                    check_text_layer(visible_characters, page_number)
+                if (max_pages and page_number >= max_pages) or (max_characters and characters >= max_characters):
+                    break
+        check_text_layer(visible_characters, min(len(pages), PDF_OCR_PROBE_PAGES) or 1)
+    except (OCRRequiredError, MemoryError):
+        # MemoryError remonte telle quelle : plafond mémoire du processus d'extraction
+        raise
     except Exception as e:
         raise Exception(f"Erreur lors de l'extraction PDF: {str(e)}")
-    
 
-def extract_text_from_word(file_path: str) -> str:
+    text = PAGE_BREAK.join(pages)
+    if max_characters:
+        text = text[:max_characters]
+    return text.strip()
+
+
+def iter_docx_part_paragraphs(xml_stream):
+    """
+    Parcourt une partie XML d'un document Word (corps, en-tête, pied de page) en flux,
+    dans l'ordre de lecture : paragraphes, cellules de tableaux et zones de texte.
+    Chaque élément est libéré dès sa lecture (mémoire constante quelle que soit la taille).
+
+    Args:
+        xml_stream: Flux binaire de la partie XML
+
+    Yields:
+        Texte de chaque paragraphe
+    """
+    paragraphs = []
+    elements = []
+    # Contenu de repli d'un objet (copie VML des zones de texte) : ignoré pour ne pas dupliquer le texte
+    fallback_depth = 0
+    for event, element in ElementTree.iterparse(xml_stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            elements.append(element)
+            if tag == DOCX_FALLBACK_TAG:
+                fallback_depth += 1
+            elif tag == DOCX_PARAGRAPH_TAG and not fallback_depth:
+                paragraphs.append([])
+            continue
+
+        elements.pop()
+        if tag == DOCX_FALLBACK_TAG:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == DOCX_PARAGRAPH_TAG:
+            yield "".join(paragraphs.pop())
+        elif paragraphs and tag in DOCX_TEXT_TAGS:
+            paragraphs[-1].append(element.text or "")
+        elif paragraphs and tag in DOCX_SPECIAL_CHARACTERS:
+            paragraphs[-1].append(DOCX_SPECIAL_CHARACTERS[tag])
+
+        element.clear()
+        if elements:
+            elements[-1].remove(element)
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Parcourt le texte d'un document Word directement dans l'archive, sans construire le modèle objet :
+    en-têtes, corps puis pieds de page.
+
+    Args:
+        file_path: Chemin vers le fichier Word, ou contenu en mémoire (bytes, memoryview, BytesIO)
+
+    Yields:
+        Texte de chaque paragraphe
+    """
+    with open_cv_stream(file_path) as file, zipfile.ZipFile(file) as archive:
+        names = archive.namelist()
+        headers = sorted((name for name in names if DOCX_HEADER_PART.fullmatch(name)), key=_part_number)
+        footers = sorted((name for name in names if DOCX_FOOTER_PART.fullmatch(name)), key=_part_number)
+        for part in headers + [DOCX_MAIN_PART] + footers:
+            with archive.open(part) as xml_stream:
+                yield from iter_docx_part_paragraphs(xml_stream)
+
+
+def _part_number(part_name: str) -> int:
+    """Numéro d'une partie (word/header2.xml -> 2), pour les lire dans l'ordre."""
+    digits = re.sub(r"\D", "", part_name)
+    return int(digits) if digits else 0
+
+
+def extract_text_from_word(file_path) -> str:
     """
-    Extrait le texte d'un fichier Word.
+    Extrait le texte d'un fichier Word (paragraphes, tableaux, zones de texte, en-têtes et pieds de page).
 
     Args:
-        file_path: Chemin vers le fichier Word
+        file_path: Chemin vers le fichier Word, ou contenu en mémoire (bytes, memoryview, BytesIO)
 
     Returns:
         Texte extrait du fichier Word
     """
     try:
-        document = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in document.paragraphs])
+        text = "\n".join(iter_docx_paragraphs(file_path))
         return text.strip()
+    except MemoryError:
+        raise
     except Exception as e:
         raise Exception(f"Erreur lors de l'extraction Word: {str(e)}")
 
 
-def extract_text_from_file(file_path: str) -> str:
+def extract_text_from_file(file_path) -> str:
+    """
+    Extrait le texte d'un fichier, qu'il soit PDF ou Word, sur disque ou en mémoire.
+    Un fichier au contenu identique (quel que soit son nom) n'est analysé qu'une fois.
+
+    Args:
+        file_path: Chemin vers le fichier, ou contenu en mémoire (bytes, memoryview, BytesIO, CV nommé)
+
+    Returns:
+        Texte extrait du fichier
+    """
+    file_hash = compute_file_hash(file_path)
+    cached_text = get_cached_extraction(file_hash)
+    if cached_text is not None:
+        return cached_text
+
+    # Membre d'archive décompressé une seule fois pour la détection du format et l'analyse
+    text = parse_file(file_path.load() if isinstance(file_path, InMemoryCV) else file_path)
+    store_cached_extraction(file_hash, text)
+    return text
+
+
+def parse_file(file_path) -> str:
     """
-    Extrait le texte d'un fichier, qu'il soit PDF ou Word.
+    Analyse un fichier PDF ou Word selon sa signature, sans passer par le cache.
 
     Args:
-        file_path: Chemin vers le fichier
+        file_path: Chemin vers le fichier, ou contenu en mémoire (bytes, memoryview, BytesIO, CV nommé)
 
     Returns:
         Texte extrait du fichier
     """
-    if file_path.lower().endswith('.pdf'):
+    if detect_file_format(file_path) == "pdf":
         return extract_text_from_pdf(file_path)
-    elif file_path.lower().endswith('.docx'):
-        return extract_text_from_word(file_path)
-    else:
-        raise ValueError("Format de fichier non supporté. Seuls les fichiers PDF et Word sont acceptés.")
+    return extract_text_from_word(file_path)
 
 
-def extract_multiple_cvs(cv_files_list: list) -> dict:
+def _get_process_memory_bytes() -> int:
     """
-    Extrait le texte de plusieurs CV (PDF ou Word).
+    Retourne la mémoire virtuelle actuelle du processus (Linux uniquement).
+
+    Returns:
+        Taille de l'espace d'adressage en octets, 0 si inconnue
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _get_extraction_context():
+    """
+    Choisit la méthode de démarrage des processus d'extraction.
+    forkserver évite de dupliquer un processus parent multi-threadé (Streamlit) : un fils créé par
+    fork pourrait hériter d'un verrou détenu par un autre thread. Le serveur charge une seule fois
+    le module principal et les parseurs, chaque fils en est une copie démarrée en quelques millisecondes.
+    spawn est utilisé là où forkserver n'existe pas.
+
+    Returns:
+        Contexte multiprocessing
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["__main__", __name__, "PyPDF2"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _extraction_worker(cv_path, memory_limit_mb: int, connection) -> None:
+    """
+    Point d'entrée du processus d'extraction : applique le plafond mémoire puis analyse le fichier.
+
+    Args:
+        cv_path: Chemin vers le CV, ou CV en mémoire
+        memory_limit_mb: Mémoire supplémentaire autorisée en Mo (None pour aucune limite)
+        connection: Extrémité du pipe vers le processus parent
+    """
+    try:
+        if memory_limit_mb:
+            try:
+                import resource
+                limit = _get_process_memory_bytes() + memory_limit_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            except (ImportError, ValueError, OSError):
+                pass
+        connection.send(("ok", parse_file(cv_path)))
+    except MemoryError:
+        connection.send(("error", f"Plafond mémoire dépassé ({memory_limit_mb} Mo)"))
+    except Exception as e:
+        connection.send(("error", str(e)))
+    finally:
+        connection.close()
+
+
+def extract_text_in_subprocess(cv_path, timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+                               memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB) -> str:
+    """
+    Extrait le texte d'un fichier dans un processus dédié, avec délai et plafond mémoire.
+    Un fichier qui bloque ou fait planter le parseur n'affecte pas le processus appelant.
 
     Args:
-        cv_files_list: Liste des chemins vers les CV
+        cv_path: Chemin vers le CV, ou CV en mémoire
+        timeout: Délai maximum d'extraction en secondes
+        memory_limit_mb: Mémoire supplémentaire autorisée en Mo
 
     Returns:
-        Dictionnaire {nom_fichier: texte_cv}
+        Texte extrait du fichier
+    """
+    # Contenu en mémoire transmis par le pipe : seul le CV est copié (pas l'archive ou l'upload d'origine)
+    if not is_cv_path(cv_path):
+        cv_path = InMemoryCV(get_cv_name(cv_path), bytes(get_cv_buffer(cv_path)))
+
+    context = _get_extraction_context()
+    parent_connection, child_connection = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_extraction_worker,
+        args=(cv_path, memory_limit_mb, child_connection),
+        daemon=True
+    )
+    process.start()
+    child_connection.close()
+
+    try:
+        if not parent_connection.poll(timeout):
+            # Délai dépassé : arrêt immédiat, sans délai de grâce
+            process.kill()
+            raise TimeoutError(f"Délai d'extraction dépassé ({timeout} s)")
+        try:
+            status, payload = parent_connection.recv()
+        except EOFError:
+            process.join(1)
+            raise Exception(f"Processus d'extraction interrompu (code {process.exitcode})")
+    finally:
+        if process.is_alive():
+            process.join(1)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        parent_connection.close()
+
+    if status != "ok":
+        raise Exception(payload)
+    return payload
+
+
+def _extract_cv_isolated(cv_path, timeout: float, memory_limit_mb: int) -> str:
+    """
+    Extrait un CV en processus dédié en passant par le cache d'extraction.
+
+    Args:
+        cv_path: Chemin vers le CV, ou CV en mémoire
+        timeout: Délai maximum d'extraction en secondes
+        memory_limit_mb: Mémoire supplémentaire autorisée en Mo
+
+    Returns:
+        Texte extrait du fichier
+    """
+    file_hash = compute_file_hash(cv_path)
+    cached_text = get_cached_extraction(file_hash)
+    if cached_text is not None:
+        return cached_text
+
+    text = extract_text_in_subprocess(cv_path, timeout, memory_limit_mb)
+    store_cached_extraction(file_hash, text)
+    return text
+
+
+def _timed_extraction(extract_function, cv_path, telemetry, *args) -> str:
+    """
+    Exécute une extraction en enregistrant sa durée et son statut dans la télémétrie.
+
+    Args:
+        extract_function: Fonction d'extraction (chemin, *args) -> texte
+        cv_path: Chemin vers le CV, ou CV en mémoire
+        telemetry: Collecteur de télémétrie (ou None)
+        args: Arguments supplémentaires de la fonction d'extraction
+
+    Returns:
+        Texte extrait du fichier
+    """
+    start = time.perf_counter()
+    try:
+        text = extract_function(cv_path, *args)
+    except Exception as e:
+        if telemetry is not None:
+            telemetry.record("extraction", cv_filename=get_cv_name(cv_path), status="error",
+                             duration_s=time.perf_counter() - start, error=str(e))
+        raise
+    if telemetry is not None:
+        telemetry.record("extraction", cv_filename=get_cv_name(cv_path), status="ok",
+                         duration_s=time.perf_counter() - start, characters=len(text))
+    return text
+
+
+def extract_cvs_with_errors(cv_files_list: list, parallel: bool = False, max_workers: int = None,
+                            timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+                            memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB,
+                            telemetry=None) -> tuple[dict, dict]:
+    """
+    Extrait le texte de plusieurs CV et collecte les erreurs par fichier.
+    En mode parallèle, chaque fichier est analysé dans un processus dédié
+    (max_workers simultanés), avec délai et plafond mémoire par fichier.
+
+    Args:
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire (InMemoryCV, fichiers uploadés)
+        parallel: Active l'extraction parallèle multi-processus
+        max_workers: Nombre de fichiers extraits simultanément (défaut : nombre de cœurs)
+        timeout: Délai maximum d'extraction par fichier en secondes (mode parallèle)
+        memory_limit_mb: Mémoire supplémentaire autorisée par fichier en Mo (mode parallèle)
+        telemetry: Collecteur de télémétrie (durée d'extraction par fichier)
+
+    Returns:
+        Tuple ({nom_fichier: texte_cv}, {nom_fichier: message_erreur})
     """
     cvs_extracted = {}
+    errors = {}
+
+    if parallel and cv_files_list:
+        max_workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(cv_files_list))) as executor:
+            futures = [
+                (cv_path, executor.submit(
+                    _timed_extraction, _extract_cv_isolated, cv_path, telemetry, timeout, memory_limit_mb
+                ))
+                for cv_path in cv_files_list
+            ]
+            for cv_path, future in futures:
+                filename = get_cv_name(cv_path)
+                try:
+                    cvs_extracted[filename] = future.result()
+                except Exception as e:
+                    errors[filename] = str(e)
+        return cvs_extracted, errors
 
     for cv_path in cv_files_list:
+        filename = get_cv_name(cv_path)
         try:
-            # Extraction du nom de fichier
-            filename = Path(cv_path).name
+            cvs_extracted[filename] = _timed_extraction(extract_text_from_file, cv_path, telemetry)
+        except Exception as e:
+            errors[filename] = str(e)
 
-            # Extraction du texte
-            cv_text = extract_text_from_file(cv_path)
+    return cvs_extracted, errors
 
-            # Stockage
-            cvs_extracted[filename] = cv_text
 
-        except Exception as e:
-            print(f"❌ Erreur avec {cv_path}: {str(e)}")
+def extract_multiple_cvs(cv_files_list: list, parallel: bool = False, max_workers: int = None,
+                         timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+                         memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB,
+                         telemetry=None) -> dict:
+    """
+    Extrait le texte de plusieurs CV (PDF ou Word).
 
-    return cvs_extracted
+    Args:
+        cv_files_list: Liste des chemins vers les CV, ou CV en mémoire (InMemoryCV, fichiers uploadés)
+        parallel: Active l'extraction parallèle multi-processus
+        max_workers: Nombre de fichiers extraits simultanément (mode parallèle)
+        timeout: Délai maximum d'extraction par fichier en secondes (mode parallèle)
+        memory_limit_mb: Mémoire supplémentaire autorisée par fichier en Mo (mode parallèle)
+        telemetry: Collecteur de télémétrie (durée d'extraction par fichier)
 
+    Returns:
+        Dictionnaire {nom_fichier: texte_cv}
+    """
+    cvs_extracted, errors = extract_cvs_with_errors(
+        cv_files_list, parallel, max_workers, timeout, memory_limit_mb, telemetry
+    )
+
+    for filename, error in errors.items():
+        print(f"❌ Erreur avec {filename}: {error}")
 
+    return cvs_extracted
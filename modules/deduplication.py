@@ -0,0 +1,132 @@
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from .prescreening import tokenize
+
+
+# Signatures MinHash : nombre de permutations, découpées en bandes LSH (LSH_BANDS × LSH_ROWS_PER_BAND)
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS_PER_BAND = MINHASH_PERMUTATIONS // LSH_BANDS
+
+# Taille des shingles (suites de mots consécutifs)
+SHINGLE_SIZE = 4
+
+# Similarité de Jaccard estimée au-delà de laquelle deux CV sont considérés comme des doublons
+DUPLICATE_THRESHOLD = 0.8
+
+# Permutations universelles (a * x + b) mod p, tirées une fois pour toutes (signatures comparables).
+# a et b sur 32 bits : a * x + b tient sur 64 bits pour des empreintes x sur 32 bits
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = np.random.default_rng(0)
+_PERMUTATION_A = _rng.integers(1, _MAX_HASH, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERMUTATION_B = _rng.integers(0, _MAX_HASH, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Découpe un texte en shingles de mots normalisés, hachés sur 32 bits.
+    La mise en page (PDF ou Word, sauts de ligne, accents) n'influe pas sur le résultat.
+
+    Args:
+        text: Texte du CV
+        size: Nombre de mots par shingle
+
+    Returns:
+        Ensemble des empreintes de shingles
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[index:index + size]).encode("utf-8"))
+        for index in range(len(tokens) - size + 1)
+    }
+
+
+def compute_minhash(shingles: set) -> np.ndarray:
+    """
+    Calcule la signature MinHash d'un ensemble de shingles.
+
+    Args:
+        shingles: Empreintes des shingles
+
+    Returns:
+        Signature (MINHASH_PERMUTATIONS valeurs)
+    """
+    if not shingles:
+        return np.full(MINHASH_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+    values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    hashed = (np.outer(values, _PERMUTATION_A) + _PERMUTATION_B) % _MERSENNE_PRIME & _MAX_HASH
+    return hashed.min(axis=0)
+
+
+def estimate_similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """
+    Estime la similarité de Jaccard de deux CV à partir de leurs signatures MinHash.
+
+    Args:
+        signature_a: Signature du premier CV
+        signature_b: Signature du second CV
+
+    Returns:
+        Similarité estimée entre 0 et 1
+    """
+    return float(np.mean(signature_a == signature_b))
+
+
+def find_duplicate_groups(cv_texts: dict, threshold: float = DUPLICATE_THRESHOLD) -> dict:
+    """
+    Regroupe les CV quasi identiques (même CV en PDF et Word, version légèrement mise à jour).
+    Les candidats sont trouvés par LSH (bandes de signatures MinHash) puis vérifiés sur la
+    similarité estimée : le coût reste linéaire en nombre de CV, sans comparaison deux à deux.
+
+    Args:
+        cv_texts: Dictionnaire {nom_fichier: texte_cv}, dans l'ordre d'upload
+        threshold: Similarité de Jaccard minimale entre doublons
+
+    Returns:
+        Dictionnaire {représentant: [doublons]} (groupes d'au moins deux CV) ; le représentant
+        est le CV le plus complet du groupe, le premier uploadé en cas d'égalité
+    """
+    filenames = list(cv_texts)
+    signatures = {filename: compute_minhash(shingle(cv_texts[filename])) for filename in filenames}
+
+    # Union-find des CV reconnus comme doublons
+    parents = {filename: filename for filename in filenames}
+
+    def find(filename):
+        while parents[filename] != filename:
+            parents[filename] = parents[parents[filename]]
+            filename = parents[filename]
+        return filename
+
+    for band in range(LSH_BANDS):
+        buckets = defaultdict(list)
+        rows = slice(band * LSH_ROWS_PER_BAND, (band + 1) * LSH_ROWS_PER_BAND)
+        for filename in filenames:
+            if cv_texts[filename].strip():
+                buckets[signatures[filename][rows].tobytes()].append(filename)
+        for bucket in buckets.values():
+            # Comparaison au premier CV du seau uniquement : coût linéaire même pour un seau chargé
+            first = bucket[0]
+            for filename in bucket[1:]:
+                if find(filename) != find(first) and \
+                        estimate_similarity(signatures[first], signatures[filename]) >= threshold:
+                    parents[find(filename)] = find(first)
+
+    groups = defaultdict(list)
+    for filename in filenames:
+        groups[find(filename)].append(filename)
+
+    duplicates = {}
+    upload_order = {filename: index for index, filename in enumerate(filenames)}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        representative = min(members, key=lambda name: (-len(cv_texts[name]), upload_order[name]))
+        duplicates[representative] = [name for name in members if name != representative]
+    return duplicates
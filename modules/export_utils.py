@@ -1,5 +1,46 @@
+import io
 import pandas as pd
+import time
 from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+
+# Largeur maximum d'une colonne Excel (en caractères)
+MAX_COLUMN_WIDTH = 50
+
+# Colonnes numériques (valeur vide possible) converties pour les formats typés (Parquet)
+NUMERIC_COLUMNS = ['Score', 'Score_Lexical', 'Tokens_CV_Initial', 'Tokens_CV_Compacté']
+
+
+def export_result_to_row(result: dict) -> dict:
+    """
+    Convertit un résultat de matching en ligne d'export (colonnes du rapport).
+    
+    Args:
+        result: Résultat d'analyse d'un CV
+        
+    Returns:
+        Dictionnaire {colonne: valeur}
+    """
+    # Conversion des listes en strings pour l'export
+    points_forts_str = " | ".join(result.get('Points_forts', []))
+    points_vigilance_str = " | ".join(result.get('Points_vigilance', []))
+    
+    return {
+        'Prénom': result.get('Prénom', ''),
+        'Nom': result.get('Nom', ''),
+        'Fichier_CV': result.get('cv_filename', ''),
+        'Score': result.get('Score', 0),
+        'Statut': result.get('Statut', ''),
+        'Doublons': ", ".join(result.get('Doublons', [])),
+        'Score_Lexical': result.get('Score_lexical', ''),
+        'Résumé': result.get('Résumé', ''),
+        'Points_Forts': points_forts_str,
+        'Points_Vigilance': points_vigilance_str,
+        'Tokens_CV_Initial': result.get('Tokens_CV_initial', ''),
+        'Tokens_CV_Compacté': result.get('Tokens_CV_compacté', ''),
+    }
 
 
 def export_results_to_dataframe(results: list) -> pd.DataFrame:
@@ -14,73 +55,291 @@ def export_results_to_dataframe(results: list) -> pd.DataFrame:
     """
     
     # Préparation des données pour le DataFrame
-    data_rows = []
+    data_rows = [export_result_to_row(result) for result in results]
+    
+    # Création du DataFrame
+    df = pd.DataFrame(data_rows)
+    
+    return df
+
+
+
+def export_metrics_to_dataframes(telemetry) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convertit la télémétrie d'une exécution en DataFrames (résumé et détail par événement).
+    
+    Args:
+        telemetry: Collecteur de télémétrie (RunTelemetry)
+        
+    Returns:
+        Tuple (DataFrame du résumé, DataFrame des événements)
+    """
+    summary_df = pd.DataFrame(
+        [{'Métrique': label, 'Valeur': value} for label, value in telemetry.summary().items()]
+    )
+    events_df = pd.DataFrame(telemetry.events)
+    if 'duration_s' in events_df:
+        events_df['duration_s'] = events_df['duration_s'].round(3)
+    
+    return summary_df, events_df
+
+
+def compute_column_widths(df: pd.DataFrame, max_width: int = MAX_COLUMN_WIDTH) -> list:
+    """
+    Calcule la largeur de chaque colonne (en-tête et valeurs) de façon vectorisée.
+    
+    Args:
+        df: DataFrame à exporter
+        max_width: Largeur maximum d'une colonne
+        
+    Returns:
+        Liste des largeurs, dans l'ordre des colonnes
+    """
+    header_lengths = pd.Series([len(str(column)) for column in df.columns], index=df.columns)
+    if df.empty:
+        value_lengths = pd.Series(0, index=df.columns)
+    else:
+        value_lengths = df.astype(str).apply(lambda column: column.str.len().max())
+    widths = (pd.concat([header_lengths, value_lengths], axis=1).max(axis=1) + 2).clip(upper=max_width)
+    return [int(width) for width in widths]
+
+
+def _iter_sheet_rows(df: pd.DataFrame):
+    """
+    Parcourt les lignes d'un DataFrame pour une feuille Excel (en-tête puis valeurs, NaN en cellule vide).
+    
+    Args:
+        df: DataFrame à écrire
+        
+    Yields:
+        Ligne de valeurs
+    """
+    yield list(df.columns)
+    for row in df.astype(object).itertuples(index=False, name=None):
+        yield [None if pd.isna(value) else value for value in row]
+
+
+def export_to_excel_bytes(results: list, telemetry=None) -> bytes:
+    """
+    Construit le rapport Excel en mémoire (openpyxl en mode écriture seule, sans fichier temporaire).
+    
+    Args:
+        results: Liste des résultats d'analyse
+        telemetry: Collecteur de télémétrie, exporté dans une feuille "Métriques" (optionnel)
+        
+    Returns:
+        Contenu du fichier .xlsx
+    """
+    start = time.perf_counter()
+    
+    # Création du DataFrame
+    df = export_results_to_dataframe(results)
+    
+    # Mode écriture seule : les lignes sont sérialisées au fil de l'eau, sans modèle de cellules en mémoire
+    workbook = Workbook(write_only=True)
+    _write_results_sheet(workbook, 'Résultats_Matching', df)
+    if telemetry is not None:
+        _write_metrics_sheet(workbook, telemetry)
+    data = _save_workbook(workbook)
+    
+    if telemetry is not None:
+        telemetry.record("export", status="ok", duration_s=time.perf_counter() - start,
+                         rows=len(results), format="xlsx", bytes=len(data))
+    
+    return data
+
+
+def _write_results_sheet(workbook: Workbook, title: str, df: pd.DataFrame) -> None:
+    """
+    Ajoute une feuille de données à un classeur en écriture seule.
+    
+    Args:
+        workbook: Classeur openpyxl (write_only=True)
+        title: Nom de la feuille
+        df: Données à écrire
+    """
+    worksheet = workbook.create_sheet(title)
+    # Largeur des colonnes (à définir avant l'écriture des lignes en mode écriture seule)
+    for index, width in enumerate(compute_column_widths(df), start=1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+    for row in _iter_sheet_rows(df):
+        worksheet.append(row)
+
+
+def _write_metrics_sheet(workbook: Workbook, telemetry) -> None:
+    """
+    Ajoute la feuille des métriques de l'exécution : résumé puis détail des événements.
     
-    for result in results:
-        # Conversion des listes en strings pour l'export
-        points_forts_str = " | ".join(result.get('Points_forts', []))
-        points_vigilance_str = " | ".join(result.get('Points_vigilance', []))
+    Args:
+        workbook: Classeur openpyxl (write_only=True)
+        telemetry: Collecteur de télémétrie (RunTelemetry)
+    """
+    summary_df, events_df = export_metrics_to_dataframes(telemetry)
+    metrics_sheet = workbook.create_sheet('Métriques')
+    metrics_sheet.column_dimensions['A'].width = 35
+    for row in _iter_sheet_rows(summary_df):
+        metrics_sheet.append(row)
+    metrics_sheet.append([])
+    for row in _iter_sheet_rows(events_df):
+        metrics_sheet.append(row)
+
+
+def _save_workbook(workbook: Workbook) -> bytes:
+    """Sérialise un classeur en mémoire."""
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def make_sheet_title(name: str, used_titles: set) -> str:
+    """
+    Construit un nom de feuille Excel valide et unique (31 caractères, sans []:*?/\\).
+    
+    Args:
+        name: Nom souhaité (nom de l'offre)
+        used_titles: Noms déjà utilisés dans le classeur (complété par la fonction)
         
+    Returns:
+        Nom de feuille
+    """
+    cleaned = ''.join(' ' if char in '[]:*?/\\' else char for char in str(name))
+    base = ' '.join(cleaned.split())[:31].strip() or 'Offre'
+    title = base
+    suffix = 2
+    while title.lower() in used_titles:
+        title = f"{base[:31 - len(str(suffix)) - 1]}_{suffix}"
+        suffix += 1
+    used_titles.add(title.lower())
+    return title
+
+
+def export_best_offers_to_dataframe(candidates: list) -> pd.DataFrame:
+    """
+    Convertit la vue par candidat du workflow matriciel en DataFrame (une colonne de score par offre).
+    
+    Args:
+        candidates: Vue par candidat (voir backend.build_best_offer_view)
+        
+    Returns:
+        DataFrame des candidats
+    """
+    data_rows = []
+    for candidate in candidates:
         row = {
-            'Prénom': result.get('Prénom', ''),
-            'Nom': result.get('Nom', ''),
-            'Fichier_CV': result.get('cv_filename', ''),
-            'Score': result.get('Score', 0),
-            'Résumé': result.get('Résumé', ''),
-            'Points_Forts': points_forts_str,
-            'Points_Vigilance': points_vigilance_str,
+            'Prénom': candidate.get('Prénom', ''),
+            'Nom': candidate.get('Nom', ''),
+            'Fichier_CV': candidate.get('cv_filename', ''),
+            'Meilleure_Offre': candidate.get('Meilleure_offre', ''),
+            'Meilleur_Score': candidate.get('Score', 0),
+            'Statut': candidate.get('Statut', ''),
         }
+        for offer_name, score in candidate.get('Scores_par_offre', {}).items():
+            row[f'Score - {offer_name}'] = score
         data_rows.append(row)
     
-    # Création du DataFrame
-    df = pd.DataFrame(data_rows)
+    return pd.DataFrame(data_rows)
+
+
+def export_matrix_to_excel_bytes(rankings: dict, candidates: list, telemetry=None) -> bytes:
+    """
+    Construit le classeur du workflow matriciel : vue par candidat, puis une feuille de classement par offre.
     
-    return df
+    Args:
+        rankings: Dictionnaire {nom_offre: analyses triées}
+        candidates: Vue par candidat (voir backend.build_best_offer_view)
+        telemetry: Collecteur de télémétrie, exporté dans une feuille "Métriques" (optionnel)
+        
+    Returns:
+        Contenu du fichier .xlsx
+    """
+    start = time.perf_counter()
+    
+    workbook = Workbook(write_only=True)
+    used_titles = {'meilleure_offre', 'métriques'}
+    _write_results_sheet(workbook, 'Meilleure_Offre', export_best_offers_to_dataframe(candidates))
+    for offer_name, results in rankings.items():
+        _write_results_sheet(workbook, make_sheet_title(offer_name, used_titles), export_results_to_dataframe(results))
+    if telemetry is not None:
+        _write_metrics_sheet(workbook, telemetry)
+    data = _save_workbook(workbook)
+    
+    if telemetry is not None:
+        telemetry.record("export", status="ok", duration_s=time.perf_counter() - start,
+                         rows=sum(len(results) for results in rankings.values()), format="xlsx", bytes=len(data))
+    
+    return data
+
+
+def export_to_csv_bytes(results: list, telemetry=None) -> bytes:
+    """
+    Exporte les résultats au format CSV (UTF-8 avec BOM, lisible directement par Excel).
+    
+    Args:
+        results: Liste des résultats d'analyse
+        telemetry: Collecteur de télémétrie (optionnel)
+        
+    Returns:
+        Contenu du fichier .csv
+    """
+    start = time.perf_counter()
+    data = export_results_to_dataframe(results).to_csv(index=False).encode('utf-8-sig')
+    
+    if telemetry is not None:
+        telemetry.record("export", status="ok", duration_s=time.perf_counter() - start,
+                         rows=len(results), format="csv", bytes=len(data))
+    
+    return data
+
 
+def export_to_parquet_bytes(results: list, telemetry=None) -> bytes:
+    """
+    Exporte les résultats au format Parquet (nécessite pyarrow).
+    
+    Args:
+        results: Liste des résultats d'analyse
+        telemetry: Collecteur de télémétrie (optionnel)
+        
+    Returns:
+        Contenu du fichier .parquet
+    """
+    start = time.perf_counter()
+    df = export_results_to_dataframe(results)
+    
+    # Colonnes typées : les valeurs vides deviennent des valeurs manquantes
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    data = buffer.getvalue()
+    
+    if telemetry is not None:
+        telemetry.record("export", status="ok", duration_s=time.perf_counter() - start,
+                         rows=len(results), format="parquet", bytes=len(data))
+    
+    return data
 
 
-def export_to_excel(results: list, filename: str = None) -> str:
+def export_to_excel(results: list, filename: str = None, telemetry=None) -> str:
     """
     Exporte les résultats vers un fichier Excel.
     
     Args:
         results: Liste des résultats d'analyse
         filename: Nom du fichier (optionnel)
+        telemetry: Collecteur de télémétrie, exporté dans une feuille "Métriques" (optionnel)
         
     Returns:
         Nom du fichier créé
     """
-    
     # Génération du nom de fichier si non fourni
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"matching_cv_results_{timestamp}.xlsx"
     
-    # Création du DataFrame
-    df = export_results_to_dataframe(results)
-    
-    # Export Excel avec mise en forme
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Résultats_Matching', index=False)
-        
-        # Récupération du worksheet pour la mise en forme
-        worksheet = writer.sheets['Résultats_Matching']
-        
-        # Ajustement automatique de la largeur des colonnes
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Limitation de la largeur max et ajustement
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    with open(filename, 'wb') as file:
+        file.write(export_to_excel_bytes(results, telemetry=telemetry))
     
     print(f"✅ Export Excel créé: {filename}")
-    return filename
\ No newline at end of file
+    return filename
@@ -1,35 +1,253 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
 import requests
-import json
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# API des offres
+JOB_API_BASE_URL = "https://parlym.nos-recrutements.fr/api/job"
+
+# Délais de connexion et de lecture (s), taille du pool de connexions et récupérations simultanées
+FETCH_CONNECT_TIMEOUT_SECONDS = 5
+FETCH_READ_TIMEOUT_SECONDS = 30
+FETCH_POOL_SIZE = 16
+MAX_CONCURRENT_FETCHES = 16
+
+# Durée pendant laquelle une offre en cache est réutilisée sans interroger l'API (s)
+OFFER_CACHE_TTL_SECONDS = 900
 
-import openai
-import json
-import streamlit as st
+# Message retourné quand une offre n'a pas pu être récupérée
+OFFER_ERROR_MESSAGE = "Erreur lors de la récupération des données de l'offre."
 
-openai.api_key = st.secrets["OPENAI_API_KEY"]
 
-def api_url(offre_url: str) -> str:
+def api_url(offre_url: str, base_url: str = JOB_API_BASE_URL) -> str:
     """
     Extrait l'ID du job depuis l'URL de l'offre et construit l'URL de l'API.
     
     Args:
         offre_url: URL de l'offre d'emploi
+        base_url: URL de base de l'API des offres
         
     Returns:
         Dictionnaire contenant l'ID et l'URL de l'API
     """
     # Nettoyage de l'URL et extraction de l'ID
-    job_id = offre_url.strip().split("/")[-1]
-    api_url = f"https://parlym.nos-recrutements.fr/api/job/{job_id}"
+    job_id = offre_url.strip().rstrip("/").split("/")[-1]
+    api_url = f"{base_url.rstrip('/')}/{job_id}"
     
     return api_url
 
 
+class _TextCollector(HTMLParser):
+    """Collecte les segments de texte d'un fragment HTML (hors commentaires, scripts et styles)."""
+
+    SKIPPED_TAGS = {"script", "style", "template"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convertit un fragment HTML en texte sur une ligne, espaces normalisés
+    (même résultat que BeautifulSoup get_text(separator=' ', strip=True), en une seule passe).
+    
+    Args:
+        html: Fragment HTML
+        
+    Returns:
+        Texte nettoyé
+    """
+    if not html:
+        return ""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return ' '.join(' '.join(collector.parts).split())
+
+
+class JobOfferFetcher:
+    """
+    Récupère les offres avec une session HTTP partagée (pool de connexions keep-alive),
+    des requêtes conditionnelles (ETag / If-Modified-Since) et un cache TTL du texte nettoyé.
+    """
+
+    def __init__(self, base_url: str = JOB_API_BASE_URL, ttl_seconds: float = OFFER_CACHE_TTL_SECONDS,
+                 pool_size: int = FETCH_POOL_SIZE,
+                 timeout: tuple = (FETCH_CONNECT_TIMEOUT_SECONDS, FETCH_READ_TIMEOUT_SECONDS)):
+        self.base_url = base_url
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                              allowed_methods=["GET"])
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.not_modified = 0
+
+    def fetch_job_data(self, api_url: str) -> dict:
+        """
+        Récupère les données de l'offre : cache si récent, sinon requête conditionnelle.
+        En cas d'erreur réseau, la dernière version connue est conservée.
+        
+        Args:
+            api_url: URL de l'API pour récupérer les données
+            
+        Returns:
+            Données JSON de l'offre (None si indisponible)
+        """
+        entry = self._get_entry(api_url)
+        if entry and time.monotonic() - entry["fetched_at"] < self.ttl_seconds:
+            return entry["data"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(api_url, headers=headers, timeout=self.timeout)
+            with self._lock:
+                self.requests_sent += 1
+            if response.status_code == 304 and entry:
+                with self._lock:
+                    self.not_modified += 1
+                    entry["fetched_at"] = time.monotonic()
+                return entry["data"]
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Erreur lors de la récupération des données: {e}")
+            return entry["data"] if entry else None
+
+        with self._lock:
+            self._entries[api_url] = {
+                "data": data,
+                "text": None,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.monotonic()
+            }
+        return data
+
+    def get_offer_text(self, offre_url: str) -> str:
+        """
+        Retourne la description formatée d'une offre (texte nettoyé mis en cache avec les données).
+        
+        Args:
+            offre_url: URL de l'offre d'emploi
+            
+        Returns:
+            Description formatée complète de l'offre
+        """
+        api_endpoint = api_url(offre_url, self.base_url)
+        job_data = self.fetch_job_data(api_endpoint)
+        if not job_data:
+            return OFFER_ERROR_MESSAGE
+
+        entry = self._get_entry(api_endpoint)
+        if entry and entry["data"] is job_data and entry["text"] is not None:
+            return entry["text"]
+
+        text = combine_job_descriptions(
+            extract_description_mission(job_data), extract_description_profile(job_data)
+        )
+        if entry and entry["data"] is job_data:
+            with self._lock:
+                entry["text"] = text
+        return text
+
+    def get_offer_texts(self, offre_urls: list, max_workers: int = MAX_CONCURRENT_FETCHES) -> dict:
+        """
+        Récupère plusieurs offres en parallèle.
+        
+        Args:
+            offre_urls: Liste des URL d'offres
+            max_workers: Nombre maximum de récupérations simultanées
+            
+        Returns:
+            Dictionnaire {url_offre: description formatée}, dans l'ordre des URL
+        """
+        unique_urls = list(dict.fromkeys(offre_urls))
+        if not unique_urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_urls)))) as executor:
+            return dict(zip(unique_urls, executor.map(self.get_offer_text, unique_urls)))
+
+    def _get_entry(self, api_url: str) -> dict:
+        """Retourne l'entrée de cache d'une URL d'API (ou None)."""
+        with self._lock:
+            return self._entries.get(api_url)
+
+    def clear(self) -> None:
+        """Vide le cache des offres."""
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Ferme la session HTTP."""
+        self.session.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_default_fetcher() -> JobOfferFetcher:
+    """
+    Retourne le récupérateur d'offres partagé du processus (créé à la première utilisation).
+    
+    Returns:
+        Récupérateur d'offres partagé
+    """
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = JobOfferFetcher()
+        return _default_fetcher
+
+
+def set_default_fetcher(fetcher: JobOfferFetcher) -> None:
+    """
+    Remplace le récupérateur d'offres partagé du processus (autre API, autre TTL...).
+    
+    Args:
+        fetcher: Nouveau récupérateur
+    """
+    global _default_fetcher
+    with _default_fetcher_lock:
+        _default_fetcher = fetcher
+
+
 def fetch_job_data(api_url: str) -> dict:
     """
-    Récupère les données de l'offre depuis l'API.
+    Récupère les données de l'offre depuis l'API (session partagée, cache et requêtes conditionnelles).
     
     Args:
         api_url: URL de l'API pour récupérer les données
@@ -37,13 +255,7 @@ def fetch_job_data(api_url: str) -> dict:
     Returns:
         Données JSON de l'offre
     """
-    try:
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Erreur lors de la récupération des données: {e}")
-        return None
+    return get_default_fetcher().fetch_job_data(api_url)
     
 
 def extract_description_mission(job_json_data: dict) -> dict:
@@ -64,14 +276,9 @@ def extract_description_mission(job_json_data: dict) -> dict:
             "descriptionMissionClean": ""
         }
     
-    # Parse le HTML avec BeautifulSoup (équivalent au CSS Selector: *)
-    soup = BeautifulSoup(description_mission_html, 'html.parser')
-    
-    # Extraction du texte en gardant la structure (Return Value: Text)
-    text_content = soup.get_text(separator=' ', strip=True)
-    
-    # Nettoyage supplémentaire - suppression des espaces multiples
-    cleaned_text = ' '.join(text_content.split())
+    # Extraction du texte en une passe (équivalent au CSS Selector: * / Return Value: Text),
+    # espaces multiples supprimés
+    cleaned_text = html_to_text(description_mission_html)
     
     return {
         "descriptionMissionClean": cleaned_text
@@ -97,14 +304,9 @@ def extract_description_profile(job_json_data: dict) -> dict:
             "descriptionProfileClean": ""
         }
     
-    # Parse le HTML avec BeautifulSoup (équivalent au CSS Selector: *)
-    soup = BeautifulSoup(description_profile_html, 'html.parser')
-    
-    # Extraction du texte en gardant la structure (Return Value: Text)
-    text_content = soup.get_text(separator=' ', strip=True)
-    
-    # Nettoyage supplémentaire - suppression des espaces multiples
-    cleaned_text = ' '.join(text_content.split())
+    # Extraction du texte en une passe (équivalent au CSS Selector: * / Return Value: Text),
+    # espaces multiples supprimés
+    cleaned_text = html_to_text(description_profile_html)
     
     return {
         "descriptionProfileClean": cleaned_text
@@ -145,16 +347,18 @@ def process_job_offer_workflow(offre_url: str) -> str:
     Returns:
         Description formatée complète de l'offre
     """
-    api_endpoint = api_url(offre_url)
-    job_data = fetch_job_data(api_endpoint)
-    
-    if not job_data:
-        return "Erreur lors de la récupération des données de l'offre."
-    
-    mission_result = extract_description_mission(job_data)
-    profile_result = extract_description_profile(job_data)
-    
-    combined_description = combine_job_descriptions(mission_result, profile_result)
-    
-    return combined_description
+    return get_default_fetcher().get_offer_text(offre_url)
+
 
+def process_job_offers_workflow(offre_urls: list, max_workers: int = MAX_CONCURRENT_FETCHES) -> dict:
+    """
+    Traite plusieurs offres d'emploi en parallèle (synchronisation de la liste des postes ouverts).
+    
+    Args:
+        offre_urls: Liste des URL d'offres
+        max_workers: Nombre maximum de récupérations simultanées
+        
+    Returns:
+        Dictionnaire {url_offre: description formatée}
+    """
+    return get_default_fetcher().get_offer_texts(offre_urls, max_workers)
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+# Paramètres par défaut du pool de connexions HTTP vers l'API
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 120.0
+
+# Réessais du SDK désactivés : ils sont gérés par le limiteur partagé (modules.rate_limiting),
+# qui voit ainsi chaque 429 et ses en-têtes
+DEFAULT_MAX_RETRIES = 0
+
+
+class LLMBackendError(Exception):
+    """
+    Erreur d'appel IA, indépendante du SDK (statut HTTP, en-têtes, caractère temporaire).
+    """
+
+    def __init__(self, message: str, status_code: int = None, headers: dict = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.retryable = retryable
+
+
+def resolve_api_key() -> str:
+    """
+    Retourne la clé API OpenAI : variable d'environnement, sinon secrets Streamlit.
+
+    Returns:
+        Clé API
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key:
+        return api_key
+    import streamlit as st
+    return st.secrets["OPENAI_API_KEY"]
+
+
+class OpenAIBackend:
+    """
+    Backend IA OpenAI avec un client unique et un pool de connexions HTTP persistantes (keep-alive).
+    Une instance est partagée par tous les threads d'analyse.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        # Import différé : le SDK OpenAI n'est chargé qu'à la première analyse
+        import httpx
+        import openai
+
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout)
+        )
+        self.client = openai.OpenAI(
+            api_key=api_key or resolve_api_key(),
+            base_url=base_url or os.environ.get("OPENAI_BASE_URL") or None,
+            http_client=self.http_client,
+            max_retries=max_retries
+        )
+
+    def complete(self, request: dict) -> dict:
+        """
+        Envoie une requête chat completions.
+
+        Args:
+            request: Paramètres de la requête (voir ai_analysis.build_chat_request)
+
+        Returns:
+            Dictionnaire {content, prompt_tokens, completion_tokens, headers}
+        """
+        import openai
+
+        try:
+            raw_response = self.client.chat.completions.with_raw_response.create(**request)
+        except openai.APIStatusError as e:
+            raise LLMBackendError(str(e), e.status_code, dict(e.response.headers)) from e
+        except openai.APIConnectionError as e:  # délais dépassés inclus
+            raise LLMBackendError(str(e), retryable=True) from e
+        completion = raw_response.parse()
+        usage = completion.usage
+        return {
+            "content": completion.choices[0].message.content,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "headers": dict(raw_response.headers)
+        }
+
+    def close(self) -> None:
+        """Ferme le pool de connexions."""
+        self.client.close()
+
+
+class FakeLLMBackend:
+    """
+    Backend IA local, sans réseau (CLI hors ligne, tests de charge, développement).
+    Les réponses sont produites par responder(request) -> contenu JSON, ou générées
+    de façon déterministe à partir du prompt (analyse simple et multi-CV).
+    """
+
+    def __init__(self, responder=None, latency: float = 0.0):
+        self.responder = responder
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, request: dict) -> dict:
+        """
+        Produit une réponse simulée.
+
+        Args:
+            request: Paramètres de la requête (voir ai_analysis.build_chat_request)
+
+        Returns:
+            Dictionnaire {content, prompt_tokens, completion_tokens, headers}
+        """
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = request["messages"][-1]["content"]
+        if self.responder is not None:
+            content = self.responder(request)
+        else:
+            schema_name = request.get("response_format", {}).get("json_schema", {}).get("name", "")
+            if schema_name.endswith("_packed"):
+                cv_ids = re.findall(r"\[cv_id: ([^\]]+)\]", prompt)
+                content = json.dumps({"Candidats": [
+                    dict(self._fake_analysis(prompt + cv_id), cv_id=cv_id) for cv_id in cv_ids
+                ]}, ensure_ascii=False)
+            elif schema_name == "cv_profile":
+                content = json.dumps(self._fake_profile(prompt), ensure_ascii=False)
+            else:
+                content = json.dumps(self._fake_analysis(prompt), ensure_ascii=False)
+
+        return {
+            "content": content,
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "headers": {}
+        }
+
+    @staticmethod
+    def _fake_analysis(seed_text: str) -> dict:
+        """Produit une analyse déterministe à partir du texte reçu."""
+        digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+        return {
+            "Prénom": "Candidat",
+            "Nom": digest[:3].hex(),
+            "Score": digest[3] % 101,
+            "Résumé": "Analyse simulée (backend local).",
+            "Points_forts": [],
+            "Points_vigilance": []
+        }
+
+    @staticmethod
+    def _fake_profile(seed_text: str) -> dict:
+        """Produit un profil de CV déterministe à partir du texte reçu."""
+        digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+        cv_lines = [line.strip() for line in seed_text.split("CV DU CANDIDAT :")[-1].splitlines() if line.strip()]
+        return {
+            "Prénom": "Candidat",
+            "Nom": digest[:3].hex(),
+            "Années_expérience": digest[3] % 21,
+            "Expériences": [{
+                "Intitulé": "Ingénieur", "Entreprise": "", "Secteur": "", "Début": "", "Fin": "",
+                "Missions": [line[:80] for line in cv_lines[:3]]
+            }],
+            "Secteurs": [],
+            "Outils_compétences": [],
+            "Formations": []
+        }
+
+    def close(self) -> None:
+        """Rien à fermer."""
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def get_default_backend():
+    """
+    Retourne le backend IA partagé du processus (OpenAIBackend créé à la première utilisation).
+
+    Returns:
+        Backend IA partagé
+    """
+    global _default_backend
+    with _default_backend_lock:
+        if _default_backend is None:
+            _default_backend = OpenAIBackend()
+        return _default_backend
+
+
+def set_default_backend(backend) -> None:
+    """
+    Remplace le backend IA partagé du processus (URL personnalisée, backend local...).
+
+    Args:
+        backend: Objet exposant complete(request) -> dict
+    """
+    global _default_backend
+    with _default_backend_lock:
+        _default_backend = backend
@@ -0,0 +1,211 @@
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# Emplacement par défaut du cache des analyses IA
+DEFAULT_CACHE_PATH = Path(".cache") / "llm_cache.sqlite"
+
+# Limites d'éviction par défaut
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Éviction tous les EVICTION_INTERVAL enregistrements (et non à chaque écriture)
+EVICTION_INTERVAL = 100
+
+# Nombre de dates de dernier accès mises en attente avant leur écriture groupée
+ACCESS_FLUSH_SIZE = 50
+
+
+def compute_cache_key(*parts: str) -> str:
+    """
+    Calcule une clé de cache SHA-256 à partir de plusieurs textes.
+
+    Args:
+        parts: Textes à combiner (offre, CV, modèle, version du prompt...)
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        # Préfixe de longueur pour éviter les collisions par concaténation
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    Cache persistant (SQLite) des réponses IA, adressé par contenu.
+    Éviction par ancienneté et par nombre d'entrées (les moins récemment utilisées), déclenchée
+    périodiquement ; les dates de dernier accès sont écrites par lots.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_accesses = {}
+        self._inserts_since_eviction = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS analyses_accessed_at ON analyses (accessed_at)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS analyses_created_at ON analyses (created_at)"
+            )
+        self.evict()
+        # Dates d'accès encore en attente écrites à l'arrêt du processus
+        atexit.register(self.flush)
+
+    def get(self, key: str):
+        """
+        Récupère une réponse en cache.
+
+        Args:
+            key: Clé de cache
+
+        Returns:
+            Valeur désérialisée, ou None si absente ou expirée
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += 1
+                return None
+            self._pending_accesses[key] = now
+            if len(self._pending_accesses) >= ACCESS_FLUSH_SIZE:
+                self._flush_accesses()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value) -> None:
+        """
+        Enregistre une réponse dans le cache.
+
+        Args:
+            key: Clé de cache
+            value: Valeur sérialisable en JSON
+        """
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO analyses (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+            self._pending_accesses.pop(key, None)
+            self._inserts_since_eviction += 1
+            due = self._inserts_since_eviction >= EVICTION_INTERVAL
+        if due:
+            self.evict()
+
+    def _flush_accesses(self) -> None:
+        """Écrit en une transaction les dates de dernier accès en attente (verrou détenu par l'appelant)."""
+        if not self._pending_accesses:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE analyses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_accesses.items()]
+            )
+        self._pending_accesses.clear()
+
+    def flush(self) -> None:
+        """Écrit les dates de dernier accès en attente."""
+        with self._lock:
+            self._flush_accesses()
+
+    def evict(self) -> None:
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de max_entries."""
+        with self._lock:
+            self._flush_accesses()
+            self._inserts_since_eviction = 0
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM analyses WHERE created_at < ?",
+                    (time.time() - self.max_age_seconds,)
+                )
+                entries = self._connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+                if entries > self.max_entries:
+                    # Parcours de l'index sur accessed_at : seules les entrées en trop sont lues
+                    self._connection.execute(
+                        "DELETE FROM analyses WHERE key IN "
+                        "(SELECT key FROM analyses ORDER BY accessed_at ASC LIMIT ?)",
+                        (entries - self.max_entries,)
+                    )
+
+    def clear(self) -> None:
+        """Vide entièrement le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._pending_accesses.clear()
+            with self._connection:
+                self._connection.execute("DELETE FROM analyses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Retourne les statistiques du cache.
+
+        Returns:
+            Dictionnaire {hits, misses, entries}
+        """
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """
+    Retourne le cache partagé du processus (créé à la première utilisation).
+
+    Returns:
+        Instance LLMCache partagée
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+
+def set_default_cache(cache: LLMCache) -> None:
+    """
+    Remplace le cache partagé du processus (benchmarks, tests, emplacement personnalisé).
+
+    Args:
+        cache: Nouvelle instance LLMCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
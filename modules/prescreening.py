@@ -0,0 +1,129 @@
+import re
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+
+# Paramètres BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Mots vides ignorés lors de la présélection
+STOPWORDS = {
+    "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "elle", "en", "et", "est",
+    "il", "ils", "la", "le", "les", "leur", "lui", "ma", "mais", "me", "mes", "ne", "nos",
+    "notre", "nous", "on", "ou", "par", "pas", "pour", "qu", "que", "qui", "sa", "se", "ses",
+    "son", "sur", "ta", "te", "tes", "ton", "tu", "un", "une", "vos", "votre", "vous",
+    "the", "and", "of", "to", "in", "for", "with", "on", "at", "an", "is", "are"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    """
+    Découpe un texte en termes normalisés (minuscules, sans accents, sans mots vides).
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        Liste des termes
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = normalized.encode("ascii", "ignore").decode("ascii")
+    return [
+        token for token in TOKEN_PATTERN.findall(normalized)
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def compute_bm25_scores(offer_text: str, cv_texts: list,
+                        k1: float = BM25_K1, b: float = BM25_B) -> np.ndarray:
+    """
+    Calcule le score BM25 de chaque CV par rapport à l'offre.
+    Seuls les termes de l'offre sont indexés : la matrice des fréquences
+    est de taille (nombre de CV × termes de l'offre).
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cv_texts: Liste des textes de CV
+        k1: Saturation de la fréquence des termes
+        b: Normalisation par la longueur du CV
+
+    Returns:
+        Tableau des scores BM25 bruts, dans l'ordre de cv_texts
+    """
+    query_terms = sorted(set(tokenize(offer_text)))
+    if not cv_texts or not query_terms:
+        return np.zeros(len(cv_texts))
+
+    term_index = {term: i for i, term in enumerate(query_terms)}
+    term_frequencies = np.zeros((len(cv_texts), len(query_terms)), dtype=np.float64)
+    doc_lengths = np.zeros(len(cv_texts), dtype=np.float64)
+
+    for doc, cv_text in enumerate(cv_texts):
+        tokens = tokenize(cv_text)
+        doc_lengths[doc] = len(tokens)
+        counts = Counter(token for token in tokens if token in term_index)
+        if counts:
+            columns = [term_index[term] for term in counts]
+            term_frequencies[doc, columns] = list(counts.values())
+
+    n_docs = len(cv_texts)
+    doc_frequencies = np.count_nonzero(term_frequencies, axis=0)
+    idf = np.log1p((n_docs - doc_frequencies + 0.5) / (doc_frequencies + 0.5))
+
+    average_length = doc_lengths.mean() or 1.0
+    length_norm = k1 * (1 - b + b * doc_lengths / average_length)
+    weighted = term_frequencies * (k1 + 1) / (term_frequencies + length_norm[:, None])
+
+    return weighted @ idf
+
+
+def compute_lexical_scores(offer_text: str, cvs: dict) -> dict:
+    """
+    Calcule un score lexical sur 100 pour chaque CV (100 = meilleur CV du lot).
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cvs: Dictionnaire {nom_fichier: texte_cv}
+
+    Returns:
+        Dictionnaire {nom_fichier: score_lexical}
+    """
+    filenames = list(cvs)
+    scores = compute_bm25_scores(offer_text, [cvs[filename] for filename in filenames])
+    best = scores.max() if len(scores) else 0
+    if best > 0:
+        scores = scores / best * 100
+
+    return {filename: round(float(score), 1) for filename, score in zip(filenames, scores)}
+
+
+def shortlist_cvs(offer_text: str, cvs: dict, top_k: int = None,
+                  min_score: float = None) -> tuple[dict, dict]:
+    """
+    Présélectionne les CV à envoyer à l'IA d'après leur score lexical.
+
+    Args:
+        offer_text: Texte de l'offre d'emploi
+        cvs: Dictionnaire {nom_fichier: texte_cv}
+        top_k: Nombre maximum de CV retenus (None pour tous)
+        min_score: Score lexical minimum sur 100 (None pour aucun seuil)
+
+    Returns:
+        Tuple ({nom_fichier: texte_cv} retenus, {nom_fichier: score_lexical} pour tous les CV)
+    """
+    lexical_scores = compute_lexical_scores(offer_text, cvs)
+    ranked = sorted(cvs, key=lambda filename: lexical_scores[filename], reverse=True)
+
+    if min_score is not None:
+        ranked = [filename for filename in ranked if lexical_scores[filename] >= min_score]
+    if top_k is not None:
+        ranked = ranked[:top_k]
+
+    selected = set(ranked)
+    shortlisted = {filename: text for filename, text in cvs.items() if filename in selected}
+    return shortlisted, lexical_scores
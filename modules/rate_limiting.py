@@ -0,0 +1,321 @@
+import random
+import re
+import threading
+import time
+
+
+# Quotas par défaut (requêtes et tokens par minute), ajustés ensuite par les en-têtes x-ratelimit-limit-*
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+# Bornes de la concurrence adaptative (AIMD) et concurrence de départ, relevée ensuite par l'augmentation additive
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_INITIAL_CONCURRENCY = 4
+
+# Réessais avec attente exponentielle et aléa (jitter)
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY_SECONDS = 1.0
+DEFAULT_MAX_DELAY_SECONDS = 60.0
+
+# Statuts HTTP pour lesquels un réessai a du sens
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def parse_reset_duration(value: str) -> float:
+    """
+    Convertit une durée d'en-tête OpenAI ("20ms", "1s", "6m0s", "1h2m3.5s") en secondes.
+
+    Args:
+        value: Valeur de l'en-tête
+
+    Returns:
+        Durée en secondes (0 si illisible)
+    """
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    matches = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", str(value))
+    if not matches:
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return 0.0
+    return sum(float(amount) * units[unit] for amount, unit in matches)
+
+
+def get_retry_after(headers: dict) -> float:
+    """
+    Lit le délai d'attente demandé par le serveur (retry-after-ms ou retry-after).
+
+    Args:
+        headers: En-têtes de la réponse
+
+    Returns:
+        Délai en secondes, ou None si absent
+    """
+    if headers.get("retry-after-ms"):
+        return parse_reset_duration(headers["retry-after-ms"]) / 1000
+    if headers.get("retry-after"):
+        return parse_reset_duration(headers["retry-after"])
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Indique si une erreur d'appel IA est temporaire (quota, surcharge, réseau).
+
+    Args:
+        error: Exception levée par le backend IA
+
+    Returns:
+        True si l'appel peut être réessayé
+    """
+    if getattr(error, "retryable", False):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code in RETRYABLE_STATUS_CODES or status_code >= 500)
+
+
+class TokenBucket:
+    """
+    Seau à jetons rempli en continu (débit par minute), par réservation : un appel
+    prélève immédiatement sa part et attend le temps nécessaire si le seau est à découvert.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.level = float(rate_per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour."""
+        self.level = min(self.rate_per_minute, self.level + (now - self.updated) * self.rate_per_minute / 60)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Réserve des jetons.
+
+        Args:
+            amount: Nombre de jetons (plafonné à la capacité du seau)
+            now: Instant courant (time.monotonic())
+
+        Returns:
+            Attente nécessaire en secondes avant de consommer les jetons
+        """
+        self._refill(now)
+        self.level -= min(amount, self.rate_per_minute)
+        return max(0.0, -self.level * 60 / self.rate_per_minute)
+
+    def sync(self, remaining: float = None, limit: float = None, now: float = None) -> None:
+        """
+        Aligne le seau sur les quotas annoncés par le serveur.
+
+        Args:
+            remaining: Jetons restants selon le serveur (x-ratelimit-remaining-*)
+            limit: Quota par minute selon le serveur (x-ratelimit-limit-*)
+            now: Instant courant (time.monotonic())
+        """
+        self._refill(now if now is not None else time.monotonic())
+        if limit:
+            self.rate_per_minute = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+
+class AdaptiveRateLimiter:
+    """
+    Limiteur partagé par tous les threads d'analyse :
+    seaux de requêtes et de tokens par minute synchronisés sur les en-têtes x-ratelimit-*,
+    concurrence adaptative AIMD (+1 par fenêtre sans erreur, divisée par deux sur un 429)
+    et réessais avec attente exponentielle et aléa, ou le délai retry-after du serveur.
+    La concurrence part d'une valeur prudente et ne monte que lorsqu'elle est atteinte, sans dépasser
+    max_concurrency. Le plafond propre à chaque exécution est la taille de son pool d'analyse :
+    le limiteur, partagé entre les sessions, ne porte que l'état commun (quotas, 429, AIMD).
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 min_concurrency: int = DEFAULT_MIN_CONCURRENCY,
+                 initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = DEFAULT_BASE_DELAY_SECONDS,
+                 max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+                 seed: int = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = max(min_concurrency, min(initial_concurrency, max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._increase_credit = 0.0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._rng = random.Random(seed)
+        self._condition = threading.Condition()
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Attend une place dans la limite de concurrence, puis le quota de requêtes et de tokens.
+
+        Args:
+            estimated_tokens: Tokens estimés de l'appel (prompt et réponse)
+        """
+        with self._condition:
+            while self.in_flight >= self.concurrency_limit:
+                self._condition.wait()
+            self.in_flight += 1
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self.requests.reserve(1, now),
+                self.tokens.reserve(estimated_tokens, now)
+            )
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self, headers: dict = None, rate_limited: bool = False, failed: bool = False,
+                started_at: float = None) -> None:
+        """
+        Libère la place d'un appel terminé et ajuste quotas et concurrence.
+
+        Args:
+            headers: En-têtes de la réponse (x-ratelimit-*, retry-after)
+            rate_limited: L'appel a reçu un 429
+            failed: L'appel a échoué pour une autre raison (pas d'augmentation de la concurrence)
+            started_at: Début de l'appel (time.monotonic()), pour ne réduire qu'une fois par rafale de 429
+        """
+        with self._condition:
+            # Limite atteinte pendant l'appel : seule situation où l'augmenter a un sens
+            saturated = self.in_flight >= self.concurrency_limit
+            self.in_flight -= 1
+            if headers:
+                self._apply_headers(headers)
+            if rate_limited:
+                self.rate_limited += 1
+                # Diminution multiplicative, une seule fois pour les appels lancés avant la dernière réduction
+                if started_at is None or started_at >= self._last_decrease:
+                    self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit // 2)
+                    self._increase_credit = 0.0
+                    self._last_decrease = time.monotonic()
+            elif not failed and saturated and self.concurrency_limit < self.max_concurrency:
+                # Augmentation additive : +1 après concurrency_limit appels réussis
+                self._increase_credit += 1 / self.concurrency_limit
+                if self._increase_credit >= 1:
+                    self.concurrency_limit += 1
+                    self._increase_credit -= 1
+            self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Suspend tous les nouveaux appels pendant un délai (retry-after, quota épuisé).
+
+        Args:
+            seconds: Durée de la pause
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _apply_headers(self, headers: dict) -> None:
+        """Synchronise les seaux sur les en-têtes x-ratelimit-* (appelé sous verrou)."""
+        now = time.monotonic()
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            try:
+                remaining = float(remaining) if remaining is not None else None
+                limit = float(limit) if limit is not None else None
+            except ValueError:
+                continue
+            bucket.sync(remaining, limit, now)
+            reset = headers.get(f"x-ratelimit-reset-{kind}")
+            if remaining is not None and remaining <= 0 and reset:
+                self._paused_until = max(self._paused_until, now + parse_reset_duration(reset))
+
+    def backoff_delay(self, attempt: int, headers: dict = None) -> float:
+        """
+        Calcule l'attente avant un réessai : retry-after du serveur, sinon exponentielle avec aléa.
+
+        Args:
+            attempt: Numéro du réessai (0 pour le premier)
+            headers: En-têtes de la réponse en erreur
+
+        Returns:
+            Attente en secondes
+        """
+        retry_after = get_retry_after(headers or {})
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        with self._condition:
+            return delay / 2 + self._rng.uniform(0, delay / 2)
+
+    def call(self, function, *args, estimated_tokens: int = 0):
+        """
+        Exécute un appel IA dans les limites de quota, avec réessais sur les erreurs temporaires.
+
+        Args:
+            function: Fonction d'appel, retournant un dictionnaire (avec "headers" éventuels)
+            args: Arguments de la fonction
+            estimated_tokens: Tokens estimés de l'appel
+
+        Returns:
+            Réponse de la fonction, complétée du nombre de réessais ("retries")
+        """
+        retries = 0
+        while True:
+            self.acquire(estimated_tokens)
+            started_at = time.monotonic()
+            try:
+                response = function(*args)
+            except Exception as error:
+                headers = getattr(error, "headers", None) or {}
+                status_code = getattr(error, "status_code", None)
+                delay = self.backoff_delay(retries, headers)
+                if status_code == 429:
+                    # Quota dépassé : tous les appels attendent, pas seulement celui-ci
+                    self.pause(delay)
+                self.release(headers, rate_limited=status_code == 429, failed=True, started_at=started_at)
+                if retries >= self.max_retries or not is_retryable(error):
+                    error.retries = retries
+                    raise
+                if status_code != 429:
+                    time.sleep(delay)
+                retries += 1
+                continue
+            self.release(response.get("headers"), started_at=started_at)
+            return dict(response, retries=retries)
+
+
+_default_rate_limiter = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> AdaptiveRateLimiter:
+    """
+    Retourne le limiteur partagé du processus (créé à la première utilisation).
+
+    Returns:
+        Limiteur partagé
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = AdaptiveRateLimiter()
+        return _default_rate_limiter
+
+
+def set_default_rate_limiter(rate_limiter: AdaptiveRateLimiter) -> None:
+    """
+    Remplace le limiteur partagé du processus (quotas du compte, tests de charge...).
+
+    Args:
+        rate_limiter: Nouveau limiteur
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        _default_rate_limiter = rate_limiter
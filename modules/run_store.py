@@ -0,0 +1,323 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .llm_cache import compute_cache_key
+
+
+# Emplacement par défaut de l'historique des exécutions
+DEFAULT_RUN_STORE_PATH = Path(".cache") / "runs.sqlite"
+
+# Statuts d'un CV dans une exécution
+ITEM_PENDING = "pending"
+ITEM_DONE = "done"
+ITEM_FAILED = "failed"
+
+
+class RunStore:
+    """
+    Historique persistant (SQLite) des exécutions de matching : une exécution par offre,
+    un enregistrement par CV (empreinte du fichier, statut, résultat), écrit au fil des résultats.
+    Les CV sont identifiés par l'empreinte de leur contenu, pas par leur nom (fichiers temporaires).
+    Les batchs soumis au Batch API y sont aussi enregistrés, pour récupérer leurs résultats plus tard.
+    """
+
+    def __init__(self, path=DEFAULT_RUN_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    offer_hash TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS run_items (
+                    run_id TEXT NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    cv_filename TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, file_hash)
+                )"""
+            )
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS batches (
+                    batch_id TEXT PRIMARY KEY,
+                    offer_hash TEXT NOT NULL,
+                    requests TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS runs_offer ON runs (offer_hash, updated_at)")
+
+    def create_run(self, offer_text: str, parameters: dict = None) -> str:
+        """
+        Crée une exécution pour une offre.
+
+        Args:
+            offer_text: Texte de l'offre d'emploi
+            parameters: Paramètres de l'exécution (présélection, budget de tokens...)
+
+        Returns:
+            Identifiant de l'exécution
+        """
+        run_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO runs (run_id, offer_hash, parameters, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (run_id, compute_cache_key(offer_text), json.dumps(parameters or {}), now, now)
+                )
+        return run_id
+
+    def find_latest_run(self, offer_text: str, parameters: dict = None) -> str:
+        """
+        Retourne la dernière exécution de la même offre, lancée avec les mêmes paramètres :
+        une exécution avec une autre présélection ou d'autres options n'est pas reprise.
+
+        Args:
+            offer_text: Texte de l'offre d'emploi
+            parameters: Paramètres de l'exécution (None pour ne pas les comparer)
+
+        Returns:
+            Identifiant de l'exécution, ou None
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT run_id, parameters FROM runs WHERE offer_hash = ? ORDER BY updated_at DESC",
+                (compute_cache_key(offer_text),)
+            ).fetchall()
+        for run_id, run_parameters in rows:
+            if parameters is None or json.loads(run_parameters) == parameters:
+                return run_id
+        return None
+
+    def check_run(self, run_id: str, offer_text: str, parameters: dict = None) -> None:
+        """
+        Vérifie qu'une exécution existe, porte sur la même offre et, le cas échéant,
+        a été lancée avec les mêmes paramètres (résultats enregistrés comparables).
+
+        Args:
+            run_id: Identifiant de l'exécution
+            offer_text: Texte de l'offre d'emploi
+            parameters: Paramètres attendus (None pour ne pas les comparer)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT offer_hash, parameters FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Exécution inconnue : {run_id}")
+        if row[0] != compute_cache_key(offer_text):
+            raise ValueError(f"L'exécution {run_id} porte sur une autre offre")
+        run_parameters = json.loads(row[1])
+        if parameters is not None and run_parameters and run_parameters != parameters:
+            raise ValueError(f"L'exécution {run_id} a été lancée avec d'autres paramètres : {run_parameters}")
+
+    def register_cvs(self, run_id: str, file_hashes: dict) -> None:
+        """
+        Ajoute des CV à une exécution (les CV déjà connus gardent leur statut et leur résultat).
+
+        Args:
+            run_id: Identifiant de l'exécution
+            file_hashes: Dictionnaire {nom_fichier: empreinte du contenu}
+        """
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO run_items (run_id, file_hash, cv_filename, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (run_id, file_hash) DO NOTHING",
+                    [(run_id, file_hash, filename, ITEM_PENDING, now) for filename, file_hash in file_hashes.items()]
+                )
+                self._connection.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def get_completed(self, run_id: str, file_hashes: list) -> dict:
+        """
+        Retourne les résultats déjà obtenus pour des CV de l'exécution.
+
+        Args:
+            run_id: Identifiant de l'exécution
+            file_hashes: Empreintes des CV recherchés
+
+        Returns:
+            Dictionnaire {empreinte: résultat}
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT file_hash, result FROM run_items WHERE run_id = ? AND status = ?",
+                (run_id, ITEM_DONE)
+            ).fetchall()
+        wanted = set(file_hashes)
+        return {file_hash: json.loads(result) for file_hash, result in rows if file_hash in wanted}
+
+    def record_result(self, run_id: str, file_hash: str, result: dict, done: bool) -> None:
+        """
+        Enregistre le résultat d'un CV dès sa réception.
+
+        Args:
+            run_id: Identifiant de l'exécution
+            file_hash: Empreinte du CV
+            result: Résultat du CV
+            done: Résultat définitif (False : CV à retraiter à la reprise)
+        """
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE run_items SET status = ?, result = ?, cv_filename = ?, updated_at = ? "
+                    "WHERE run_id = ? AND file_hash = ?",
+                    (ITEM_DONE if done else ITEM_FAILED, json.dumps(result, ensure_ascii=False),
+                     result.get("cv_filename", ""), now, run_id, file_hash)
+                )
+                self._connection.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def run_status(self, run_id: str) -> dict:
+        """
+        Retourne l'avancement d'une exécution.
+
+        Args:
+            run_id: Identifiant de l'exécution
+
+        Returns:
+            Dictionnaire {pending, done, failed}
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM run_items WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        counts = {ITEM_PENDING: 0, ITEM_DONE: 0, ITEM_FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def record_batch(self, batch_id: str, offer_text: str, requests: dict, status: str = "submitted") -> None:
+        """
+        Enregistre un batch soumis, avec la correspondance de ses requêtes vers les CV.
+
+        Args:
+            batch_id: Identifiant du batch
+            offer_text: Texte de l'offre d'emploi
+            requests: Dictionnaire {custom_id: {cv_filename, cache_key}}
+            status: Statut du batch
+        """
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO batches (batch_id, offer_hash, requests, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (batch_id, compute_cache_key(offer_text), json.dumps(requests, ensure_ascii=False), status, now, now)
+                )
+
+    def get_batch(self, batch_id: str, offer_text: str) -> dict:
+        """
+        Retourne les requêtes d'un batch enregistré, après vérification de l'offre.
+
+        Args:
+            batch_id: Identifiant du batch
+            offer_text: Texte de l'offre d'emploi
+
+        Returns:
+            Dictionnaire {custom_id: {cv_filename, cache_key}}
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT offer_hash, requests FROM batches WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Batch inconnu : {batch_id}")
+        if row[0] != compute_cache_key(offer_text):
+            raise ValueError(f"Le batch {batch_id} porte sur une autre offre")
+        return json.loads(row[1])
+
+    def update_batch_status(self, batch_id: str, status: str) -> None:
+        """
+        Met à jour le statut d'un batch enregistré.
+
+        Args:
+            batch_id: Identifiant du batch
+            status: Nouveau statut (completed, failed, expired...)
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE batches SET status = ?, updated_at = ? WHERE batch_id = ?", (status, time.time(), batch_id)
+                )
+
+    def list_batches(self) -> list:
+        """
+        Liste les batchs enregistrés, du plus récent au plus ancien.
+
+        Returns:
+            Liste de dictionnaires {batch_id, status, cvs, created_at, updated_at}
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT batch_id, status, requests, created_at, updated_at FROM batches ORDER BY created_at DESC"
+            ).fetchall()
+        return [
+            {"batch_id": batch_id, "status": status, "cvs": len(json.loads(requests)),
+             "created_at": created_at, "updated_at": updated_at}
+            for batch_id, status, requests, created_at, updated_at in rows
+        ]
+
+    def list_runs(self) -> list:
+        """
+        Liste les exécutions, de la plus récente à la plus ancienne.
+
+        Returns:
+            Liste de dictionnaires {run_id, created_at, updated_at, parameters}
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT run_id, created_at, updated_at, parameters FROM runs ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"run_id": run_id, "created_at": created_at, "updated_at": updated_at, "parameters": json.loads(parameters)}
+            for run_id, created_at, updated_at, parameters in rows
+        ]
+
+
+_default_run_store = None
+_default_run_store_lock = threading.Lock()
+
+
+def get_default_run_store() -> RunStore:
+    """
+    Retourne l'historique des exécutions partagé du processus (créé à la première utilisation).
+
+    Returns:
+        Instance RunStore partagée
+    """
+    global _default_run_store
+    with _default_run_store_lock:
+        if _default_run_store is None:
+            _default_run_store = RunStore()
+        return _default_run_store
+
+
+def set_default_run_store(store: RunStore) -> None:
+    """
+    Remplace l'historique des exécutions partagé du processus (emplacement personnalisé, tests).
+
+    Args:
+        store: Nouvelle instance RunStore
+    """
+    global _default_run_store
+    with _default_run_store_lock:
+        _default_run_store = store
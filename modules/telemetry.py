@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+# Variables d'environnement activant les sinks de télémétrie
+TELEMETRY_JSONL_ENV = "CV_MATCHING_TELEMETRY_JSONL"
+TELEMETRY_PROMETHEUS_ENV = "CV_MATCHING_PROMETHEUS_TEXTFILE"
+
+# Préfixe des métriques Prometheus
+PROMETHEUS_PREFIX = "cv_matching"
+
+
+def percentile(values: list, q: float) -> float:
+    """
+    Calcule un percentile par interpolation linéaire.
+
+    Args:
+        values: Liste de valeurs
+        q: Percentile entre 0 et 100
+
+    Returns:
+        Valeur du percentile (0 si la liste est vide)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class RunTelemetry:
+    """
+    Collecteur des métriques d'une exécution de matching (thread-safe).
+    Chaque événement (extraction, appel IA, export...) est conservé et transmis aux sinks.
+    """
+
+    def __init__(self, sinks: list = None):
+        self.sinks = sinks or []
+        self.events = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, event: str, **fields) -> dict:
+        """
+        Enregistre un événement.
+
+        Args:
+            event: Type d'événement (extraction, llm_call, llm_cache_hit, export...)
+            fields: Données de l'événement (cv_filename, duration_s, status, prompt_tokens...)
+
+        Returns:
+            Événement enregistré
+        """
+        entry = {"timestamp": datetime.now().isoformat(timespec="milliseconds"), "event": event}
+        entry.update(fields)
+        with self._lock:
+            self.events.append(entry)
+        for sink in self.sinks:
+            # Un sink défaillant (disque plein, fichier verrouillé) n'interrompt pas l'analyse
+            try:
+                sink.emit(entry)
+            except Exception as e:
+                print(f"❌ Erreur d'écriture de la télémétrie: {str(e)}")
+        return entry
+
+    def bind(self, **context) -> "TelemetryScope":
+        """
+        Retourne un enregistreur qui ajoute un contexte fixe (ex. cv_filename) à chaque événement.
+
+        Args:
+            context: Champs ajoutés à chaque événement
+
+        Returns:
+            TelemetryScope lié à ce collecteur
+        """
+        return TelemetryScope(self, context)
+
+    def summary(self) -> dict:
+        """
+        Calcule le résumé de l'exécution.
+
+        Returns:
+            Dictionnaire {libellé de la métrique: valeur}
+        """
+        with self._lock:
+            events = list(self.events)
+
+        extractions = [e for e in events if e["event"] == "extraction"]
+        llm_calls = [e for e in events if e["event"] == "llm_call"]
+        latencies = [e.get("duration_s", 0) for e in llm_calls]
+
+        return {
+            "CV extraits": sum(1 for e in extractions if e.get("status") == "ok"),
+            "Erreurs d'extraction": sum(1 for e in extractions if e.get("status") != "ok"),
+            "Durée d'extraction cumulée (s)": round(sum(e.get("duration_s", 0) for e in extractions), 3),
+            "Appels IA": len(llm_calls),
+            "Erreurs IA": sum(1 for e in llm_calls if e.get("status") != "ok"),
+            "Analyses en cache": sum(1 for e in events if e["event"] == "llm_cache_hit"),
+            "Latence IA p50 (s)": round(percentile(latencies, 50), 3),
+            "Latence IA p95 (s)": round(percentile(latencies, 95), 3),
+            "Tokens prompt": sum(e.get("prompt_tokens", 0) for e in llm_calls),
+            "Tokens complétion": sum(e.get("completion_tokens", 0) for e in llm_calls),
+            "Réessais": sum(e.get("retries", 0) for e in llm_calls),
+            "Durée totale (s)": round(time.perf_counter() - self._start, 3),
+        }
+
+    def flush(self) -> dict:
+        """
+        Transmet le résumé de l'exécution aux sinks.
+
+        Returns:
+            Résumé de l'exécution
+        """
+        summary = self.summary()
+        for sink in self.sinks:
+            try:
+                sink.close(summary)
+            except Exception as e:
+                print(f"❌ Erreur d'écriture de la télémétrie: {str(e)}")
+        return summary
+
+
+class TelemetryScope:
+    """Enregistreur lié à un RunTelemetry, qui ajoute un contexte fixe aux événements."""
+
+    def __init__(self, telemetry: RunTelemetry, context: dict):
+        self.telemetry = telemetry
+        self.context = context
+
+    def record(self, event: str, **fields) -> dict:
+        """
+        Enregistre un événement avec le contexte du scope.
+
+        Args:
+            event: Type d'événement
+            fields: Données de l'événement
+
+        Returns:
+            Événement enregistré
+        """
+        return self.telemetry.record(event, **{**self.context, **fields})
+
+    def bind(self, **context) -> "TelemetryScope":
+        """
+        Retourne un scope enfant avec un contexte complété.
+
+        Args:
+            context: Champs ajoutés à chaque événement
+
+        Returns:
+            TelemetryScope enfant
+        """
+        return TelemetryScope(self.telemetry, {**self.context, **context})
+
+
+class JsonlSink:
+    """Sink écrivant chaque événement puis le résumé dans un fichier JSONL (une ligne par événement)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def emit(self, event: dict) -> None:
+        """Ajoute un événement au fichier."""
+        self._write(event)
+
+    def close(self, summary: dict) -> None:
+        """Ajoute le résumé de l'exécution au fichier."""
+        self._write({
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            "event": "run_summary",
+            **summary
+        })
+
+    def _write(self, entry: dict) -> None:
+        """Ajoute une ligne JSON au fichier."""
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+
+class PrometheusTextfileSink:
+    """Sink écrivant le résumé au format texte Prometheus (collecteur textfile de node_exporter)."""
+
+    # Correspondance libellé du résumé -> (nom de métrique, étiquettes)
+    METRICS = {
+        "CV extraits": ("cvs_extracted", ""),
+        "Erreurs d'extraction": ("extraction_errors", ""),
+        "Durée d'extraction cumulée (s)": ("extraction_seconds", ""),
+        "Appels IA": ("llm_calls", ""),
+        "Erreurs IA": ("llm_errors", ""),
+        "Analyses en cache": ("llm_cache_hits", ""),
+        "Latence IA p50 (s)": ("llm_latency_seconds", '{quantile="0.5"}'),
+        "Latence IA p95 (s)": ("llm_latency_seconds", '{quantile="0.95"}'),
+        "Tokens prompt": ("llm_tokens", '{type="prompt"}'),
+        "Tokens complétion": ("llm_tokens", '{type="completion"}'),
+        "Réessais": ("llm_retries", ""),
+        "Durée totale (s)": ("run_duration_seconds", ""),
+    }
+
+    def __init__(self, path: str, prefix: str = PROMETHEUS_PREFIX):
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def emit(self, event: dict) -> None:
+        """Les événements individuels ne sont pas exportés vers Prometheus."""
+
+    def close(self, summary: dict) -> None:
+        """Écrit le résumé de la dernière exécution (écriture atomique)."""
+        lines = []
+        declared = set()
+        for label, (name, labels) in self.METRICS.items():
+            metric = f"{self.prefix}_last_run_{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} gauge")
+                declared.add(metric)
+            lines.append(f"{metric}{labels} {summary.get(label, 0)}")
+        lines.append(f"# TYPE {self.prefix}_last_run_timestamp_seconds gauge")
+        lines.append(f"{self.prefix}_last_run_timestamp_seconds {time.time():.0f}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def build_sinks_from_env() -> list:
+    """
+    Construit les sinks configurés par variables d'environnement.
+
+    Returns:
+        Liste des sinks (JSONL et/ou Prometheus)
+    """
+    sinks = []
+    if os.environ.get(TELEMETRY_JSONL_ENV):
+        sinks.append(JsonlSink(os.environ[TELEMETRY_JSONL_ENV]))
+    if os.environ.get(TELEMETRY_PROMETHEUS_ENV):
+        sinks.append(PrometheusTextfileSink(os.environ[TELEMETRY_PROMETHEUS_ENV]))
+    return sinks
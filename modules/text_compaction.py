@@ -0,0 +1,204 @@
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+from .cv_extraction import PAGE_BREAK
+
+
+# Budget de tokens par défaut pour le texte d'un CV dans le prompt
+CV_TOKEN_BUDGET = 4000
+
+# Encodage tiktoken du modèle gpt-4o-mini
+TOKENIZER_ENCODING = "o200k_base"
+
+# Estimation du nombre de caractères par token quand tiktoken est indisponible
+CHARS_PER_TOKEN = 4
+
+# Longueur minimale d'une ligne répétée considérée comme en-tête/pied de page
+MIN_REPEATED_LINE_LENGTH = 15
+
+# Lignes examinées en haut et en bas de chaque page pour détecter les en-têtes/pieds de page
+PAGE_EDGE_LINES = 3
+
+HYPHENATION_PATTERN = re.compile(r"(\w)-\n\s*([a-zà-ÿ])")
+SPACES_PATTERN = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^(page\s*\d{1,3}(\s*(/|sur|of)\s*\d{1,3})?|[-–]\s*\d{1,3}\s*[-–])$",
+    re.IGNORECASE
+)
+# Numéro de page sans le mot "page" ("2/3", "2 sur 3") : ne se distingue d'une note ("4/5")
+# que par sa position, il n'est retiré qu'en première ou dernière ligne d'une page
+PAGE_COUNTER_PATTERN = re.compile(r"^\d{1,3}\s*(/|sur|of)\s*\d{1,3}$", re.IGNORECASE)
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+
+def get_encoder():
+    """
+    Charge l'encodeur tiktoken local (une seule fois par processus).
+
+    Returns:
+        Encodeur tiktoken, ou None si indisponible
+    """
+    global _encoder, _encoder_loaded
+    with _encoder_lock:
+        if not _encoder_loaded:
+            try:
+                import tiktoken
+                _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception:
+                _encoder = None
+            _encoder_loaded = True
+        return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """
+    Compte les tokens d'un texte (estimation par caractères si tiktoken est indisponible).
+
+    Args:
+        text: Texte à mesurer
+
+    Returns:
+        Nombre de tokens
+    """
+    encoder = get_encoder()
+    if encoder is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Tronque un texte à un nombre maximum de tokens.
+
+    Args:
+        text: Texte à tronquer
+        max_tokens: Nombre maximum de tokens
+
+    Returns:
+        Texte tronqué
+    """
+    encoder = get_encoder()
+    if encoder is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
+
+
+def get_page_edges(lines: list) -> dict:
+    """
+    Repère les premières et dernières lignes non vides d'une page (emplacements des en-têtes/pieds de page).
+
+    Args:
+        lines: Lignes de la page
+
+    Returns:
+        Dictionnaire {indice_ligne: (bord, rang depuis le bord, ligne)}
+    """
+    filled = [index for index, line in enumerate(lines) if line]
+    edges = {}
+    for rank, index in enumerate(reversed(filled[-PAGE_EDGE_LINES:])):
+        edges[index] = ("bas", rank, lines[index])
+    for rank, index in enumerate(filled[:PAGE_EDGE_LINES]):
+        edges[index] = ("haut", rank, lines[index])
+    return edges
+
+
+def remove_page_counters(lines: list) -> list:
+    """
+    Supprime un numéro de page sans le mot "page" ("2/3") placé en première ou dernière ligne de la page.
+
+    Args:
+        lines: Lignes de la page
+
+    Returns:
+        Lignes de la page sans son numéro
+    """
+    filled = [index for index, line in enumerate(lines) if line]
+    removed = {index for index in filled[:1] + filled[-1:] if PAGE_COUNTER_PATTERN.match(lines[index])}
+    return [line for index, line in enumerate(lines) if index not in removed]
+
+
+def remove_running_headers(pages: list) -> list:
+    """
+    Supprime les en-têtes et pieds de page répétés : une ligne retrouvée au même rang depuis le haut
+    (ou le bas) de plusieurs pages n'est conservée qu'à sa première occurrence. Le corps des pages
+    n'est pas examiné, une ligne répétée dans le contenu (intitulé de poste, entreprise) est conservée.
+
+    Args:
+        pages: Lignes de chaque page
+
+    Returns:
+        Lignes de chaque page sans les en-têtes/pieds de page répétés
+    """
+    edges = [get_page_edges(lines) for lines in pages]
+    counts = Counter(
+        position for page_edges in edges for position in set(page_edges.values())
+        if len(position[2]) >= MIN_REPEATED_LINE_LENGTH
+    )
+
+    seen = set()
+    cleaned_pages = []
+    for lines, page_edges in zip(pages, edges):
+        removed = set()
+        for index, position in page_edges.items():
+            if counts.get(position, 0) > 1:
+                if position in seen:
+                    removed.add(index)
+                seen.add(position)
+        cleaned_pages.append([line for index, line in enumerate(lines) if index not in removed])
+    return cleaned_pages
+
+
+def normalize_cv_text(text: str) -> str:
+    """
+    Nettoie le texte extrait d'un CV : césures, espaces, numéros de page,
+    en-têtes et pieds de page répétés d'une page à l'autre (PDF, pages séparées par PAGE_BREAK).
+
+    Args:
+        text: Texte brut extrait du CV
+
+    Returns:
+        Texte nettoyé
+    """
+    text = unicodedata.normalize("NFKC", text).replace("\r\n", "\n").replace("\r", "\n")
+
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        page = HYPHENATION_PATTERN.sub(r"\1\2", page)
+        lines = [SPACES_PATTERN.sub(" ", line).strip() for line in page.split("\n")]
+        pages.append([line for line in lines if not PAGE_NUMBER_PATTERN.match(line)])
+    if len(pages) > 1:
+        pages = remove_running_headers([remove_page_counters(lines) for lines in pages])
+
+    text = "\n".join(line for lines in pages for line in lines)
+    return BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+def compact_cv_text(text: str, max_tokens: int = CV_TOKEN_BUDGET) -> tuple[str, dict]:
+    """
+    Nettoie le texte d'un CV et l'ajuste au budget de tokens.
+
+    Args:
+        text: Texte brut extrait du CV
+        max_tokens: Budget de tokens du CV (None pour ne pas tronquer)
+
+    Returns:
+        Tuple (texte compacté, {tokens_before, tokens_after})
+    """
+    tokens_before = count_tokens(text)
+    compacted = normalize_cv_text(text)
+    if max_tokens is not None:
+        compacted = truncate_to_tokens(compacted, max_tokens)
+
+    return compacted, {
+        "tokens_before": tokens_before,
+        "tokens_after": count_tokens(compacted)
+    }